@@ -86,21 +86,23 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'username', 'user_type')
     
     def get_student_profile(self, obj):
-        if hasattr(obj, 'student_profile'):
+        profile = getattr(obj, 'student_profile', None)
+        if profile is not None:
             return {
-                'student_id': obj.student_profile.student_id,
-                'enrollment_date': obj.student_profile.enrollment_date,
-                'grade_level': obj.student_profile.grade_level,
+                'student_id': profile.student_id,
+                'enrollment_date': profile.enrollment_date,
+                'grade_level': profile.grade_level,
             }
         return None
     
     def get_faculty_profile(self, obj):
-        if hasattr(obj, 'faculty_profile'):
+        profile = getattr(obj, 'faculty_profile', None)
+        if profile is not None:
             return {
-                'employee_id': obj.faculty_profile.employee_id,
-                'department': obj.faculty_profile.department,
-                'specialization': obj.faculty_profile.specialization,
-                'hire_date': obj.faculty_profile.hire_date,
+                'employee_id': profile.employee_id,
+                'department': profile.department,
+                'specialization': profile.specialization,
+                'hire_date': profile.hire_date,
             }
         return None
 
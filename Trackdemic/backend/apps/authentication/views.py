@@ -52,7 +52,7 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
-        return self.request.user
+        return User.objects.with_profiles().get(pk=self.request.user.pk)
 
 
 class ChangePasswordView(generics.UpdateAPIView):
@@ -97,7 +97,7 @@ def logout_view(request):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def verify_token(request):
-    serializer = UserProfileSerializer(request.user)
+    serializer = UserProfileSerializer(User.objects.with_profiles().get(pk=request.user.pk))
     return Response({
         'valid': True,
         'user': serializer.data
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Now, Round
+
+from apps.courses.models import Enrollment, Lesson, LessonProgress
+
+
+class Command(BaseCommand):
+    help = 'Recompute completed lesson counts and progress percentages for enrollments in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, help='Only recompute enrollments for this course ID')
+
+    def handle(self, *args, **options):
+        enrollments = Enrollment.objects.all()
+        if options['course']:
+            enrollments = enrollments.filter(course_id=options['course'])
+
+        completed_lessons = (
+            LessonProgress.objects.filter(enrollment=OuterRef('pk'), is_completed=True)
+            .order_by()
+            .values('enrollment')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        total_lessons = (
+            Lesson.objects.filter(module__course=OuterRef('course'))
+            .order_by()
+            .values('module__course')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+
+        with transaction.atomic():
+            # Two set-based UPDATEs: first the counters, then the percentages derived from them
+            updated = enrollments.update(
+                completed_lessons=Coalesce(Subquery(completed_lessons, output_field=IntegerField()), 0)
+            )
+            total = Coalesce(Subquery(total_lessons, output_field=IntegerField()), 0)
+            enrollments.update(
+                progress_percentage=Case(
+                    When(completed_lessons=0, then=Value(0.0)),
+                    When(completed_lessons__gte=total, then=Value(100.0)),
+                    default=Round(F('completed_lessons') * 100.0 / total, 2),
+                    output_field=FloatField(),
+                )
+            )
+            enrollments.filter(progress_percentage__gte=100, completed_at__isnull=True).update(completed_at=Now())
+            enrollments.filter(progress_percentage__lt=100).update(completed_at=None)
+
+        self.stdout.write(self.style.SUCCESS(f'Recomputed progress for {updated} enrollments'))
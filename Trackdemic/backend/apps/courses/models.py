@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Exists, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 
 User = get_user_model()
 
@@ -17,6 +19,28 @@ class Category(models.Model):
         return self.name
 
 
+class CourseQuerySet(models.QuerySet):
+    def with_list_stats(self, user=None):
+        """
+        Annotate what CourseListSerializer shows per course (enrollment count,
+        average rating, whether the user is enrolled) so a page of courses
+        costs one query instead of three per course.
+        """
+        enrollments = Enrollment.objects.filter(course=OuterRef('pk'), is_active=True)
+        enrolled_count = enrollments.order_by().values('course').annotate(total=models.Count('id')).values('total')
+        average_rating = (
+            CourseReview.objects.filter(course=OuterRef('pk'))
+            .order_by().values('course').annotate(average=models.Avg('rating')).values('average')
+        )
+        queryset = self.select_related('category', 'instructor').annotate(
+            annotated_enrolled_count=Coalesce(Subquery(enrolled_count, output_field=models.IntegerField()), 0),
+            annotated_average_rating=Subquery(average_rating, output_field=models.FloatField()),
+        )
+        if user is not None and user.is_authenticated:
+            queryset = queryset.annotate(annotated_is_enrolled=Exists(enrollments.filter(student=user)))
+        return queryset
+
+
 class Course(models.Model):
     DIFFICULTY_CHOICES = [
         ('beginner', 'Beginner'),
@@ -36,6 +60,8 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CourseQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
 
@@ -44,10 +70,14 @@ class Course(models.Model):
 
     @property
     def enrolled_count(self):
+        if hasattr(self, 'annotated_enrolled_count'):
+            return self.annotated_enrolled_count
         return self.enrollments.filter(is_active=True).count()
 
     @property
     def average_rating(self):
+        if hasattr(self, 'annotated_average_rating'):
+            return round(self.annotated_average_rating or 0, 1)
         ratings = self.reviews.aggregate(avg_rating=models.Avg('rating'))
         return round(ratings['avg_rating'] or 0, 1)
 
@@ -91,14 +121,25 @@ class Lesson(models.Model):
         return f"{self.module.title} - {self.title}"
 
 
+class EnrollmentQuerySet(models.QuerySet):
+    def with_related(self, user=None):
+        """Load the student and the course with its list stats, as EnrollmentSerializer shows them"""
+        return self.select_related('student').prefetch_related(
+            Prefetch('course', queryset=Course.objects.with_list_stats(user))
+        )
+
+
 class Enrollment(models.Model):
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='enrollments')
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments')
     enrolled_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
     progress_percentage = models.FloatField(default=0.0, validators=[MinValueValidator(0), MaxValueValidator(100)])
+    completed_lessons = models.PositiveIntegerField(default=0)
     completed_at = models.DateTimeField(blank=True, null=True)
 
+    objects = EnrollmentQuerySet.as_manager()
+
     class Meta:
         unique_together = ['student', 'course']
 
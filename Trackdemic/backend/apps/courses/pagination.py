@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class RosterCursorPagination(CursorPagination):
+    """Keyset pagination over enrollments, stable while students are added"""
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
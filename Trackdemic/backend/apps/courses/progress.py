@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, Count, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Least, Round
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
+
+from .models import Enrollment, Lesson, LessonProgress
+
+LESSON_COUNT_CACHE_TIMEOUT = 60 * 60
+
+
+def lesson_count_cache_key(course_id):
+    return f'course:{course_id}:lesson_count'
+
+
+def get_course_lesson_count(course_id):
+    """Total number of lessons in a course, cached until a lesson is added or removed"""
+    key = lesson_count_cache_key(course_id)
+    total = cache.get(key)
+    if total is None:
+        total = Lesson.objects.filter(module__course_id=course_id).count()
+        cache.set(key, total, LESSON_COUNT_CACHE_TIMEOUT)
+    return total
+
+
+def invalidate_course_lesson_count(course_id):
+    cache.delete(lesson_count_cache_key(course_id))
+
+
+def calculate_progress(completed_lessons, total_lessons):
+    if total_lessons <= 0:
+        return 0.0
+    return round(min(completed_lessons / total_lessons, 1) * 100, 2)
+
+
+def set_lesson_completion(enrollment_id, lesson, is_completed=True):
+    """
+    Mark a lesson as completed (or not) and adjust the enrollment's counters
+    by one instead of recounting every lesson in the course.
+    """
+    with transaction.atomic():
+        enrollment = Enrollment.objects.select_for_update().get(id=enrollment_id)
+        progress, created = LessonProgress.objects.get_or_create(
+            enrollment=enrollment,
+            lesson=lesson,
+        )
+
+        if progress.is_completed == is_completed:
+            return enrollment, progress
+
+        progress.is_completed = is_completed
+        progress.completed_at = timezone.now() if is_completed else None
+        progress.save(update_fields=['is_completed', 'completed_at'])
+
+        total_lessons = get_course_lesson_count(enrollment.course_id)
+        delta = 1 if is_completed else -1
+        enrollment.completed_lessons = max(enrollment.completed_lessons + delta, 0)
+        enrollment.progress_percentage = calculate_progress(enrollment.completed_lessons, total_lessons)
+        if enrollment.progress_percentage >= 100:
+            enrollment.completed_at = enrollment.completed_at or timezone.now()
+        else:
+            enrollment.completed_at = None
+        enrollment.save(update_fields=['completed_lessons', 'progress_percentage', 'completed_at'])
+
+    return enrollment, progress
+
+
+def refresh_course_progress(course_id):
+    """
+    Recount every enrollment's completed lessons, percentage and completion
+    time in a course with one UPDATE, after lessons were added or removed.
+    """
+    invalidate_course_lesson_count(course_id)
+    total_lessons = get_course_lesson_count(course_id)
+    completed = Coalesce(Subquery(
+        LessonProgress.objects.filter(enrollment=OuterRef('pk'), is_completed=True)
+        .order_by().values('enrollment').annotate(total=Count('id')).values('total'),
+        output_field=models.IntegerField()
+    ), 0)
+    enrollments = Enrollment.objects.filter(course_id=course_id)
+    if total_lessons <= 0:
+        enrollments.update(completed_lessons=completed, progress_percentage=0.0, completed_at=None)
+        return
+    enrollments.update(
+        completed_lessons=completed,
+        progress_percentage=Round(Least(completed * 100.0 / total_lessons, Value(100.0)), 2),
+        completed_at=Case(
+            When(GreaterThanOrEqual(completed, total_lessons), then=Coalesce('completed_at', Value(timezone.now()))),
+            default=None
+        )
+    )
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Course, Category, CourseModule, Lesson, Enrollment, CourseReview
+from .models import Course, Category, CourseModule, Lesson, Enrollment, LessonProgress, CourseReview
 from apps.users.models import User
 
 
@@ -44,6 +44,8 @@ class CourseListSerializer(serializers.ModelSerializer):
                  'enrolled_count', 'average_rating', 'is_enrolled', 'created_at']
     
     def get_is_enrolled(self, obj):
+        if hasattr(obj, 'annotated_is_enrolled'):
+            return obj.annotated_is_enrolled
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return Enrollment.objects.filter(
@@ -103,7 +105,27 @@ class EnrollmentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Enrollment
-        fields = ['id', 'course', 'student', 'enrolled_at', 'progress_percentage', 'completed_at']
+        fields = ['id', 'course', 'student', 'enrolled_at', 'progress_percentage', 'completed_lessons', 'completed_at']
+
+
+class CourseRosterSerializer(serializers.ModelSerializer):
+    student_id = serializers.IntegerField(source='student.id', read_only=True)
+    username = serializers.CharField(source='student.username', read_only=True)
+    first_name = serializers.CharField(source='student.first_name', read_only=True)
+    last_name = serializers.CharField(source='student.last_name', read_only=True)
+    email = serializers.EmailField(source='student.email', read_only=True)
+    student_number = serializers.CharField(source='student.student_profile.student_id', read_only=True, default=None)
+
+    class Meta:
+        model = Enrollment
+        fields = ['id', 'student_id', 'username', 'first_name', 'last_name', 'email', 'student_number',
+                 'enrolled_at', 'progress_percentage', 'completed_lessons', 'completed_at']
+
+
+class LessonProgressSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LessonProgress
+        fields = ['id', 'lesson', 'is_completed', 'completed_at', 'time_spent_minutes']
 
 
 class CourseReviewSerializer(serializers.ModelSerializer):
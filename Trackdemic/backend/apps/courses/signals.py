@@ -0,0 +1,62 @@
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import CourseModule, Lesson
+from .progress import invalidate_course_lesson_count, refresh_course_progress
+
+
+# Courses whose progress needs refreshing once the current transaction commits,
+# and the course of each module seen meanwhile, kept per thread
+_pending = threading.local()
+
+
+def _pending_state():
+    if not hasattr(_pending, 'course_ids'):
+        _pending.course_ids = set()
+        _pending.module_courses = {}
+    return _pending
+
+
+def _course_for(module_id):
+    module_courses = _pending_state().module_courses
+    if module_id not in module_courses:
+        module_courses[module_id] = (
+            CourseModule.objects.filter(id=module_id).values_list('course_id', flat=True).first()
+        )
+    return module_courses[module_id]
+
+
+def refresh_pending_progress():
+    """
+    Refresh every course queued since the last commit, once per course. Each
+    lesson change queues this, and the first call after the commit does the
+    work, so deleting a module with many lessons costs one lookup per module.
+    Courses left queued by a rolled-back transaction are refreshed with the
+    next commit, which is harmless.
+    """
+    state = _pending_state()
+    course_ids, state.course_ids, state.module_courses = state.course_ids, set(), {}
+    for course_id in course_ids:
+        refresh_course_progress(course_id)
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def lesson_count_changed(sender, instance, created=True, **kwargs):
+    # Saving an existing lesson leaves the count alone
+    if not created:
+        return
+    if not transaction.get_connection().in_atomic_block:
+        course_id = CourseModule.objects.filter(id=instance.module_id).values_list('course_id', flat=True).first()
+        if course_id is not None:
+            refresh_course_progress(course_id)
+        return
+
+    course_id = _course_for(instance.module_id)
+    if course_id is not None:
+        invalidate_course_lesson_count(course_id)
+        _pending_state().course_ids.add(course_id)
+        transaction.on_commit(refresh_pending_progress)
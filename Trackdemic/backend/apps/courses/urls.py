@@ -1,11 +1,13 @@
 from django.urls import path
 from .views import (
     CategoryListView, CourseListView, CourseDetailView,
-    enroll_course, unenroll_course, MyEnrollmentsView,
+    enroll_course, unenroll_course, complete_lesson, MyEnrollmentsView,
     CourseReviewListCreateView,
     FacultyCourseListView, FacultyCourseDetailView,
-    faculty_course_students, faculty_add_student_to_course,
-    faculty_remove_student_from_course, faculty_student_performance
+    faculty_course_students, faculty_course_roster, faculty_course_roster_export,
+    faculty_course_gradebook_export,
+    faculty_add_student_to_course, faculty_bulk_add_students,
+    faculty_remove_student_from_course, faculty_student_performance, faculty_student_attempts
 )
 
 urlpatterns = [
@@ -14,13 +16,19 @@ urlpatterns = [
     path('<int:pk>/', CourseDetailView.as_view(), name='course-detail'),
     path('<int:course_id>/enroll/', enroll_course, name='enroll-course'),
     path('<int:course_id>/unenroll/', unenroll_course, name='unenroll-course'),
+    path('<int:course_id>/lessons/<int:lesson_id>/complete/', complete_lesson, name='complete-lesson'),
     path('<int:course_id>/reviews/', CourseReviewListCreateView.as_view(), name='course-reviews'),
     path('my-enrollments/', MyEnrollmentsView.as_view(), name='my-enrollments'),
     
     path('faculty/', FacultyCourseListView.as_view(), name='faculty-course-list'),
     path('faculty/<int:pk>/', FacultyCourseDetailView.as_view(), name='faculty-course-detail'),
     path('faculty/<int:course_id>/students/', faculty_course_students, name='faculty-course-students'),
+    path('faculty/<int:course_id>/roster/', faculty_course_roster, name='faculty-course-roster'),
+    path('faculty/<int:course_id>/roster/export/', faculty_course_roster_export, name='faculty-course-roster-export'),
+    path('faculty/<int:course_id>/gradebook/export/', faculty_course_gradebook_export, name='faculty-course-gradebook-export'),
     path('faculty/<int:course_id>/students/add/', faculty_add_student_to_course, name='faculty-add-student'),
+    path('faculty/<int:course_id>/students/bulk-add/', faculty_bulk_add_students, name='faculty-bulk-add-students'),
     path('faculty/<int:course_id>/students/<int:student_id>/remove/', faculty_remove_student_from_course, name='faculty-remove-student'),
     path('faculty/<int:course_id>/students/<int:student_id>/performance/', faculty_student_performance, name='faculty-student-performance'),
+    path('faculty/<int:course_id>/students/<int:student_id>/attempts/', faculty_student_attempts, name='faculty-student-attempts'),
 ]
@@ -1,17 +1,31 @@
+import csv
+import io
+from itertools import chain
+
 from rest_framework import generics, status, filters, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Q, Avg, Count, Max
+from django.db.models.functions import Lower
+from django.http import StreamingHttpResponse
+from rest_framework.pagination import PageNumberPagination
 from .models import Course, Category, Enrollment, CourseReview, CourseModule, Lesson
 from .serializers import (
     CourseListSerializer, CourseDetailSerializer, CategorySerializer,
     EnrollmentSerializer, CourseReviewSerializer, CourseModuleSerializer,
-    CourseCreateUpdateSerializer
+    CourseCreateUpdateSerializer, CourseRosterSerializer, LessonProgressSerializer
 )
+from .pagination import RosterCursorPagination
+from .progress import set_lesson_completion
+from apps.users.dashboard import invalidate_dashboard_stats
 from apps.users.models import User
+from apps.quizzes.gradebook import (
+    GRADEBOOK_FORMATS, gradebook_quizzes, gradebook_rows, iter_xlsx, xlsx_available
+)
 from apps.quizzes.models import QuizAttempt
-from apps.quizzes.serializers import QuizAttemptSerializer
+from apps.quizzes.serializers import QuizAttemptSerializer, expansion_from_request
 
 
 class CategoryListView(generics.ListAPIView):
@@ -31,7 +45,7 @@ class CourseListView(generics.ListAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().with_list_stats(self.request.user)
         
         # Filter by price range
         min_price = self.request.query_params.get('min_price')
@@ -106,6 +120,36 @@ def unenroll_course(request, course_id):
         }, status=status.HTTP_404_NOT_FOUND)
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def complete_lesson(request, course_id, lesson_id):
+    """Mark a lesson as completed (or not completed) and update course progress"""
+    try:
+        enrollment_id = Enrollment.objects.values_list('id', flat=True).get(
+            student=request.user,
+            course_id=course_id,
+            is_active=True
+        )
+        lesson = Lesson.objects.get(id=lesson_id, module__course_id=course_id)
+    except Enrollment.DoesNotExist:
+        return Response({'error': 'Enrollment not found'}, status=status.HTTP_404_NOT_FOUND)
+    except Lesson.DoesNotExist:
+        return Response({'error': 'Lesson not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    is_completed = request.data.get('is_completed', True)
+    if not isinstance(is_completed, bool):
+        return Response({'error': 'is_completed must be a boolean'}, status=status.HTTP_400_BAD_REQUEST)
+
+    enrollment, progress = set_lesson_completion(enrollment_id, lesson, is_completed)
+
+    return Response({
+        'lesson_progress': LessonProgressSerializer(progress).data,
+        'progress_percentage': enrollment.progress_percentage,
+        'completed_lessons': enrollment.completed_lessons,
+        'completed_at': enrollment.completed_at,
+    }, status=status.HTTP_200_OK)
+
+
 class MyEnrollmentsView(generics.ListAPIView):
     serializer_class = EnrollmentSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -114,7 +158,7 @@ class MyEnrollmentsView(generics.ListAPIView):
         return Enrollment.objects.filter(
             student=self.request.user,
             is_active=True
-        ).order_by('-enrolled_at')
+        ).with_related(self.request.user).order_by('-enrolled_at')
 
 
 class CourseReviewListCreateView(generics.ListCreateAPIView):
@@ -123,7 +167,7 @@ class CourseReviewListCreateView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         course_id = self.kwargs['course_id']
-        return CourseReview.objects.filter(course_id=course_id).order_by('-created_at')
+        return CourseReview.objects.filter(course_id=course_id).select_related('student').order_by('-created_at')
     
     def perform_create(self, serializer):
         course_id = self.kwargs['course_id']
@@ -141,7 +185,7 @@ class FacultyCourseListView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         # Faculty can only see their own courses
-        return Course.objects.filter(instructor=self.request.user)
+        return Course.objects.filter(instructor=self.request.user).with_list_stats(self.request.user)
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -172,13 +216,108 @@ def faculty_course_students(request, course_id):
     """Get all students enrolled in a faculty's course"""
     try:
         course = Course.objects.get(id=course_id, instructor=request.user)
-        enrollments = Enrollment.objects.filter(course=course, is_active=True)
+        enrollments = Enrollment.objects.filter(course=course, is_active=True).with_related(request.user)
         serializer = EnrollmentSerializer(enrollments, many=True)
         return Response(serializer.data)
     except Course.DoesNotExist:
         return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+ROSTER_FIELDS = [
+    'id', 'student_id', 'enrolled_at', 'progress_percentage', 'completed_lessons', 'completed_at',
+    'student__username', 'student__first_name', 'student__last_name', 'student__email',
+    'student__student_profile__student_id',
+]
+ROSTER_CSV_HEADER = [
+    'enrollment_id', 'student_id', 'enrolled_at', 'progress_percentage', 'completed_lessons', 'completed_at',
+    'username', 'first_name', 'last_name', 'email', 'student_number',
+]
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def faculty_course_roster(request, course_id):
+    """Get a compact, cursor-paginated roster of students enrolled in a faculty's course"""
+    try:
+        course = Course.objects.only('id', 'title').get(id=course_id, instructor=request.user)
+    except Course.DoesNotExist:
+        return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    enrollments = Enrollment.objects.filter(
+        course=course,
+        is_active=True
+    ).select_related('student__student_profile').only(
+        'id', 'student', 'enrolled_at', 'progress_percentage', 'completed_lessons', 'completed_at',
+        'student__username', 'student__first_name', 'student__last_name', 'student__email',
+        'student__student_profile__student_id',
+    )
+
+    paginator = RosterCursorPagination()
+    page = paginator.paginate_queryset(enrollments, request)
+    response = paginator.get_paginated_response(CourseRosterSerializer(page, many=True).data)
+    response.data['course'] = {
+        'id': course.id,
+        'title': course.title,
+        'enrolled_count': course.enrolled_count,
+    }
+    return response
+
+
+class _Echo:
+    """File-like object that hands each CSV line straight back to the caller"""
+    def write(self, value):
+        return value
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def faculty_course_roster_export(request, course_id):
+    """Stream the course roster as CSV without loading every enrollment into memory"""
+    if not Course.objects.filter(id=course_id, instructor=request.user).exists():
+        return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    rows = Enrollment.objects.filter(
+        course_id=course_id,
+        is_active=True
+    ).order_by('id').values_list(*ROSTER_FIELDS).iterator(chunk_size=2000)
+
+    writer = csv.writer(_Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in chain([ROSTER_CSV_HEADER], rows)),
+        content_type='text/csv'
+    )
+    response['Content-Disposition'] = f'attachment; filename="course-{course_id}-roster.csv"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def faculty_course_gradebook_export(request, course_id):
+    """Stream each enrolled student's best quiz scores for a faculty's course as CSV or XLSX"""
+    # Not ?format=, which DRF reserves for picking a renderer
+    file_format = request.query_params.get('file_format', 'csv')
+    if file_format not in GRADEBOOK_FORMATS:
+        return Response({'error': f'file_format must be one of {", ".join(GRADEBOOK_FORMATS)}'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if file_format == 'xlsx' and not xlsx_available():
+        return Response({'error': 'XLSX export is not available on this server'},
+                        status=status.HTTP_501_NOT_IMPLEMENTED)
+    if not Course.objects.filter(id=course_id, instructor=request.user).exists():
+        return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    rows = gradebook_rows(course_id, gradebook_quizzes(course_id))
+    if file_format == 'xlsx':
+        response = StreamingHttpResponse(
+            iter_xlsx(rows),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+    else:
+        writer = csv.writer(_Echo())
+        response = StreamingHttpResponse((writer.writerow(row) for row in rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="course-{course_id}-gradebook.{file_format}"'
+    return response
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def faculty_add_student_to_course(request, course_id):
@@ -216,6 +355,145 @@ def faculty_add_student_to_course(request, course_id):
         return Response({'error': 'Student not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+BULK_ENROLL_MAX_ROWS = 10000
+BULK_ENROLL_HEADERS = {'id', 'student_id', 'student', 'username', 'email', 'identifier'}
+
+
+def _read_student_identifiers(request):
+    """
+    Collect raw student identifiers from a CSV upload or a JSON list. Reading
+    stops one past BULK_ENROLL_MAX_ROWS, so an oversized upload is rejected
+    without decoding the rest of it.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        students = request.data.get('students')
+        if not isinstance(students, list):
+            return None
+        return [str(value).strip() for value in students[:BULK_ENROLL_MAX_ROWS + 1]]
+
+    text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    identifiers = []
+    for index, row in enumerate(csv.reader(text)):
+        value = row[0].strip() if row else ''
+        if index == 0 and value.lower() in BULK_ENROLL_HEADERS:
+            continue
+        identifiers.append(value)
+        if len(identifiers) > BULK_ENROLL_MAX_ROWS:
+            break
+    return identifiers
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def faculty_bulk_add_students(request, course_id):
+    """Enroll many students at once from a CSV file or a JSON list of IDs, usernames or emails"""
+    try:
+        course = Course.objects.get(id=course_id, instructor=request.user)
+    except Course.DoesNotExist:
+        return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        identifiers = _read_student_identifiers(request)
+    except (UnicodeDecodeError, csv.Error) as e:
+        return Response({'error': f'Could not read the CSV file: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+    if not identifiers:
+        return Response({'error': 'Provide a CSV file or a non-empty "students" list'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(identifiers) > BULK_ENROLL_MAX_ROWS:
+        return Response({'error': f'At most {BULK_ENROLL_MAX_ROWS} students can be added per request'}, status=status.HTTP_400_BAD_REQUEST)
+
+    ids, usernames, emails = set(), set(), set()
+    for value in identifiers:
+        if value.isdigit():
+            # An all-digit value may also be a username
+            ids.add(int(value))
+            usernames.add(value)
+        elif '@' in value:
+            emails.add(value.lower())
+        elif value:
+            usernames.add(value)
+
+    # Resolve every identifier with a single IN query
+    by_id, by_username, by_email = {}, {}, {}
+    # Emails are matched case-insensitively
+    students = User.objects.filter(user_type='student').annotate(email_lower=Lower('email')).filter(
+        Q(id__in=ids) | Q(username__in=usernames) | Q(email_lower__in=emails)
+    ).values_list('id', 'username', 'email_lower')
+    for pk, username, email in students:
+        by_id[pk] = pk
+        by_username[username] = pk
+        by_email[email] = pk
+
+    report = []
+    student_ids = []
+    seen = set()
+    for row, value in enumerate(identifiers, start=1):
+        if value.isdigit():
+            student_id = by_id.get(int(value)) or by_username.get(value)
+        elif '@' in value:
+            student_id = by_email.get(value.lower())
+        else:
+            student_id = by_username.get(value)
+
+        if student_id is None:
+            report.append({'row': row, 'identifier': value, 'status': 'not_found'})
+        elif student_id in seen:
+            report.append({'row': row, 'identifier': value, 'student_id': student_id, 'status': 'duplicate'})
+        else:
+            seen.add(student_id)
+            student_ids.append(student_id)
+            report.append({'row': row, 'identifier': value, 'student_id': student_id, 'status': None})
+
+    with transaction.atomic():
+        existing = dict(
+            Enrollment.objects.filter(course=course, student_id__in=student_ids)
+            .values_list('student_id', 'is_active')
+        )
+        new_ids = [pk for pk in student_ids if pk not in existing]
+        while new_ids:
+            try:
+                with transaction.atomic():
+                    Enrollment.objects.bulk_create(
+                        [Enrollment(student_id=pk, course=course, is_active=True) for pk in new_ids],
+                        batch_size=1000,
+                    )
+                break
+            except IntegrityError:
+                # Another request enrolled some of them meanwhile: count those as
+                # existing enrollments and insert the rest
+                raced = dict(
+                    Enrollment.objects.filter(course=course, student_id__in=new_ids)
+                    .values_list('student_id', 'is_active')
+                )
+                if not raced:
+                    raise
+                existing.update(raced)
+                new_ids = [pk for pk in new_ids if pk not in raced]
+        inactive = [pk for pk, is_active in existing.items() if not is_active]
+        if inactive:
+            Enrollment.objects.filter(course=course, student_id__in=inactive).update(is_active=True)
+    if new_ids:
+        # bulk_create skips the signals that keep the dashboard counters current
+        invalidate_dashboard_stats()
+
+    summary = {'enrolled': 0, 'reactivated': 0, 'already_enrolled': 0, 'not_found': 0, 'duplicate': 0}
+    for entry in report:
+        if entry['status'] is None:
+            if entry['student_id'] not in existing:
+                entry['status'] = 'enrolled'
+            elif existing[entry['student_id']]:
+                entry['status'] = 'already_enrolled'
+            else:
+                entry['status'] = 'reactivated'
+        summary[entry['status']] += 1
+
+    return Response({
+        'message': f"{summary['enrolled'] + summary['reactivated']} students added to course",
+        'summary': summary,
+        'results': report,
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def faculty_remove_student_from_course(request, course_id, student_id):
@@ -238,19 +516,87 @@ def faculty_remove_student_from_course(request, course_id, student_id):
         return Response({'error': 'Enrollment not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+PERFORMANCE_TREND_LENGTH = 20
+
+
+def _student_performance_summary(course, enrollment):
+    """Aggregate a student's quiz results in a course with one grouped query over the course's quizzes"""
+    completed = Q(attempts__student_id=enrollment.student_id, attempts__completed_at__isnull=False)
+    quizzes = course.quizzes.order_by('id').values('id', 'title', 'passing_score').annotate(
+        attempts_count=Count('attempts', filter=completed),
+        best_score=Max('attempts__percentage', filter=completed),
+        average_score=Avg('attempts__percentage', filter=completed),
+        passed_attempts=Count('attempts', filter=completed & Q(attempts__is_passed=True)),
+        last_completed_at=Max('attempts__completed_at', filter=completed),
+    )
+
+    quiz_rows = []
+    total_attempts = 0
+    score_sum = 0
+    for quiz in quizzes:
+        total_attempts += quiz['attempts_count']
+        score_sum += (quiz['average_score'] or 0) * quiz['attempts_count']
+        quiz_rows.append({
+            'quiz_id': quiz['id'],
+            'title': quiz['title'],
+            'attempts_count': quiz['attempts_count'],
+            'best_score': quiz['best_score'],
+            'average_score': quiz['average_score'],
+            'is_passed': quiz['passed_attempts'] > 0,
+            'last_completed_at': quiz['last_completed_at'],
+        })
+
+    trend = QuizAttempt.objects.filter(
+        student_id=enrollment.student_id,
+        quiz__course=course,
+        completed_at__isnull=False
+    ).order_by('-completed_at').values('quiz_id', 'percentage', 'completed_at')[:PERFORMANCE_TREND_LENGTH]
+
+    student = enrollment.student
+    return {
+        'enrollment': {
+            'id': enrollment.id,
+            'student': {
+                'id': student.id,
+                'username': student.username,
+                'first_name': student.first_name,
+                'last_name': student.last_name,
+                'email': student.email,
+            },
+            'course': {'id': course.id, 'title': course.title},
+            'enrolled_at': enrollment.enrolled_at,
+            'progress_percentage': enrollment.progress_percentage,
+            'completed_lessons': enrollment.completed_lessons,
+            'completed_at': enrollment.completed_at,
+        },
+        'total_quizzes': len(quiz_rows),
+        'completed_quizzes': sum(1 for quiz in quiz_rows if quiz['attempts_count']),
+        'passed_quizzes': sum(1 for quiz in quiz_rows if quiz['is_passed']),
+        'total_attempts': total_attempts,
+        'average_score': score_sum / total_attempts if total_attempts else 0,
+        'quizzes': quiz_rows,
+        'score_trend': list(reversed(trend)),
+    }
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def faculty_student_performance(request, course_id, student_id):
     """Get detailed performance data for a student in faculty's course"""
     try:
         course = Course.objects.get(id=course_id, instructor=request.user)
-        enrollment = Enrollment.objects.get(
+        enrollment = Enrollment.objects.select_related('student').get(
             course=course,
             student_id=student_id,
             is_active=True
         )
-        
+
+        # ?summary=true returns aggregates only; attempts come from the attempts sub-resource
+        if request.query_params.get('summary') in ('1', 'true'):
+            return Response(_student_performance_summary(course, enrollment))
+
         # Get quiz attempts for this course
+        attempt_expansions = ['quiz', 'student', 'answers']
         quiz_attempts = QuizAttempt.objects.filter(
             student_id=student_id,
             quiz__course=course,
@@ -259,7 +605,12 @@ def faculty_student_performance(request, course_id, student_id):
         
         performance_data = {
             'enrollment': EnrollmentSerializer(enrollment).data,
-            'quiz_attempts': QuizAttemptSerializer(quiz_attempts, many=True).data,
+            'quiz_attempts': QuizAttemptSerializer(
+                quiz_attempts.with_related(attempt_expansions, request.user),
+                many=True,
+                context={'request': request},
+                expand=attempt_expansions
+            ).data,
             'total_quizzes': course.quizzes.count(),
             'completed_quizzes': quiz_attempts.count(),
             'average_score': quiz_attempts.aggregate(
@@ -273,3 +624,23 @@ def faculty_student_performance(request, course_id, student_id):
         return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
     except Enrollment.DoesNotExist:
         return Response({'error': 'Student not enrolled in this course'}, status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def faculty_student_attempts(request, course_id, student_id):
+    """Get a student's completed quiz attempts in faculty's course, one page at a time"""
+    if not Course.objects.filter(id=course_id, instructor=request.user).exists():
+        return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    params = expansion_from_request(request)
+    quiz_attempts = QuizAttempt.objects.filter(
+        student_id=student_id,
+        quiz__course_id=course_id,
+        completed_at__isnull=False
+    ).with_related(params.get('expand', []), request.user).order_by('-completed_at', '-id')
+
+    paginator = PageNumberPagination()
+    page = paginator.paginate_queryset(quiz_attempts, request)
+    serializer = QuizAttemptSerializer(page, many=True, context={'request': request}, **params)
+    return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .matching import build_fuzzy_index, normalize_answer
+from .models import Choice, Question
+
+ANSWER_KEY_CACHE_TIMEOUT = 24 * 60 * 60
+# Part of the cache key so keys compiled in an older shape are not reused
+ANSWER_KEY_FORMAT = 2
+LOCAL_CACHE_SIZE = getattr(settings, 'ANSWER_KEY_LOCAL_CACHE_SIZE', 256)
+
+
+class LocalLRUCache:
+    """Small thread-safe LRU kept in process memory in front of the shared cache"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_answer_keys = LocalLRUCache(LOCAL_CACHE_SIZE)
+
+
+def answer_key_cache_key(quiz_id, version):
+    return f'quiz:{quiz_id}:answer_key:f{ANSWER_KEY_FORMAT}:v{version}'
+
+
+def compile_answer_key(quiz_id):
+    """
+    Map every question ID of a quiz to what grading needs: its points, type,
+    valid and correct choice IDs, and the normalized accepted short answers
+    with the number of typos allowed in them.
+    """
+    answer_key = {}
+    questions = Question.objects.filter(quiz_id=quiz_id).values_list(
+        'id', 'points', 'question_type', 'answer_tolerance'
+    )
+    for question_id, points, question_type, answer_tolerance in questions:
+        answer_key[question_id] = {
+            'points': points,
+            'question_type': question_type,
+            'choice_ids': set(),
+            'correct_choice_ids': set(),
+            'accepted_answers': set(),
+            # Capped here too, since question lists saved with a quiz skip model validation
+            'answer_tolerance': (
+                min(answer_tolerance, Question.MAX_ANSWER_TOLERANCE) if question_type == 'short_answer' else 0
+            ),
+            'fuzzy_index': None,
+        }
+
+    choices = Choice.objects.filter(question__quiz_id=quiz_id).values_list(
+        'id', 'question_id', 'is_correct', 'choice_text'
+    )
+    for choice_id, question_id, is_correct, choice_text in choices:
+        entry = answer_key[question_id]
+        entry['choice_ids'].add(choice_id)
+        if is_correct:
+            entry['correct_choice_ids'].add(choice_id)
+            entry['accepted_answers'].add(normalize_answer(choice_text))
+
+    for entry in answer_key.values():
+        for field in ('choice_ids', 'correct_choice_ids', 'accepted_answers'):
+            entry[field] = frozenset(entry[field])
+        if entry['answer_tolerance']:
+            entry['fuzzy_index'] = build_fuzzy_index(entry['accepted_answers'], entry['answer_tolerance'])
+    return answer_key
+
+
+def get_answer_key(quiz):
+    """
+    Compiled answer key for the quiz's current content version, looked up in
+    process memory first, then the shared cache, and compiled on a miss.
+    """
+    key = answer_key_cache_key(quiz.id, quiz.content_version)
+    answer_key = _local_answer_keys.get(key)
+    if answer_key is None:
+        answer_key = cache.get(key)
+        if answer_key is None:
+            answer_key = compile_answer_key(quiz.id)
+            cache.set(key, answer_key, ANSWER_KEY_CACHE_TIMEOUT)
+        _local_answer_keys.set(key, answer_key)
+    return answer_key
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Answer, QuizAttempt
+
+AUTOSAVE_MIN_INTERVAL_SECONDS = getattr(settings, 'QUIZ_AUTOSAVE_MIN_INTERVAL_SECONDS', 3)
+
+
+def answers_by_question(answers_data):
+    """Key answer deltas by question, the latest entry for a question winning"""
+    return {
+        answer_data['question_id']: {
+            'question_id': answer_data['question_id'],
+            'selected_choice_id': answer_data.get('selected_choice_id'),
+            'text_answer': answer_data.get('text_answer', ''),
+        }
+        for answer_data in answers_data
+    }
+
+
+def upsert_draft_answers(attempt_id, answers_data):
+    """Write ungraded answers for an open attempt, replacing earlier saves of the same questions"""
+    Answer.objects.bulk_create(
+        [
+            Answer(
+                attempt_id=attempt_id,
+                question_id=answer_data['question_id'],
+                selected_choice_id=answer_data['selected_choice_id'],
+                text_answer=answer_data['text_answer']
+            )
+            for answer_data in answers_data
+        ],
+        update_conflicts=True,
+        unique_fields=['attempt', 'question'],
+        update_fields=['selected_choice', 'text_answer']
+    )
+
+
+def claim_autosave(attempt_id):
+    """
+    Whether an autosave of the attempt may be written now: at most one per
+    AUTOSAVE_MIN_INTERVAL_SECONDS, whatever the client's timer does. The
+    claim is a single atomic cache add, so concurrent saves cannot both win.
+    """
+    return cache.add(f'quiz_attempt:{attempt_id}:autosaved', True, AUTOSAVE_MIN_INTERVAL_SECONDS)
+
+
+def save_draft(attempt_id, answers_data):
+    """
+    Upsert answer deltas into the attempt's Answer rows, so an acknowledged
+    save is never lost. Each question's row is replaced whole, so concurrent
+    saves cannot undo each other. Returns False, writing nothing, if the
+    attempt was submitted in the meantime.
+    """
+    with transaction.atomic():
+        open_attempt = QuizAttempt.objects.select_for_update().filter(
+            id=attempt_id, completed_at__isnull=True
+        ).values_list('id', flat=True)
+        if not open_attempt:
+            return False
+        upsert_draft_answers(attempt_id, answers_by_question(answers_data).values())
+    return True
+
+
+def load_draft(attempt_id):
+    """Saved answers for an open attempt, keyed by question"""
+    return {
+        row['question_id']: row
+        for row in Answer.objects.filter(attempt_id=attempt_id).values(
+            'question_id', 'selected_choice_id', 'text_answer'
+        )
+    }
@@ -0,0 +1,120 @@
+from collections import defaultdict
+
+from .models import Choice, Question
+
+QUESTION_FIELDS = ['question_text', 'question_type', 'points', 'topic', 'answer_tolerance', 'order', 'explanation']
+CHOICE_FIELDS = ['choice_text', 'is_correct', 'order']
+
+
+def _assign(instance, fields, data):
+    """Copy the given fields from data onto instance, returning the names that changed"""
+    changed = set()
+    for name in fields:
+        if name not in data:
+            continue
+        value = instance._meta.get_field(name).to_python(data[name])
+        if getattr(instance, name) != value:
+            setattr(instance, name, value)
+            changed.add(name)
+    return changed
+
+
+def _pick(fields, data):
+    return {name: data[name] for name in fields if name in data}
+
+
+def _build(model, fields, data, **kwargs):
+    instance = model(**kwargs)
+    _assign(instance, fields, data)
+    return instance
+
+
+def create_questions(quiz, questions_data):
+    """Insert questions and their choices with one bulk INSERT per table"""
+    questions = Question.objects.bulk_create([
+        Question(quiz=quiz, **_pick(QUESTION_FIELDS, question_data))
+        for question_data in questions_data
+    ])
+    Choice.objects.bulk_create([
+        Choice(question=question, **_pick(CHOICE_FIELDS, choice_data))
+        for question, question_data in zip(questions, questions_data)
+        for choice_data in question_data.get('choices', [])
+    ])
+    return questions
+
+
+def apply_question_changes(quiz, questions_data):
+    """
+    Bring a quiz's questions and choices in line with questions_data, matching
+    existing rows by ID. Only new rows are inserted, only changed fields are
+    updated and only dropped rows are deleted, so answers to questions that
+    are kept survive the edit, those that picked a dropped choice with no
+    choice set. Returns whether anything changed.
+    """
+    questions = {question.id: question for question in quiz.questions.all()}
+    choices_by_question = defaultdict(dict)
+    for choice in Choice.objects.filter(question__quiz=quiz):
+        choices_by_question[choice.question_id][choice.id] = choice
+
+    kept_question_ids = set()
+    new_questions = []
+    changed_questions = []
+    question_fields = set()
+    for question_data in questions_data:
+        question = questions.get(question_data.get('id'))
+        if question is None or question.id in kept_question_ids:
+            new_questions.append((_build(Question, QUESTION_FIELDS, question_data, quiz=quiz), question_data))
+            continue
+        kept_question_ids.add(question.id)
+        changed = _assign(question, QUESTION_FIELDS, question_data)
+        if changed:
+            changed_questions.append(question)
+            question_fields |= changed
+
+    deleted_question_ids = set(questions) - kept_question_ids
+    if deleted_question_ids:
+        Question.objects.filter(id__in=deleted_question_ids).delete()
+    if changed_questions:
+        Question.objects.bulk_update(changed_questions, sorted(question_fields))
+    if new_questions:
+        Question.objects.bulk_create([question for question, _ in new_questions])
+
+    new_choices = []
+    changed_choices = []
+    choice_fields = set()
+    deleted_choice_ids = set()
+    for question_data in questions_data:
+        question_id = question_data.get('id')
+        if question_id not in kept_question_ids:
+            continue
+        existing = choices_by_question[question_id]
+        kept_choice_ids = set()
+        for choice_data in question_data.get('choices', []):
+            choice = existing.get(choice_data.get('id'))
+            if choice is None or choice.id in kept_choice_ids:
+                new_choices.append(_build(Choice, CHOICE_FIELDS, choice_data, question_id=question_id))
+                continue
+            kept_choice_ids.add(choice.id)
+            changed = _assign(choice, CHOICE_FIELDS, choice_data)
+            if changed:
+                changed_choices.append(choice)
+                choice_fields |= changed
+        deleted_choice_ids |= set(existing) - kept_choice_ids
+
+    for question, question_data in new_questions:
+        new_choices.extend(
+            _build(Choice, CHOICE_FIELDS, choice_data, question=question)
+            for choice_data in question_data.get('choices', [])
+        )
+
+    if deleted_choice_ids:
+        Choice.objects.filter(id__in=deleted_choice_ids).delete()
+    if changed_choices:
+        Choice.objects.bulk_update(changed_choices, sorted(choice_fields))
+    if new_choices:
+        Choice.objects.bulk_create(new_choices)
+
+    return bool(
+        deleted_question_ids or changed_questions or new_questions
+        or deleted_choice_ids or changed_choices or new_choices
+    )
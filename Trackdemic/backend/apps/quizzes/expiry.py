@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .grading import AttemptNotOpenError, GradingError, submit_attempt
+from .models import QuizAttempt
+
+EXPIRY_GRACE_SECONDS = getattr(settings, 'QUIZ_EXPIRY_GRACE_SECONDS', 120)
+SWEEP_BATCH_SIZE = 100
+
+
+def time_limit_end(started_at, time_limit_minutes):
+    return started_at + timedelta(minutes=time_limit_minutes)
+
+
+def is_expired(started_at, time_limit_minutes, now=None):
+    """Whether an attempt is past its time limit plus the grace period allowed for slow submits"""
+    deadline = time_limit_end(started_at, time_limit_minutes) + timedelta(seconds=EXPIRY_GRACE_SECONDS)
+    return deadline <= (now or timezone.now())
+
+
+def expired_attempts(now=None):
+    """
+    (attempt ID, time limit end) for every open attempt past its deadline,
+    oldest first. The (completed_at, started_at) index narrows the read to
+    open attempts started before the grace cutoff, and each quiz's own time
+    limit is applied to that short list.
+    """
+    now = now or timezone.now()
+    candidates = QuizAttempt.objects.filter(
+        completed_at__isnull=True,
+        started_at__lt=now - timedelta(seconds=EXPIRY_GRACE_SECONDS)
+    ).order_by('started_at').values_list('id', 'started_at', 'quiz__time_limit_minutes')
+    return [
+        (attempt_id, time_limit_end(started_at, time_limit_minutes))
+        for attempt_id, started_at, time_limit_minutes in candidates
+        if is_expired(started_at, time_limit_minutes, now)
+    ]
+
+
+def finalize_expired_attempt(attempt_id, closed_at):
+    """Grade whatever the student saved and close the attempt when its time ran out"""
+    return submit_attempt(attempt_id, [], completed_at=closed_at)
+
+
+def sweep_expired_attempts(now=None, batch_size=SWEEP_BATCH_SIZE, dry_run=False):
+    """
+    Finalize expired attempts, one transaction per batch. Returns counts of
+    attempts found expired, finalized, skipped because they were submitted
+    meanwhile, and failed.
+    """
+    expired = expired_attempts(now)
+    counts = {'expired': len(expired), 'finalized': 0, 'skipped': 0, 'failed': 0}
+    if dry_run:
+        return counts
+
+    for start in range(0, len(expired), batch_size):
+        with transaction.atomic():
+            for attempt_id, closed_at in expired[start:start + batch_size]:
+                try:
+                    finalize_expired_attempt(attempt_id, closed_at)
+                except AttemptNotOpenError:
+                    counts['skipped'] += 1
+                except GradingError:
+                    counts['failed'] += 1
+                else:
+                    counts['finalized'] += 1
+    return counts
@@ -0,0 +1,161 @@
+import logging
+
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from .answer_keys import get_answer_key
+from .drafts import answers_by_question, load_draft
+from .item_analysis import record_attempt_stats
+from .leaderboards import record_leaderboard_result
+from .matching import match_answer, normalize_answer
+from .pools import attempt_answer_key
+from .models import Answer, QuizAttempt
+
+logger = logging.getLogger(__name__)
+
+
+class GradingError(Exception):
+    """Raised when a submission cannot be graded against its quiz"""
+
+
+class AttemptNotOpenError(GradingError):
+    """Raised when the attempt to grade has already been submitted or does not exist"""
+
+
+def validate_answer(answer_key, answer_data):
+    """Check an answer refers to a question of the quiz and, if set, one of its choices"""
+    question_id = answer_data['question_id']
+    entry = answer_key.get(question_id)
+    if entry is None:
+        raise GradingError(f'Question {question_id} does not belong to this quiz')
+    selected_choice_id = answer_data.get('selected_choice_id')
+    if selected_choice_id is not None and selected_choice_id not in entry['choice_ids']:
+        raise GradingError(f'Choice {selected_choice_id} does not belong to question {question_id}')
+    return entry
+
+
+def fits_answer_key(answer_key, answer_data):
+    try:
+        validate_answer(answer_key, answer_data)
+    except GradingError:
+        return False
+    return True
+
+
+def grade_answers(attempt, answer_key, answers_data):
+    """
+    Grade submitted answers against a compiled answer key without touching the
+    database. Returns unsaved Answer objects and the points earned; raises
+    GradingError for answers that don't fit the quiz.
+    """
+    answers = []
+    earned_points = 0
+    seen = set()
+
+    for answer_data in answers_data:
+        entry = validate_answer(answer_key, answer_data)
+        question_id = answer_data['question_id']
+        if question_id in seen:
+            raise GradingError(f'Question {question_id} was answered more than once')
+        seen.add(question_id)
+
+        selected_choice_id = answer_data.get('selected_choice_id')
+        answer = Answer(
+            attempt=attempt,
+            question_id=question_id,
+            selected_choice_id=selected_choice_id,
+            text_answer=answer_data.get('text_answer', '')
+        )
+
+        # Check if answer is correct
+        if entry['question_type'] in ['multiple_choice', 'true_false']:
+            answer.is_correct = selected_choice_id in entry['correct_choice_ids']
+        elif entry['question_type'] == 'short_answer':
+            # Any correct choice is an acceptable answer, so faculty can list several
+            answer.is_correct = match_answer(
+                normalize_answer(answer.text_answer),
+                entry['accepted_answers'],
+                entry['fuzzy_index'],
+                entry['answer_tolerance']
+            )
+
+        if answer.is_correct:
+            answer.points_earned = entry['points']
+            earned_points += entry['points']
+        answers.append(answer)
+
+    return answers, earned_points
+
+
+def _record_attempt_stats(quiz, answer_key, answers, percentage, question_ids):
+    try:
+        record_attempt_stats(quiz, answer_key, answers, percentage, question_ids)
+    except DatabaseError:
+        # The attempt is already saved; rebuild_item_stats restores the sums
+        logger.exception('Could not record item stats for quiz %s', quiz.id)
+
+
+def submit_attempt(attempt_id, answers_data, completed_at=None):
+    """
+    Grade and finalize an open attempt in a single transaction with a fixed
+    number of queries, however many questions the quiz has. The autosaved
+    draft is graded with answers_data applied on top as the final delta;
+    saved answers that no longer fit the quiz, because questions were edited
+    since, are dropped. completed_at defaults to now.
+    """
+    with transaction.atomic():
+        try:
+            attempt = QuizAttempt.objects.select_for_update().select_related('quiz').get(
+                id=attempt_id,
+                completed_at__isnull=True
+            )
+        except QuizAttempt.DoesNotExist:
+            raise AttemptNotOpenError('No active quiz attempt found')
+
+        quiz = attempt.quiz
+        # Pooled attempts are graded on the questions they were given
+        answer_key = attempt_answer_key(get_answer_key(quiz), attempt.question_ids)
+        draft = {
+            question_id: answer_data
+            for question_id, answer_data in load_draft(attempt.id).items()
+            if fits_answer_key(answer_key, answer_data)
+        }
+        draft.update(answers_by_question(answers_data))
+        # Unanswered questions are stored as blank answers, so every question the
+        # attempt was given has a row for item analysis to count
+        for question_id in answer_key:
+            draft.setdefault(question_id, {'question_id': question_id, 'selected_choice_id': None, 'text_answer': ''})
+        answers, earned_points = grade_answers(attempt, answer_key, draft.values())
+        Answer.objects.bulk_create(
+            answers,
+            update_conflicts=True,
+            unique_fields=['attempt', 'question'],
+            update_fields=['selected_choice', 'text_answer', 'is_correct', 'points_earned']
+        )
+
+        total_points = sum(entry['points'] for entry in answer_key.values())
+        percentage = (earned_points / total_points * 100) if total_points > 0 else 0
+        completed_at = completed_at or timezone.now()
+        time_taken = (completed_at - attempt.started_at).total_seconds() / 60
+
+        attempt.completed_at = completed_at
+        attempt.score = earned_points
+        attempt.percentage = percentage
+        attempt.is_passed = percentage >= quiz.passing_score
+        attempt.time_taken_minutes = round(time_taken, 2)  # Store as float with 2 decimal places
+        attempt.save(update_fields=['completed_at', 'score', 'percentage', 'is_passed', 'time_taken_minutes'])
+        record_leaderboard_result(attempt)
+        # After the commit, so a cohort submitting together does not queue on the
+        # shared stats rows while holding its grading transactions open
+        full_answer_key, question_ids = get_answer_key(quiz), list(answer_key)
+        transaction.on_commit(
+            lambda: _record_attempt_stats(quiz, full_answer_key, answers, percentage, question_ids)
+        )
+
+    return attempt, {
+        'score': earned_points,
+        'total_points': total_points,
+        'percentage': percentage,
+        'is_passed': attempt.is_passed,
+        'time_taken_minutes': attempt.time_taken_minutes
+    }
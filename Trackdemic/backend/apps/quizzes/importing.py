@@ -0,0 +1,261 @@
+import csv
+import io
+import json
+
+from django.db import transaction
+from django.db.models import F, Max
+
+from .editing import create_questions
+from .models import Choice, Question, Quiz
+from .payloads import warm_quiz_caches
+
+IMPORT_FORMATS = ('json', 'ndjson', 'csv')
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+JSON_CHUNK_SIZE = 64 * 1024
+CSV_LIST_SEPARATOR = '|'
+QUESTION_TYPES = {value for value, _ in Question.QUESTION_TYPES}
+CHOICE_TEXT_MAX_LENGTH = Choice._meta.get_field('choice_text').max_length
+
+
+class QuestionImportError(Exception):
+    """Raised when an import file cannot be read at all"""
+
+
+def import_format_for(filename, default='json'):
+    """Guess the import format from a file name"""
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    if extension in ('ndjson', 'jsonl'):
+        return 'ndjson'
+    if extension in IMPORT_FORMATS:
+        return extension
+    return default
+
+
+def iter_json_array(stream, chunk_size=JSON_CHUNK_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time, reading the
+    stream in chunks so only the current element is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = '', 0
+    started = False
+    while True:
+        separators = ' \t\r\n,' if started else ' \t\r\n'
+        while position < len(buffer) and buffer[position] in separators:
+            position += 1
+        if position == len(buffer):
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise QuestionImportError('Unexpected end of JSON input')
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        if not started:
+            if buffer[position] != '[':
+                raise QuestionImportError('Expected a JSON array of questions')
+            started = True
+            position += 1
+            continue
+        if buffer[position] == ']':
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The element may continue in the next chunk
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise QuestionImportError('Invalid JSON in question list')
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield value
+        position = end
+        if position > chunk_size:
+            buffer, position = buffer[position:], 0
+
+
+def iter_json_rows(stream):
+    for row, value in enumerate(iter_json_array(stream), start=1):
+        yield row, value, None
+
+
+def iter_ndjson_rows(stream):
+    for row, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield row, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield row, None, f'Invalid JSON: {e.msg}'
+
+
+def _split_list(value):
+    return [item.strip() for item in (value or '').split(CSV_LIST_SEPARATOR) if item.strip()]
+
+
+def iter_csv_rows(stream):
+    """
+    Rows with question_text, question_type, points, topic, answer_tolerance,
+    explanation, choices and correct columns. Choices are separated by "|", and correct lists the
+    1-based positions of the correct choices. For short answer questions the
+    choices are the accepted answers.
+    """
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames or 'question_text' not in reader.fieldnames:
+        raise QuestionImportError('CSV header must include a question_text column')
+    # Data rows start on line 2, after the header
+    for row, record in enumerate(reader, start=2):
+        correct = set(_split_list(record.get('correct')))
+        yield row, {
+            'question_text': record.get('question_text'),
+            'question_type': record.get('question_type') or 'multiple_choice',
+            'points': record.get('points') or 1,
+            'topic': record.get('topic') or '',
+            'answer_tolerance': record.get('answer_tolerance') or 0,
+            'explanation': record.get('explanation') or None,
+            'choices': [
+                {'choice_text': text, 'is_correct': str(position) in correct}
+                for position, text in enumerate(_split_list(record.get('choices')), start=1)
+            ],
+        }, None
+
+
+ROW_READERS = {
+    'json': iter_json_rows,
+    'ndjson': iter_ndjson_rows,
+    'csv': iter_csv_rows,
+}
+
+
+def read_question_rows(binary_stream, import_format):
+    """Decode a binary upload or file and stream its rows in the given format"""
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    return ROW_READERS[import_format](text)
+
+
+def clean_question(data):
+    """Validate one imported question, returning (cleaned data, list of errors)"""
+    if not isinstance(data, dict):
+        return None, ['Expected an object']
+    errors = []
+
+    question_text = data.get('question_text')
+    if not isinstance(question_text, str) or not question_text.strip():
+        errors.append('question_text is required')
+
+    question_type = data.get('question_type') or 'multiple_choice'
+    if question_type not in QUESTION_TYPES:
+        errors.append(f'question_type must be one of {", ".join(sorted(QUESTION_TYPES))}')
+
+    points = data.get('points', 1)
+    try:
+        points = int(points)
+        if points < 1:
+            raise ValueError
+    except (TypeError, ValueError):
+        errors.append('points must be a positive integer')
+
+    explanation = data.get('explanation')
+    if explanation is not None and not isinstance(explanation, str):
+        errors.append('explanation must be text')
+
+    topic = data.get('topic') or ''
+    if not isinstance(topic, str) or len(topic) > Question._meta.get_field('topic').max_length:
+        errors.append('topic must be text of at most 100 characters')
+
+    answer_tolerance = data.get('answer_tolerance') or 0
+    try:
+        answer_tolerance = int(answer_tolerance)
+        if not 0 <= answer_tolerance <= Question.MAX_ANSWER_TOLERANCE:
+            raise ValueError
+    except (TypeError, ValueError):
+        errors.append(f'answer_tolerance must be a whole number from 0 to {Question.MAX_ANSWER_TOLERANCE}')
+
+    choices = []
+    raw_choices = data.get('choices') or []
+    if not isinstance(raw_choices, list):
+        errors.append('choices must be a list')
+        raw_choices = []
+    for order, choice in enumerate(raw_choices):
+        text = choice.get('choice_text') if isinstance(choice, dict) else None
+        if not isinstance(text, str) or not text.strip():
+            errors.append(f'choice {order + 1} needs choice_text')
+            continue
+        if len(text.strip()) > CHOICE_TEXT_MAX_LENGTH:
+            errors.append(f'choice {order + 1} must be at most {CHOICE_TEXT_MAX_LENGTH} characters')
+        # Every listed short answer is an accepted answer
+        is_correct = question_type == 'short_answer' or bool(choice.get('is_correct'))
+        choices.append({'choice_text': text.strip(), 'is_correct': is_correct, 'order': order})
+
+    correct_count = sum(choice['is_correct'] for choice in choices)
+    if question_type == 'multiple_choice' and (len(choices) < 2 or not correct_count):
+        errors.append('multiple choice questions need at least two choices and one correct choice')
+    elif question_type == 'true_false' and (len(choices) != 2 or correct_count != 1):
+        errors.append('true/false questions need exactly two choices and one correct choice')
+    elif question_type == 'short_answer' and not choices:
+        errors.append('short answer questions need at least one accepted answer')
+
+    if errors:
+        return None, errors
+    return {
+        'question_text': question_text.strip(),
+        'question_type': question_type,
+        'points': points,
+        'topic': topic.strip(),
+        'answer_tolerance': answer_tolerance,
+        'explanation': explanation,
+        'choices': choices,
+    }, None
+
+
+def import_questions(quiz, rows, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Validate (row, data, error) tuples as they stream in and insert the valid
+    questions after the quiz's existing ones in bulk batches, all in one
+    transaction. Invalid rows are skipped and reported.
+    """
+    imported = 0
+    failed = 0
+    errors = []
+
+    def report(row, messages):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'row': row, 'errors': messages})
+
+    with transaction.atomic():
+        next_order = (quiz.questions.aggregate(last=Max('order'))['last'] or 0) + 1
+        batch = []
+        for row, data, error in rows:
+            if error:
+                report(row, [error])
+                continue
+            cleaned, messages = clean_question(data)
+            if messages:
+                report(row, messages)
+                continue
+            cleaned['order'] = next_order + imported
+            imported += 1
+            if not dry_run:
+                batch.append(cleaned)
+                if len(batch) >= batch_size:
+                    create_questions(quiz, batch)
+                    batch = []
+        if batch:
+            create_questions(quiz, batch)
+
+        if imported and not dry_run:
+            Quiz.objects.filter(pk=quiz.pk).update(content_version=F('content_version') + 1)
+            quiz.refresh_from_db(fields=['content_version'])
+            quiz.refresh_totals()
+            transaction.on_commit(lambda: warm_quiz_caches(quiz))
+
+    return {
+        'imported': imported,
+        'failed': failed,
+        'errors': errors,
+        'dry_run': dry_run,
+    }
@@ -0,0 +1,111 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import Choice, ChoiceStats, Question, QuestionStats
+
+
+ITEM_STATS_ROWS_TIMEOUT = 24 * 60 * 60
+
+
+def ensure_stats_rows(quiz, answer_key):
+    """
+    Create any missing stats rows for the quiz's questions and choices, once
+    per content version, so grading only ever has to run UPDATEs. The flag is
+    only set once the rows commit, so a rolled-back grading retries them.
+    """
+    key = f'quiz:{quiz.id}:item_stats_rows:v{quiz.content_version}'
+    if cache.get(key):
+        return
+    QuestionStats.objects.bulk_create(
+        [QuestionStats(question_id=question_id) for question_id in answer_key],
+        ignore_conflicts=True
+    )
+    ChoiceStats.objects.bulk_create(
+        [ChoiceStats(choice_id=choice_id) for entry in answer_key.values() for choice_id in entry['choice_ids']],
+        ignore_conflicts=True
+    )
+    transaction.on_commit(lambda: cache.set(key, True, ITEM_STATS_ROWS_TIMEOUT))
+
+
+def record_attempt_stats(quiz, answer_key, answers, percentage, question_ids=None):
+    """
+    Fold one graded attempt into the item-analysis sums with one UPDATE per
+    table. Every question the attempt was given counts as answered; missing
+    answers count as incorrect.
+    """
+    question_ids = list(answer_key if question_ids is None else question_ids)
+    if not question_ids:
+        return
+    ensure_stats_rows(quiz, answer_key)
+    correct_ids = [answer.question_id for answer in answers if answer.is_correct]
+    selected_ids = [answer.selected_choice_id for answer in answers if answer.selected_choice_id is not None]
+
+    QuestionStats.objects.filter(question_id__in=question_ids).update(
+        attempt_count=F('attempt_count') + 1,
+        correct_count=F('correct_count') + Case(
+            When(question_id__in=correct_ids, then=Value(1)), default=Value(0), output_field=IntegerField()
+        ),
+        score_sum=F('score_sum') + percentage,
+        score_sq_sum=F('score_sq_sum') + percentage * percentage,
+        correct_score_sum=F('correct_score_sum') + Case(
+            When(question_id__in=correct_ids, then=Value(percentage)), default=Value(0.0), output_field=FloatField()
+        ),
+    )
+    if selected_ids:
+        ChoiceStats.objects.filter(choice_id__in=selected_ids).update(selection_count=F('selection_count') + 1)
+
+
+def rebuild_item_stats(quiz_ids=None):
+    """
+    Recompute item-analysis rows from completed attempts with one aggregate
+    query per table. Grading stores an answer, blank if need be, for every
+    question an attempt was given, so counting answers counts exactly the
+    attempts the incremental path folded in. Returns the number of question
+    and choice rows written.
+    """
+    questions = Question.objects.all()
+    choices = Choice.objects.all()
+    if quiz_ids is not None:
+        questions = questions.filter(quiz_id__in=quiz_ids)
+        choices = choices.filter(question__quiz_id__in=quiz_ids)
+
+    completed_answers = Q(answer__attempt__completed_at__isnull=False)
+    correct_answers = completed_answers & Q(answer__is_correct=True)
+    percentage = F('answer__attempt__percentage')
+
+    question_rows = questions.order_by().annotate(
+        completed_count=Count('answer', filter=completed_answers),
+        completed_correct_count=Count('answer', filter=correct_answers),
+        completed_score_sum=Coalesce(Sum(percentage, filter=completed_answers), 0.0, output_field=FloatField()),
+        completed_score_sq_sum=Coalesce(
+            Sum(percentage * percentage, filter=completed_answers), 0.0, output_field=FloatField()
+        ),
+        completed_correct_score_sum=Coalesce(Sum(percentage, filter=correct_answers), 0.0, output_field=FloatField()),
+    ).values_list(
+        'id', 'completed_count', 'completed_correct_count', 'completed_score_sum',
+        'completed_score_sq_sum', 'completed_correct_score_sum'
+    )
+    choice_rows = choices.order_by().annotate(
+        completed_selection_count=Count('answer', filter=completed_answers)
+    ).values_list('id', 'completed_selection_count')
+
+    QuestionStats.objects.filter(question__in=questions).delete()
+    ChoiceStats.objects.filter(choice__in=choices).delete()
+    question_stats = QuestionStats.objects.bulk_create([
+        QuestionStats(
+            question_id=question_id,
+            attempt_count=attempt_count,
+            correct_count=correct_count,
+            score_sum=score_sum,
+            score_sq_sum=score_sq_sum,
+            correct_score_sum=correct_score_sum,
+        )
+        for question_id, attempt_count, correct_count, score_sum, score_sq_sum, correct_score_sum in question_rows
+    ], batch_size=1000)
+    choice_stats = ChoiceStats.objects.bulk_create([
+        ChoiceStats(choice_id=choice_id, selection_count=selection_count)
+        for choice_id, selection_count in choice_rows
+    ], batch_size=1000)
+    return len(question_stats), len(choice_stats)
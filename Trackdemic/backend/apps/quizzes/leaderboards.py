@@ -0,0 +1,147 @@
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .models import CourseLeaderboardEntry, Quiz, QuizAttempt, QuizLeaderboardEntry
+
+DEFAULT_LEADERBOARD_SIZE = 10
+MAX_LEADERBOARD_SIZE = 100
+
+
+def record_leaderboard_result(attempt):
+    """
+    Fold a graded attempt into its quiz and course leaderboards. Only a new
+    best for the student (a higher percentage, or the same in less time)
+    changes anything, and the course entry moves by the difference.
+    """
+    percentage = attempt.percentage
+    time_taken = attempt.time_taken_minutes or 0
+    entry = QuizLeaderboardEntry.objects.select_for_update().filter(
+        quiz_id=attempt.quiz_id,
+        student_id=attempt.student_id
+    ).first()
+    if entry is None:
+        QuizLeaderboardEntry.objects.create(
+            quiz_id=attempt.quiz_id,
+            student_id=attempt.student_id,
+            percentage=percentage,
+            time_taken_minutes=time_taken,
+            achieved_at=attempt.completed_at
+        )
+        delta = (percentage, 1, time_taken)
+    elif percentage > entry.percentage or (percentage == entry.percentage and time_taken < entry.time_taken_minutes):
+        delta = (percentage - entry.percentage, 0, time_taken - entry.time_taken_minutes)
+        entry.percentage = percentage
+        entry.time_taken_minutes = time_taken
+        entry.achieved_at = attempt.completed_at
+        entry.save(update_fields=['percentage', 'time_taken_minutes', 'achieved_at'])
+    else:
+        return
+
+    course_id = attempt.quiz.course_id
+    if course_id is None:
+        return
+    CourseLeaderboardEntry.objects.bulk_create(
+        [CourseLeaderboardEntry(course_id=course_id, student_id=attempt.student_id)],
+        ignore_conflicts=True
+    )
+    CourseLeaderboardEntry.objects.filter(course_id=course_id, student_id=attempt.student_id).update(
+        total_percentage=F('total_percentage') + delta[0],
+        quizzes_completed=F('quizzes_completed') + delta[1],
+        total_time_minutes=F('total_time_minutes') + delta[2],
+        updated_at=timezone.now()
+    )
+
+
+def _leaderboard(entries, score_field, time_field, student, limit):
+    """
+    The top entries in rank order plus the student's own entry. Tied entries
+    share a rank. The top is an ordered LIMIT on the leaderboard index. A
+    rank outside it is the count of entries ahead of the student, taken as
+    two contiguous ranges of that index, higher scores and then equal scores
+    in less time, so it reads only the index entries ahead of the student.
+    """
+    top = list(entries.select_related('student').order_by(f'-{score_field}', time_field, 'id')[:limit])
+    previous_key = None
+    rank = 0
+    for position, entry in enumerate(top, start=1):
+        key = (getattr(entry, score_field), getattr(entry, time_field))
+        if key != previous_key:
+            rank, previous_key = position, key
+        entry.rank = rank
+
+    mine = next((entry for entry in top if entry.student_id == student.id), None)
+    if mine is None:
+        mine = entries.select_related('student').filter(student=student).first()
+        if mine is not None:
+            score, time = getattr(mine, score_field), getattr(mine, time_field)
+            higher = entries.filter(**{f'{score_field}__gt': score}).count()
+            tied_faster = entries.filter(**{score_field: score, f'{time_field}__lt': time}).count()
+            mine.rank = higher + tied_faster + 1
+    return top, mine
+
+
+def quiz_leaderboard(quiz_id, student, limit=DEFAULT_LEADERBOARD_SIZE):
+    entries = QuizLeaderboardEntry.objects.filter(quiz_id=quiz_id)
+    return _leaderboard(entries, 'percentage', 'time_taken_minutes', student, limit)
+
+
+def course_leaderboard(course_id, student, limit=DEFAULT_LEADERBOARD_SIZE):
+    entries = CourseLeaderboardEntry.objects.filter(course_id=course_id)
+    return _leaderboard(entries, 'total_percentage', 'total_time_minutes', student, limit)
+
+
+def rebuild_leaderboards(quiz_ids=None):
+    """
+    Recreate quiz leaderboard entries from completed attempts, then the
+    entries of every course those quizzes belong to from the quiz entries.
+    Returns the number of quiz and course entries written.
+    """
+    quizzes = Quiz.objects.all()
+    quiz_entries = QuizLeaderboardEntry.objects.all()
+    attempts = QuizAttempt.objects.filter(completed_at__isnull=False, percentage__isnull=False)
+    if quiz_ids is not None:
+        quizzes = quizzes.filter(id__in=quiz_ids)
+        quiz_entries = quiz_entries.filter(quiz_id__in=quiz_ids)
+        attempts = attempts.filter(quiz_id__in=quiz_ids)
+
+    # Rows arrive best first for each quiz and student, so the first one wins
+    rows = attempts.order_by(
+        'quiz_id', 'student_id', '-percentage', F('time_taken_minutes').asc(nulls_last=True), 'completed_at'
+    ).values_list('quiz_id', 'student_id', 'percentage', 'time_taken_minutes', 'completed_at')
+    best = []
+    last = None
+    for quiz_id, student_id, percentage, time_taken, completed_at in rows.iterator():
+        if (quiz_id, student_id) == last:
+            continue
+        last = (quiz_id, student_id)
+        best.append(QuizLeaderboardEntry(
+            quiz_id=quiz_id,
+            student_id=student_id,
+            percentage=percentage,
+            time_taken_minutes=time_taken or 0,
+            achieved_at=completed_at
+        ))
+    quiz_entries.delete()
+    QuizLeaderboardEntry.objects.bulk_create(best, batch_size=1000)
+
+    course_ids = quizzes.filter(course__isnull=False).values('course_id')
+    totals = QuizLeaderboardEntry.objects.filter(quiz__course_id__in=course_ids).order_by().values(
+        'quiz__course_id', 'student_id'
+    ).annotate(
+        total_percentage=Sum('percentage'),
+        quizzes_completed=Count('id'),
+        total_time_minutes=Sum('time_taken_minutes')
+    )
+    course_entries = [
+        CourseLeaderboardEntry(
+            course_id=row['quiz__course_id'],
+            student_id=row['student_id'],
+            total_percentage=row['total_percentage'],
+            quizzes_completed=row['quizzes_completed'],
+            total_time_minutes=row['total_time_minutes']
+        )
+        for row in totals
+    ]
+    CourseLeaderboardEntry.objects.filter(course_id__in=course_ids).delete()
+    CourseLeaderboardEntry.objects.bulk_create(course_entries, batch_size=1000)
+    return len(best), len(course_entries)
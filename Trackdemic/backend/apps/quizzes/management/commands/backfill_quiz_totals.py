@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.quizzes.models import Quiz
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored question count and total points of every quiz'
+
+    def handle(self, *args, **options):
+        updated = Quiz.objects.refresh_totals()
+        self.stdout.write(self.style.SUCCESS(f'Updated totals for {updated} quizzes'))
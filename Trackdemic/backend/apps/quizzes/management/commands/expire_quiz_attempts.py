@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.quizzes.expiry import SWEEP_BATCH_SIZE, sweep_expired_attempts
+
+
+class Command(BaseCommand):
+    help = (
+        'Grade and close open quiz attempts whose time limit has run out. '
+        'Meant to be run periodically, e.g. every minute from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SWEEP_BATCH_SIZE,
+                            help='Attempts finalized per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count expired attempts')
+
+    def handle(self, *args, **options):
+        counts = sweep_expired_attempts(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f"{counts['expired']} expired attempts found")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['expired']} expired attempts: {counts['finalized']} finalized, "
+            f"{counts['skipped']} already submitted, {counts['failed']} failed"
+        ))
@@ -0,0 +1,48 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.quizzes.importing import (
+    IMPORT_BATCH_SIZE, IMPORT_FORMATS, QuestionImportError, import_format_for, import_questions, read_question_rows
+)
+from apps.quizzes.models import Quiz
+
+
+class Command(BaseCommand):
+    help = 'Import a question bank into a quiz from a JSON, NDJSON or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('quiz_id', type=int)
+        parser.add_argument('path', help='File to import, or - for standard input')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Defaults to the file extension, then JSON')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate without saving')
+
+    def handle(self, *args, **options):
+        try:
+            quiz = Quiz.objects.get(id=options['quiz_id'])
+        except Quiz.DoesNotExist:
+            raise CommandError(f'Quiz {options["quiz_id"]} not found')
+
+        path = options['path']
+        import_format = options['format'] or import_format_for(path)
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            report = import_questions(
+                quiz,
+                read_question_rows(stream, import_format),
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run']
+            )
+        except (QuestionImportError, UnicodeDecodeError, csv.Error) as e:
+            raise CommandError(f'Could not read {path}: {e}')
+        finally:
+            stream.close()
+
+        for error in report['errors']:
+            self.stderr.write(f'Row {error["row"]}: {"; ".join(error["errors"])}')
+        verb = 'Validated' if report['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {report["imported"]} questions into "{quiz.title}", {report["failed"]} rows failed'
+        ))
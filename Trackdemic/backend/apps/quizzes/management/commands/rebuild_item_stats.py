@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.quizzes.item_analysis import rebuild_item_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-question and per-choice item analysis from completed attempts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quiz', type=int, help='Only rebuild stats for this quiz ID')
+
+    def handle(self, *args, **options):
+        quiz_ids = [options['quiz']] if options['quiz'] else None
+        with transaction.atomic():
+            questions, choices = rebuild_item_stats(quiz_ids)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {questions} questions and {choices} choices'))
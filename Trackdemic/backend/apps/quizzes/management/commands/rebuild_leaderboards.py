@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.quizzes.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild quiz and course leaderboards from completed attempts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quiz', type=int, help='Only rebuild this quiz and the leaderboard of its course')
+
+    def handle(self, *args, **options):
+        quiz_ids = [options['quiz']] if options['quiz'] else None
+        with transaction.atomic():
+            quiz_entries, course_entries = rebuild_leaderboards(quiz_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {quiz_entries} quiz leaderboard entries and {course_entries} course leaderboard entries'
+        ))
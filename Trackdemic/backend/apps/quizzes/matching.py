@@ -0,0 +1,122 @@
+import unicodedata
+from collections import defaultdict
+
+# Dropped rather than turned into a space, so "don't" matches "dont"
+APOSTROPHES = frozenset("'‘’ʼ")
+
+
+def normalize_answer(value):
+    """
+    Fold a short answer for comparison: strip accents, apply compatibility
+    forms and case folding, turn punctuation into spaces and collapse runs
+    of whitespace.
+    """
+    characters = []
+    for character in unicodedata.normalize('NFKD', value or ''):
+        if unicodedata.combining(character) or character in APOSTROPHES:
+            continue
+        if unicodedata.category(character).startswith('P'):
+            character = ' '
+        characters.append(character)
+    return ' '.join(''.join(characters).casefold().split())
+
+
+def within_distance(first, second, limit):
+    """
+    Whether two strings are at most limit insertions, deletions or
+    substitutions apart. Only the diagonal band of width 2 * limit + 1 is
+    computed, and it stops as soon as a whole row exceeds the limit.
+    """
+    if first == second:
+        return True
+    if abs(len(first) - len(second)) > limit:
+        return False
+    if len(first) > len(second):
+        first, second = second, first
+
+    # A shared prefix and suffix cost nothing
+    start = 0
+    while start < len(first) and first[start] == second[start]:
+        start += 1
+    end = 0
+    while end < len(first) - start and first[-1 - end] == second[-1 - end]:
+        end += 1
+    first = first[start:len(first) - end]
+    second = second[start:len(second) - end]
+    if not first:
+        return len(second) <= limit
+
+    over = limit + 1
+    previous = [min(j, over) for j in range(len(second) + 1)]
+    for i, character in enumerate(first, start=1):
+        current = [over] * (len(second) + 1)
+        current[0] = min(i, over)
+        row_min = current[0]
+        for j in range(max(1, i - limit), min(len(second), i + limit) + 1):
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (character != second[j - 1]),
+            )
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+def _segments(length, tolerance):
+    """Split a length into tolerance + 1 nearly equal segments, yielding (position, start, size)"""
+    count = tolerance + 1
+    base, longer = divmod(length, count)
+    start = 0
+    for position in range(count):
+        size = base + (position >= count - longer)
+        yield position, start, size
+        start += size
+
+
+def build_fuzzy_index(answers, tolerance):
+    """
+    Index normalized answers for matching within tolerance edits. Each answer
+    is cut into tolerance + 1 segments; an answer that close must keep at
+    least one of them intact and shifted by at most tolerance characters,
+    so a few dictionary lookups find every candidate worth comparing.
+    """
+    index = defaultdict(list)
+    for answer in answers:
+        for position, start, size in _segments(len(answer), tolerance):
+            index[(len(answer), position, answer[start:start + size])].append(answer)
+    return {key: tuple(group) for key, group in index.items()}
+
+
+def fuzzy_candidates(answer, fuzzy_index, tolerance):
+    """Indexed answers sharing an aligned segment with answer"""
+    candidates = set()
+    length = len(answer)
+    for candidate_length in range(max(0, length - tolerance), length + tolerance + 1):
+        for position, start, size in _segments(candidate_length, tolerance):
+            for offset in range(max(0, start - tolerance), min(length - size, start + tolerance) + 1):
+                candidates.update(fuzzy_index.get((candidate_length, position, answer[offset:offset + size]), ()))
+    return candidates
+
+
+def match_answer(answer, accepted, fuzzy_index=None, tolerance=0):
+    """
+    Whether a normalized answer is accepted: exactly, via a set lookup, or
+    within tolerance edits of one of the indexed accepted answers. A blank
+    answer never matches, and an accepted answer allows at most one edit per
+    three characters, so short answers like "42" must be exact.
+    """
+    if not answer:
+        return False
+    if answer in accepted:
+        return True
+    if not tolerance or not fuzzy_index:
+        return False
+    return any(
+        within_distance(answer, candidate, min(tolerance, len(candidate) // 3))
+        for candidate in fuzzy_candidates(answer, fuzzy_index, tolerance)
+    )
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0002_alter_quizattempt_time_taken_minutes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quiz",
+            name="content_version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:50
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    Quiz = apps.get_model("quizzes", "Quiz")
+    Question = apps.get_model("quizzes", "Question")
+    questions = Question.objects.filter(quiz=OuterRef("pk")).order_by().values("quiz")
+    Quiz.objects.update(
+        total_questions=Coalesce(
+            Subquery(
+                questions.annotate(total=Count("id")).values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        total_points=Coalesce(
+            Subquery(
+                questions.annotate(total=Sum("points")).values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0003_quiz_content_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quiz",
+            name="total_points",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="quiz",
+            name="total_questions",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0004_quiz_stored_totals"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChoiceStats",
+            fields=[
+                (
+                    "choice",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="quizzes.choice",
+                    ),
+                ),
+                ("selection_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "Choice stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="QuestionStats",
+            fields=[
+                (
+                    "question",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="quizzes.question",
+                    ),
+                ),
+                ("attempt_count", models.PositiveIntegerField(default=0)),
+                ("correct_count", models.PositiveIntegerField(default=0)),
+                ("score_sum", models.FloatField(default=0)),
+                ("score_sq_sum", models.FloatField(default=0)),
+                ("correct_score_sum", models.FloatField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Question stats",
+            },
+        ),
+    ]
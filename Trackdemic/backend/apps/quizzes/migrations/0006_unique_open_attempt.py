@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:59
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remove_duplicate_open_attempts(apps, schema_editor):
+    # Keep the most recent open attempt per student and quiz; open attempts hold no answers yet
+    QuizAttempt = apps.get_model("quizzes", "QuizAttempt")
+    open_attempts = QuizAttempt.objects.filter(completed_at__isnull=True)
+    latest = (
+        open_attempts.order_by()
+        .values("student", "quiz")
+        .annotate(latest=Max("id"))
+        .values("latest")
+    )
+    open_attempts.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0005_item_stats"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_open_attempts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="quizattempt",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("completed_at__isnull", True)),
+                fields=("student", "quiz"),
+                name="unique_open_quiz_attempt",
+            ),
+        ),
+    ]
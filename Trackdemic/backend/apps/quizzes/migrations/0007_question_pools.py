@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:06
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0006_unique_open_attempt"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="topic",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+        migrations.AddField(
+            model_name="quiz",
+            name="pool_size",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="quiz",
+            name="pool_stratify_by",
+            field=models.CharField(
+                blank=True,
+                choices=[("", "None"), ("points", "Points"), ("topic", "Topic")],
+                default="",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="quizattempt",
+            name="question_ids",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
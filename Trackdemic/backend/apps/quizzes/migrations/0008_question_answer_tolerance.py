@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:10
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0007_question_pools"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="answer_tolerance",
+            field=models.PositiveSmallIntegerField(
+                default=0, validators=[django.core.validators.MaxValueValidator(5)]
+            ),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("courses", "0002_enrollment_completed_lessons"),
+        ("quizzes", "0008_question_answer_tolerance"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuizLeaderboardEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("percentage", models.FloatField()),
+                ("time_taken_minutes", models.FloatField()),
+                ("achieved_at", models.DateTimeField()),
+                (
+                    "quiz",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_entries",
+                        to="quizzes.quiz",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="quiz_leaderboard_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Quiz leaderboard entries",
+                "indexes": [
+                    models.Index(
+                        fields=["quiz", "-percentage", "time_taken_minutes"],
+                        name="quiz_leaderboard_rank_idx",
+                    )
+                ],
+                "unique_together": {("quiz", "student")},
+            },
+        ),
+        migrations.CreateModel(
+            name="CourseLeaderboardEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_percentage", models.FloatField(default=0)),
+                ("quizzes_completed", models.PositiveIntegerField(default=0)),
+                ("total_time_minutes", models.FloatField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_entries",
+                        to="courses.course",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="course_leaderboard_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Course leaderboard entries",
+                "indexes": [
+                    models.Index(
+                        fields=["course", "-total_percentage", "total_time_minutes"],
+                        name="course_leaderboard_rank_idx",
+                    )
+                ],
+                "unique_together": {("course", "student")},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0009_leaderboards"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="quizattempt",
+            index=models.Index(
+                fields=["completed_at", "started_at"], name="quiz_attempt_open_age_idx"
+            ),
+        ),
+    ]
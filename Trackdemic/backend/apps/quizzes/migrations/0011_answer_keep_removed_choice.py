@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0010_attempt_open_age_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="answer",
+            name="selected_choice",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="quizzes.choice",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("quizzes", "0011_answer_keep_removed_choice"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="quizattempt",
+            index=models.Index(
+                fields=["quiz", "-started_at", "-id"],
+                name="quiz_attempt_quiz_recent_idx",
+            ),
+        ),
+    ]
@@ -1,12 +1,61 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Count, Max, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
 from apps.courses.models import Course
+from apps.users.models import profile_lookups
 
 User = get_user_model()
 
 
+class QuizQuerySet(models.QuerySet):
+    def with_user_stats(self, user):
+        """
+        Annotate the user's attempt count and best percentage per quiz and load
+        each quiz's course with its list stats, so serializing a page of
+        quizzes takes a fixed number of queries.
+        """
+        attempts = QuizAttempt.objects.filter(quiz=OuterRef('pk'), student=user).order_by().values('quiz')
+        attempts_count = attempts.annotate(total=Count('id')).values('total')
+        best_score = attempts.filter(completed_at__isnull=False).annotate(best=Max('percentage')).values('best')
+        return self.annotate(
+            user_attempts_count=Coalesce(Subquery(attempts_count, output_field=models.IntegerField()), 0),
+            user_best_score=Subquery(best_score, output_field=models.FloatField()),
+        ).prefetch_related(
+            Prefetch('course', queryset=Course.objects.with_list_stats(user))
+        )
+
+    def with_admission(self, user):
+        """Annotate the user's attempt count and open attempt so starting a quiz needs one read"""
+        attempts = QuizAttempt.objects.filter(quiz=OuterRef('pk'), student=user).order_by().values('quiz')
+        attempts_count = attempts.annotate(total=Count('id')).values('total')
+        open_attempt = attempts.filter(completed_at__isnull=True)
+        return self.annotate(
+            user_attempts_count=Coalesce(Subquery(attempts_count, output_field=models.IntegerField()), 0),
+            open_attempt_id=Subquery(open_attempt.values('id')[:1], output_field=models.IntegerField()),
+            open_attempt_started_at=Subquery(open_attempt.values('started_at')[:1], output_field=models.DateTimeField()),
+        )
+
+    def refresh_totals(self):
+        """Recount the stored question and point totals of every quiz in the queryset with one UPDATE"""
+        questions = Question.objects.filter(quiz=OuterRef('pk')).order_by().values('quiz')
+        return self.update(
+            total_questions=Coalesce(
+                Subquery(questions.annotate(total=Count('id')).values('total'), output_field=models.IntegerField()), 0
+            ),
+            total_points=Coalesce(
+                Subquery(questions.annotate(total=Sum('points')).values('total'), output_field=models.IntegerField()), 0
+            ),
+        )
+
+
 class Quiz(models.Model):
+    POOL_STRATIFY_CHOICES = [
+        ('', 'None'),
+        ('points', 'Points'),
+        ('topic', 'Topic'),
+    ]
     QUIZ_TYPES = [
         ('course', 'Course Quiz'),
         ('topic', 'Topic Quiz'),
@@ -22,10 +71,20 @@ class Quiz(models.Model):
     max_attempts = models.PositiveIntegerField(default=3)
     passing_score = models.PositiveIntegerField(default=70, validators=[MinValueValidator(0), MaxValueValidator(100)])
     is_active = models.BooleanField(default=True)
+    # Draw this many questions per attempt instead of the full list
+    pool_size = models.PositiveIntegerField(blank=True, null=True, validators=[MinValueValidator(1)])
+    pool_stratify_by = models.CharField(max_length=20, choices=POOL_STRATIFY_CHOICES, blank=True, default='')
+    # Bumped whenever questions or choices change, so cached answer keys expire
+    content_version = models.PositiveIntegerField(default=1)
+    # Denormalized from the quiz's questions; kept in sync by refresh_totals()
+    total_questions = models.PositiveIntegerField(default=0)
+    total_points = models.PositiveIntegerField(default=0)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_quizzes')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = QuizQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Quizzes"
         ordering = ['-created_at']
@@ -34,12 +93,20 @@ class Quiz(models.Model):
         return self.title
 
     @property
-    def total_questions(self):
-        return self.questions.count()
+    def questions_per_attempt(self):
+        if self.pool_size:
+            return min(self.pool_size, self.total_questions)
+        return self.total_questions
 
-    @property
-    def total_points(self):
-        return sum(question.points for question in self.questions.all())
+    def refresh_totals(self):
+        """Recount the stored question and point totals after questions change"""
+        totals = self.questions.aggregate(count=models.Count('id'), points=models.Sum('points'))
+        self.total_questions = totals['count']
+        self.total_points = totals['points'] or 0
+        Quiz.objects.filter(pk=self.pk).update(
+            total_questions=self.total_questions,
+            total_points=self.total_points
+        )
 
 
 class Question(models.Model):
@@ -48,11 +115,18 @@ class Question(models.Model):
         ('true_false', 'True/False'),
         ('short_answer', 'Short Answer'),
     ]
+    MAX_ANSWER_TOLERANCE = 5
 
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='questions')
     question_text = models.TextField()
     question_type = models.CharField(max_length=20, choices=QUESTION_TYPES, default='multiple_choice')
     points = models.PositiveIntegerField(default=1)
+    topic = models.CharField(max_length=100, blank=True, default='')
+    # Typos (single-character edits) still accepted in short answers, at most one per three characters
+    answer_tolerance = models.PositiveSmallIntegerField(
+        default=0,
+        validators=[MaxValueValidator(MAX_ANSWER_TOLERANCE)]
+    )
     order = models.PositiveIntegerField(default=0)
     explanation = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -77,6 +151,25 @@ class Choice(models.Model):
         return f"{self.question} - {self.choice_text[:50]}"
 
 
+class QuizAttemptQuerySet(models.QuerySet):
+    def with_related(self, expand=(), user=None):
+        """Load exactly what QuizAttemptSerializer needs for the requested expansions"""
+        queryset = self.select_related('student')
+        if 'quiz' in expand:
+            # Prefetched rather than joined so the nested quiz carries its list annotations
+            quizzes = Quiz.objects.all()
+            if user is not None:
+                quizzes = quizzes.with_user_stats(user)
+            queryset = queryset.prefetch_related(Prefetch('quiz', queryset=quizzes))
+        else:
+            queryset = queryset.select_related('quiz')
+        if 'student' in expand:
+            queryset = queryset.select_related(*profile_lookups('student'))
+        if 'answers' in expand:
+            queryset = queryset.prefetch_related('answers__question__choices', 'answers__selected_choice')
+        return queryset
+
+
 class QuizAttempt(models.Model):
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_attempts')
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='attempts')
@@ -86,9 +179,27 @@ class QuizAttempt(models.Model):
     percentage = models.FloatField(blank=True, null=True)
     is_passed = models.BooleanField(default=False)
     time_taken_minutes = models.FloatField(blank=True, null=True)
+    # Ordered IDs of the questions drawn for this attempt; empty means every question
+    question_ids = models.JSONField(default=list, blank=True)
+
+    objects = QuizAttemptQuerySet.as_manager()
 
     class Meta:
         ordering = ['-started_at']
+        constraints = [
+            # A student can have at most one open attempt per quiz
+            models.UniqueConstraint(
+                fields=['student', 'quiz'],
+                condition=models.Q(completed_at__isnull=True),
+                name='unique_open_quiz_attempt',
+            ),
+        ]
+        indexes = [
+            # Lets the expiry sweep find open attempts by age without scanning completed ones
+            models.Index(fields=['completed_at', 'started_at'], name='quiz_attempt_open_age_idx'),
+            # Serves the faculty attempt list a page at a time, newest first
+            models.Index(fields=['quiz', '-started_at', '-id'], name='quiz_attempt_quiz_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.quiz.title} - {self.score or 'In Progress'}"
@@ -97,7 +208,8 @@ class QuizAttempt(models.Model):
 class Answer(models.Model):
     attempt = models.ForeignKey(QuizAttempt, on_delete=models.CASCADE, related_name='answers')
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
-    selected_choice = models.ForeignKey(Choice, on_delete=models.CASCADE, blank=True, null=True)
+    # Removing a choice while editing a quiz keeps the answers that picked it
+    selected_choice = models.ForeignKey(Choice, on_delete=models.SET_NULL, blank=True, null=True)
     text_answer = models.TextField(blank=True, null=True)
     is_correct = models.BooleanField(default=False)
     points_earned = models.FloatField(default=0)
@@ -107,3 +219,108 @@ class Answer(models.Model):
 
     def __str__(self):
         return f"{self.attempt} - {self.question}"
+
+
+class QuestionStats(models.Model):
+    """
+    Running item-analysis sums for a question, updated as attempts are graded.
+    Scores are attempt percentages, so discrimination can be derived without
+    scanning answers.
+    """
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    attempt_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+    score_sq_sum = models.FloatField(default=0)
+    correct_score_sum = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Question stats"
+
+    def __str__(self):
+        return f"{self.question} stats"
+
+    @property
+    def percent_correct(self):
+        if not self.attempt_count:
+            return None
+        return self.correct_count / self.attempt_count * 100
+
+    @property
+    def discrimination(self):
+        """Point-biserial correlation between answering correctly and the attempt score"""
+        n = self.attempt_count
+        n_correct = self.correct_count
+        n_incorrect = n - n_correct
+        if not n_correct or not n_incorrect:
+            return None
+        mean = self.score_sum / n
+        variance = self.score_sq_sum / n - mean * mean
+        if variance <= 0:
+            return None
+        mean_correct = self.correct_score_sum / n_correct
+        mean_incorrect = (self.score_sum - self.correct_score_sum) / n_incorrect
+        p = n_correct / n
+        return (mean_correct - mean_incorrect) / variance ** 0.5 * (p * (1 - p)) ** 0.5
+
+
+class ChoiceStats(models.Model):
+    choice = models.OneToOneField(Choice, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    selection_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Choice stats"
+
+    def __str__(self):
+        return f"{self.choice} stats"
+
+
+class QuizLeaderboardEntry(models.Model):
+    """A student's best completed attempt at a quiz, kept in leaderboard order by its index"""
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_leaderboard_entries')
+    percentage = models.FloatField()
+    time_taken_minutes = models.FloatField()
+    achieved_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Quiz leaderboard entries"
+        unique_together = ['quiz', 'student']
+        indexes = [
+            models.Index(fields=['quiz', '-percentage', 'time_taken_minutes'], name='quiz_leaderboard_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.quiz} - {self.student.username} - {self.percentage}"
+
+
+class CourseLeaderboardEntry(models.Model):
+    """
+    A student's standing in a course: the sum of their best percentages over
+    the course's quizzes, ties going to the lower total time.
+    """
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='course_leaderboard_entries')
+    total_percentage = models.FloatField(default=0)
+    quizzes_completed = models.PositiveIntegerField(default=0)
+    total_time_minutes = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Course leaderboard entries"
+        unique_together = ['course', 'student']
+        indexes = [
+            models.Index(
+                fields=['course', '-total_percentage', 'total_time_minutes'], name='course_leaderboard_rank_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.course} - {self.student.username} - {self.total_percentage}"
+
+    @property
+    def average_percentage(self):
+        if not self.quizzes_completed:
+            return None
+        return self.total_percentage / self.quizzes_completed
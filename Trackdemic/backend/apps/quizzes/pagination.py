@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class AttemptCursorPagination(CursorPagination):
+    """Keyset pagination over a quiz's attempts, newest first, stable while students submit"""
+    ordering = ('-started_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -0,0 +1,61 @@
+from django.core.cache import cache
+
+from .answer_keys import LocalLRUCache, LOCAL_CACHE_SIZE, get_answer_key
+from .models import Choice, Question
+
+QUIZ_PAYLOAD_CACHE_TIMEOUT = 24 * 60 * 60
+# Part of the cache key so payloads cached in an older shape are not reused
+QUIZ_PAYLOAD_FORMAT = 2
+
+_local_payloads = LocalLRUCache(LOCAL_CACHE_SIZE)
+
+
+def quiz_payload_cache_key(quiz_id, version):
+    return f'quiz:{quiz_id}:payload:f{QUIZ_PAYLOAD_FORMAT}:v{version}'
+
+
+def render_quiz_payload(quiz_id):
+    """
+    Questions and choices as students see them: no correctness flags, and no
+    choices for short answer questions since those hold the accepted answers.
+    """
+    questions = {}
+    payload = []
+    rows = Question.objects.filter(quiz_id=quiz_id).order_by('order', 'id').values(
+        'id', 'question_text', 'question_type', 'points', 'topic', 'order'
+    )
+    for row in rows:
+        row['choices'] = []
+        questions[row['id']] = row
+        payload.append(row)
+
+    choices = Choice.objects.filter(
+        question__quiz_id=quiz_id
+    ).exclude(question__question_type='short_answer').order_by('order', 'id').values(
+        'id', 'question_id', 'choice_text', 'order'
+    )
+    for choice in choices:
+        questions[choice.pop('question_id')]['choices'].append(choice)
+    return payload
+
+
+def get_quiz_payload(quiz):
+    """
+    Pre-rendered student payload for the quiz's current content version, looked
+    up in process memory first, then the shared cache, and rendered on a miss.
+    """
+    key = quiz_payload_cache_key(quiz.id, quiz.content_version)
+    payload = _local_payloads.get(key)
+    if payload is None:
+        payload = cache.get(key)
+        if payload is None:
+            payload = render_quiz_payload(quiz.id)
+            cache.set(key, payload, QUIZ_PAYLOAD_CACHE_TIMEOUT)
+        _local_payloads.set(key, payload)
+    return payload
+
+
+def warm_quiz_caches(quiz):
+    """Build the student payload and answer key ahead of the first student request"""
+    get_quiz_payload(quiz)
+    get_answer_key(quiz)
@@ -0,0 +1,57 @@
+import random
+from collections import defaultdict
+
+
+def _allocate(group_sizes, total):
+    """
+    Split total across groups in proportion to their sizes, handing leftover
+    slots to the groups with the largest remainders.
+    """
+    population = sum(group_sizes.values())
+    quotas = {}
+    remainders = []
+    for key, size in group_sizes.items():
+        exact = total * size / population
+        quotas[key] = int(exact)
+        remainders.append((exact - quotas[key], random.random(), key))
+    for _, _, key in sorted(remainders, reverse=True)[:total - sum(quotas.values())]:
+        quotas[key] += 1
+    return quotas
+
+
+def select_question_ids(quiz, payload):
+    """
+    Draw the questions for a new attempt from the quiz's payload, optionally
+    stratified by points or topic, keeping the quiz's question order. Returns
+    an empty list when the attempt gets every question.
+    """
+    if not quiz.pool_size or quiz.pool_size >= len(payload):
+        return []
+
+    if not quiz.pool_stratify_by:
+        selected = set(random.sample([question['id'] for question in payload], quiz.pool_size))
+    else:
+        groups = defaultdict(list)
+        for question in payload:
+            groups[question[quiz.pool_stratify_by]].append(question['id'])
+        quotas = _allocate({key: len(ids) for key, ids in groups.items()}, quiz.pool_size)
+        selected = set()
+        for key, ids in groups.items():
+            selected.update(random.sample(ids, quotas[key]))
+
+    return [question['id'] for question in payload if question['id'] in selected]
+
+
+def attempt_questions(payload, question_ids):
+    """The attempt's slice of the quiz payload, in the attempt's order"""
+    if not question_ids:
+        return payload
+    by_id = {question['id']: question for question in payload}
+    return [by_id[question_id] for question_id in question_ids if question_id in by_id]
+
+
+def attempt_answer_key(answer_key, question_ids):
+    """Restrict a compiled answer key to the questions an attempt was given"""
+    if not question_ids:
+        return answer_key
+    return {question_id: answer_key[question_id] for question_id in question_ids if question_id in answer_key}
@@ -1,9 +1,43 @@
+from django.db import transaction
+from django.db.models import F
 from rest_framework import serializers
-from .models import Quiz, Question, Choice, QuizAttempt, Answer
+from .editing import apply_question_changes, create_questions
+from .models import Quiz, Question, Choice, QuizAttempt, Answer, QuizLeaderboardEntry, CourseLeaderboardEntry
+from .payloads import get_quiz_payload, warm_quiz_caches
 from apps.courses.serializers import CourseListSerializer
+from apps.users.models import User
 from apps.users.serializers import UserSerializer
 
 
+def expansion_from_request(request):
+    """Read the comma-separated ?fields= and ?expand= query parameters"""
+    params = {}
+    for name in ('fields', 'expand'):
+        value = request.query_params.get(name)
+        if value:
+            params[name] = [item.strip() for item in value.split(',') if item.strip()]
+    return params
+
+
+class ExpandableFieldsMixin:
+    """
+    Lets callers trim a serializer with `fields` and opt in to nested data with
+    `expand`. Fields listed in Meta.expandable_fields are dropped unless expanded.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = set(expand or ())
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expand:
+                self.fields.pop(name, None)
+        if fields:
+            allowed = set(fields) | expand
+            for name in list(self.fields):
+                if name not in allowed:
+                    self.fields.pop(name)
+
+
 class ChoiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Choice
@@ -15,13 +49,14 @@ class QuestionSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Question
-        fields = ['id', 'question_text', 'question_type', 'points', 'order', 'choices']
+        fields = ['id', 'question_text', 'question_type', 'points', 'topic', 'answer_tolerance', 'order', 'choices']
 
 
 class QuizListSerializer(serializers.ModelSerializer):
     course = CourseListSerializer(read_only=True)
     total_questions = serializers.ReadOnlyField()
     total_points = serializers.ReadOnlyField()
+    questions_per_attempt = serializers.ReadOnlyField()
     attempts_count = serializers.SerializerMethodField()
     best_score = serializers.SerializerMethodField()
     questions = serializers.ListField(write_only=True, required=False)
@@ -30,30 +65,29 @@ class QuizListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Quiz
         fields = ['id', 'title', 'description', 'course', 'quiz_type', 'topic',
-                 'time_limit_minutes', 'max_attempts', 'passing_score',
-                 'total_questions', 'total_points', 'attempts_count', 'best_score', 'questions', 'created_at']
+                 'time_limit_minutes', 'max_attempts', 'passing_score', 'pool_size', 'pool_stratify_by',
+                 'total_questions', 'total_points', 'questions_per_attempt', 'attempts_count', 'best_score',
+                 'questions', 'created_at']
     
     def create(self, validated_data):
         questions_data = validated_data.pop('questions', [])
         quiz = Quiz.objects.create(**validated_data)
-        
-        # Create questions and choices
-        for question_data in questions_data:
-            choices_data = question_data.pop('choices', [])
-            question = Question.objects.create(quiz=quiz, **question_data)
-            
-            for choice_data in choices_data:
-                Choice.objects.create(question=question, **choice_data)
-        
+        create_questions(quiz, questions_data)
+        quiz.refresh_totals()
+        warm_quiz_caches(quiz)
         return quiz
     
     def get_attempts_count(self, obj):
+        if hasattr(obj, 'user_attempts_count'):
+            return obj.user_attempts_count
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.attempts.filter(student=request.user).count()
         return 0
     
     def get_best_score(self, obj):
+        if hasattr(obj, 'user_best_score'):
+            return obj.user_best_score
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             best_attempt = obj.attempts.filter(
@@ -69,6 +103,7 @@ class QuizDetailSerializer(serializers.ModelSerializer):
     questions = QuestionSerializer(many=True, read_only=True)
     total_questions = serializers.ReadOnlyField()
     total_points = serializers.ReadOnlyField()
+    questions_per_attempt = serializers.ReadOnlyField()
     attempts_count = serializers.SerializerMethodField()
     best_score = serializers.SerializerMethodField()
     can_attempt = serializers.SerializerMethodField()
@@ -77,17 +112,21 @@ class QuizDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Quiz
         fields = ['id', 'title', 'description', 'course', 'quiz_type', 'topic',
-                 'time_limit_minutes', 'max_attempts', 'passing_score',
-                 'questions', 'total_questions', 'total_points', 
+                 'time_limit_minutes', 'max_attempts', 'passing_score', 'pool_size', 'pool_stratify_by',
+                 'questions', 'total_questions', 'total_points', 'questions_per_attempt',
                  'attempts_count', 'best_score', 'can_attempt', 'created_at']
     
     def get_attempts_count(self, obj):
+        if hasattr(obj, 'user_attempts_count'):
+            return obj.user_attempts_count
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.attempts.filter(student=request.user).count()
         return 0
     
     def get_best_score(self, obj):
+        if hasattr(obj, 'user_best_score'):
+            return obj.user_best_score
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             best_attempt = obj.attempts.filter(
@@ -100,19 +139,31 @@ class QuizDetailSerializer(serializers.ModelSerializer):
     def get_can_attempt(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            attempts_count = obj.attempts.filter(student=request.user).count()
-            return attempts_count < obj.max_attempts
+            return self.get_attempts_count(obj) < obj.max_attempts
         return False
 
 
+class StudentQuizDetailSerializer(QuizDetailSerializer):
+    """Quiz detail for students, with questions from the cached payload that omits answers"""
+    questions = serializers.SerializerMethodField()
+
+    def get_questions(self, obj):
+        # Pooled quizzes hand out each attempt's questions from start_quiz instead
+        if obj.questions_per_attempt < obj.total_questions:
+            return []
+        return get_quiz_payload(obj)
+
+
 class QuizUpdateSerializer(serializers.ModelSerializer):
     questions = serializers.ListField(write_only=True, required=False)
     
     class Meta:
         model = Quiz
         fields = ['title', 'description', 'course', 'quiz_type', 'topic',
-                 'time_limit_minutes', 'max_attempts', 'passing_score', 'is_active', 'questions']
+                 'time_limit_minutes', 'max_attempts', 'passing_score', 'pool_size', 'pool_stratify_by',
+                 'is_active', 'questions']
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         questions_data = validated_data.pop('questions', None)
         
@@ -121,18 +172,12 @@ class QuizUpdateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         
-        # Update questions if provided
-        if questions_data is not None:
-            # Clear existing questions and choices
-            instance.questions.all().delete()
-            
-            # Create new questions and choices
-            for question_data in questions_data:
-                choices_data = question_data.pop('choices', [])
-                question = Question.objects.create(quiz=instance, **question_data)
-                
-                for choice_data in choices_data:
-                    Choice.objects.create(question=question, **choice_data)
+        # Update questions if provided, keeping the ones that are matched by ID
+        if questions_data is not None and apply_question_changes(instance, questions_data):
+            Quiz.objects.filter(pk=instance.pk).update(content_version=F('content_version') + 1)
+            instance.refresh_from_db(fields=['content_version'])
+            instance.refresh_totals()
+            transaction.on_commit(lambda: warm_quiz_caches(instance))
         
         return instance
 
@@ -146,15 +191,101 @@ class AnswerSerializer(serializers.ModelSerializer):
         fields = ['id', 'question', 'selected_choice', 'text_answer', 'is_correct', 'points_earned']
 
 
-class QuizAttemptSerializer(serializers.ModelSerializer):
+class QuizAttemptSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    quiz_id = serializers.IntegerField(read_only=True)
+    quiz_title = serializers.CharField(source='quiz.title', read_only=True)
+    student_id = serializers.IntegerField(read_only=True)
+    student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     quiz = QuizListSerializer(read_only=True)
     student = UserSerializer(read_only=True)
     answers = AnswerSerializer(many=True, read_only=True)
     
     class Meta:
         model = QuizAttempt
-        fields = ['id', 'quiz', 'student', 'started_at', 'completed_at', 'score', 
-                 'percentage', 'is_passed', 'time_taken_minutes', 'answers']
+        fields = ['id', 'quiz_id', 'quiz_title', 'student_id', 'student_name', 'quiz', 'student',
+                 'started_at', 'completed_at', 'score', 'percentage', 'is_passed', 'time_taken_minutes', 'answers']
+        expandable_fields = ['quiz', 'student', 'answers']
+
+
+class ChoiceAnalysisSerializer(serializers.ModelSerializer):
+    selection_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Choice
+        fields = ['id', 'choice_text', 'is_correct', 'order', 'selection_count']
+
+    def get_selection_count(self, obj):
+        return obj.stats.selection_count if hasattr(obj, 'stats') else 0
+
+
+class QuestionAnalysisSerializer(serializers.ModelSerializer):
+    attempt_count = serializers.SerializerMethodField()
+    correct_count = serializers.SerializerMethodField()
+    percent_correct = serializers.SerializerMethodField()
+    discrimination = serializers.SerializerMethodField()
+    choices = ChoiceAnalysisSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Question
+        fields = ['id', 'question_text', 'question_type', 'points', 'order', 'attempt_count',
+                 'correct_count', 'percent_correct', 'discrimination', 'choices']
+
+    def _stats(self, obj):
+        return obj.stats if hasattr(obj, 'stats') else None
+
+    def get_attempt_count(self, obj):
+        stats = self._stats(obj)
+        return stats.attempt_count if stats else 0
+
+    def get_correct_count(self, obj):
+        stats = self._stats(obj)
+        return stats.correct_count if stats else 0
+
+    def get_percent_correct(self, obj):
+        stats = self._stats(obj)
+        return stats.percent_correct if stats else None
+
+    def get_discrimination(self, obj):
+        stats = self._stats(obj)
+        return stats.discrimination if stats else None
+
+
+class QuizLeaderboardEntrySerializer(serializers.ModelSerializer):
+    rank = serializers.IntegerField(read_only=True)
+    student_name = serializers.CharField(source='student.get_full_name', read_only=True)
+
+    class Meta:
+        model = QuizLeaderboardEntry
+        fields = ['rank', 'student_id', 'student_name', 'percentage', 'time_taken_minutes', 'achieved_at']
+
+
+class CourseLeaderboardEntrySerializer(serializers.ModelSerializer):
+    rank = serializers.IntegerField(read_only=True)
+    student_name = serializers.CharField(source='student.get_full_name', read_only=True)
+    average_percentage = serializers.ReadOnlyField()
+
+    class Meta:
+        model = CourseLeaderboardEntry
+        fields = ['rank', 'student_id', 'student_name', 'total_percentage', 'average_percentage',
+                 'quizzes_completed', 'total_time_minutes']
+
+
+class FacultyStudentSerializer(serializers.ModelSerializer):
+    student_number = serializers.CharField(source='student_profile.student_id', read_only=True, default=None)
+    enrolled_courses_count = serializers.IntegerField(read_only=True)
+    overall_progress = serializers.SerializerMethodField()
+    enrolled_courses = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'profile_picture', 'student_number',
+                 'enrolled_courses_count', 'overall_progress', 'enrolled_courses']
+
+    def get_overall_progress(self, obj):
+        return obj.overall_progress or 0
+
+    def get_enrolled_courses(self, obj):
+        return self.context.get('enrolled_courses', {}).get(obj.id, [])
 
 
 class AnswerSubmissionSerializer(serializers.Serializer):
@@ -164,4 +295,5 @@ class AnswerSubmissionSerializer(serializers.Serializer):
 
 
 class QuizSubmissionSerializer(serializers.Serializer):
-    answers = AnswerSubmissionSerializer(many=True)
+    # Only answers not yet autosaved need to be sent; they are applied on top of the saved draft
+    answers = AnswerSubmissionSerializer(many=True, required=False, default=list)
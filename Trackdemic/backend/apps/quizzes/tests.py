@@ -0,0 +1,120 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.courses.models import Category, Course, Enrollment
+from apps.users.models import User
+from .grading import submit_attempt
+from .models import Choice, Question, Quiz, QuizAttempt
+
+# Count, page and prefetched courses
+QUIZ_LIST_QUERIES = 3
+# Quiz with the user's stats and its prefetched course; questions come from the warmed payload cache
+QUIZ_DETAIL_QUERIES = 2
+
+
+class QuizListQueryCountTests(TestCase):
+    """The quiz list and detail cost a fixed number of queries whatever the page holds"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = User.objects.create_user(username='faculty', password='password', user_type='faculty')
+        cls.student = User.objects.create_user(username='student', password='password', user_type='student')
+        cls.category = Category.objects.create(name='Science')
+        cls.courses = [
+            Course.objects.create(
+                title=f'Course {index}', description='', category=cls.category,
+                instructor=cls.faculty, duration_hours=1
+            )
+            for index in range(3)
+        ]
+        Enrollment.objects.create(student=cls.student, course=cls.courses[0])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def create_quizzes(self, count):
+        quizzes = []
+        for index in range(count):
+            quiz = Quiz.objects.create(
+                title=f'Quiz {index}', course=self.courses[index % len(self.courses)], created_by=self.faculty
+            )
+            for percentage in (40, 80):
+                QuizAttempt.objects.create(
+                    student=self.student, quiz=quiz, completed_at=timezone.now(), percentage=percentage
+                )
+            quizzes.append(quiz)
+        return quizzes
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        self.create_quizzes(2)
+        with self.assertNumQueries(QUIZ_LIST_QUERIES):
+            response = self.client.get('/api/quizzes/')
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.create_quizzes(18)
+        with self.assertNumQueries(QUIZ_LIST_QUERIES):
+            response = self.client.get('/api/quizzes/')
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_list_reports_the_users_attempt_stats(self):
+        self.create_quizzes(1)
+        quiz = self.client.get('/api/quizzes/').data['results'][0]
+        self.assertEqual(quiz['attempts_count'], 2)
+        self.assertEqual(quiz['best_score'], 80)
+        self.assertTrue(quiz['course']['is_enrolled'])
+
+    def test_detail_query_count_does_not_grow_with_attempts(self):
+        quiz = self.create_quizzes(1)[0]
+        self.client.get(f'/api/quizzes/{quiz.id}/')
+        for _ in range(5):
+            QuizAttempt.objects.create(student=self.student, quiz=quiz, completed_at=timezone.now(), percentage=90)
+        with self.assertNumQueries(QUIZ_DETAIL_QUERIES):
+            response = self.client.get(f'/api/quizzes/{quiz.id}/')
+        self.assertEqual(response.data['attempts_count'], 7)
+        self.assertEqual(response.data['best_score'], 90)
+
+
+class ShortAnswerGradingTests(TestCase):
+    """Typo tolerance never lets a blank or much shorter answer through"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = User.objects.create_user(username='faculty', password='password', user_type='faculty')
+        cls.student = User.objects.create_user(username='student', password='password', user_type='student')
+        course = Course.objects.create(
+            title='Course', description='', category=Category.objects.create(name='Science'),
+            instructor=cls.faculty, duration_hours=1
+        )
+        cls.quiz = Quiz.objects.create(title='Quiz', course=course, created_by=cls.faculty, max_attempts=10)
+        cls.short = Question.objects.create(
+            quiz=cls.quiz, question_text='Answer?', question_type='short_answer', answer_tolerance=2, order=0
+        )
+        Choice.objects.create(question=cls.short, choice_text='42', is_correct=True, order=0)
+        cls.long = Question.objects.create(
+            quiz=cls.quiz, question_text='Capital?', question_type='short_answer', answer_tolerance=2, order=1
+        )
+        Choice.objects.create(question=cls.long, choice_text='Amsterdam', is_correct=True, order=0)
+
+    def setUp(self):
+        cache.clear()
+
+    def grade(self, question, text_answer):
+        attempt = QuizAttempt.objects.create(student=self.student, quiz=self.quiz)
+        _, results = submit_attempt(attempt.id, [{'question_id': question.id, 'text_answer': text_answer}])
+        return results['score']
+
+    def test_blank_and_one_character_answers_score_zero(self):
+        for text_answer in ('', '   ', '4', '7'):
+            with self.subTest(text_answer=text_answer):
+                self.assertEqual(self.grade(self.short, text_answer), 0)
+                self.assertEqual(self.grade(self.long, text_answer), 0)
+
+    def test_typos_are_accepted_in_proportion_to_answer_length(self):
+        self.assertEqual(self.grade(self.short, '42'), 1)
+        self.assertEqual(self.grade(self.short, '43'), 0)
+        self.assertEqual(self.grade(self.long, 'amsterdan'), 1)
+        self.assertEqual(self.grade(self.long, 'Amstredam'), 1)
@@ -1,7 +1,9 @@
 from django.urls import path
 from .views import (
-    QuizListView, QuizDetailView, start_quiz, submit_quiz, MyQuizAttemptsView,
-    FacultyQuizListView, FacultyQuizDetailView, faculty_quiz_attempts, faculty_students_list
+    QuizListView, QuizDetailView, start_quiz, submit_quiz, autosave_quiz, MyQuizAttemptsView,
+    quiz_leaderboard_view, course_leaderboard_view,
+    FacultyQuizListView, FacultyQuizDetailView, faculty_quiz_attempts, faculty_quiz_attempt_detail,
+    faculty_quiz_item_analysis, faculty_import_questions, faculty_students_list
 )
 
 urlpatterns = [
@@ -9,10 +11,16 @@ urlpatterns = [
     path('<int:pk>/', QuizDetailView.as_view(), name='quiz-detail'),
     path('<int:quiz_id>/start/', start_quiz, name='start-quiz'),
     path('<int:quiz_id>/submit/', submit_quiz, name='submit-quiz'),
+    path('<int:quiz_id>/autosave/', autosave_quiz, name='autosave-quiz'),
+    path('<int:quiz_id>/leaderboard/', quiz_leaderboard_view, name='quiz-leaderboard'),
+    path('course/<int:course_id>/leaderboard/', course_leaderboard_view, name='course-leaderboard'),
     path('my-attempts/', MyQuizAttemptsView.as_view(), name='my-quiz-attempts'),
     
     path('faculty/', FacultyQuizListView.as_view(), name='faculty-quiz-list'),
     path('faculty/<int:pk>/', FacultyQuizDetailView.as_view(), name='faculty-quiz-detail'),
     path('faculty/<int:quiz_id>/attempts/', faculty_quiz_attempts, name='faculty-quiz-attempts'),
+    path('faculty/<int:quiz_id>/attempts/<int:attempt_id>/', faculty_quiz_attempt_detail, name='faculty-quiz-attempt-detail'),
+    path('faculty/<int:quiz_id>/questions/import/', faculty_import_questions, name='faculty-import-questions'),
+    path('faculty/<int:quiz_id>/item-analysis/', faculty_quiz_item_analysis, name='faculty-quiz-item-analysis'),
     path('faculty/students/', faculty_students_list, name='faculty-students-list'),
 ]
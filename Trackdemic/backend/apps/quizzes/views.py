@@ -1,15 +1,36 @@
+import csv
+from collections import defaultdict
 from rest_framework import generics, status, permissions, filters
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.utils import timezone
-from django.db.models import Q
-from .models import Quiz, QuizAttempt, Answer, Question, Choice
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, Exists, OuterRef, Prefetch, Q
+from apps.courses.models import Course, Enrollment
+from apps.users.models import User
+from .answer_keys import get_answer_key
+from .drafts import AUTOSAVE_MIN_INTERVAL_SECONDS, claim_autosave, load_draft, save_draft
+from .expiry import finalize_expired_attempt, is_expired, time_limit_end
+from .grading import GradingError, submit_attempt, validate_answer
+from .leaderboards import DEFAULT_LEADERBOARD_SIZE, MAX_LEADERBOARD_SIZE, course_leaderboard, quiz_leaderboard
+from .importing import (
+    IMPORT_FORMATS, QuestionImportError, import_format_for, import_questions, read_question_rows
+)
+from .models import Quiz, QuizAttempt, Choice
+from .pagination import AttemptCursorPagination
+from .payloads import get_quiz_payload
+from .pools import attempt_answer_key, attempt_questions, select_question_ids
 from .serializers import (
-    QuizListSerializer, QuizDetailSerializer, QuizAttemptSerializer,
-    QuizSubmissionSerializer, QuestionSerializer, ChoiceSerializer
+    QuizListSerializer, QuizAttemptSerializer,
+    QuizSubmissionSerializer, QuestionSerializer, ChoiceSerializer, FacultyStudentSerializer,
+    QuestionAnalysisSerializer, StudentQuizDetailSerializer,
+    QuizLeaderboardEntrySerializer, CourseLeaderboardEntrySerializer,
+    expansion_from_request
 )
 
+ATTEMPT_DETAIL_EXPANSIONS = ['quiz', 'student', 'answers']
+
 
 class QuizListView(generics.ListAPIView):
     queryset = Quiz.objects.filter(is_active=True)
@@ -22,7 +43,7 @@ class QuizListView(generics.ListAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().with_user_stats(self.request.user)
         
         # Filter by topic
         topic = self.request.query_params.get('topic')
@@ -34,56 +55,82 @@ class QuizListView(generics.ListAPIView):
 
 class QuizDetailView(generics.RetrieveAPIView):
     queryset = Quiz.objects.filter(is_active=True)
-    serializer_class = QuizDetailSerializer
+    serializer_class = StudentQuizDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        return super().get_queryset().with_user_stats(self.request.user)
+
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def start_quiz(request, quiz_id):
     try:
-        quiz = Quiz.objects.get(id=quiz_id, is_active=True)
-        
-        # Check if user can attempt
-        attempts_count = QuizAttempt.objects.filter(
-            student=request.user,
-            quiz=quiz
-        ).count()
-        
-        if attempts_count >= quiz.max_attempts:
-            return Response({
-                'error': 'Maximum attempts reached'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Check if there's an ongoing attempt
-        ongoing_attempt = QuizAttempt.objects.filter(
-            student=request.user,
-            quiz=quiz,
-            completed_at__isnull=True
-        ).first()
-        
-        if ongoing_attempt:
-            return Response({
-                'message': 'Quiz already in progress',
-                'attempt': QuizAttemptSerializer(ongoing_attempt).data
-            }, status=status.HTTP_200_OK)
-        
-        # Create new attempt
-        attempt = QuizAttempt.objects.create(
-            student=request.user,
-            quiz=quiz
+        quiz = Quiz.objects.only(
+            'id', 'title', 'max_attempts', 'time_limit_minutes', 'content_version', 'pool_size', 'pool_stratify_by'
+        ).with_admission(request.user).get(
+            id=quiz_id,
+            is_active=True
         )
-        
-        return Response({
-            'message': 'Quiz started successfully',
-            'attempt': QuizAttemptSerializer(attempt).data
-        }, status=status.HTTP_201_CREATED)
-        
     except Quiz.DoesNotExist:
         return Response({
             'error': 'Quiz not found'
         }, status=status.HTTP_404_NOT_FOUND)
 
+    # Resume the ongoing attempt if there is one, unless its time ran out
+    if quiz.open_attempt_id:
+        if not is_expired(quiz.open_attempt_started_at, quiz.time_limit_minutes):
+            return _ongoing_attempt_response(quiz.open_attempt_id)
+        try:
+            finalize_expired_attempt(
+                quiz.open_attempt_id, time_limit_end(quiz.open_attempt_started_at, quiz.time_limit_minutes)
+            )
+        except GradingError:
+            # Already closed by a concurrent submit or sweep
+            pass
+
+    if quiz.user_attempts_count >= quiz.max_attempts:
+        return Response({
+            'error': 'Maximum attempts reached'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Fix the attempt's questions now, drawn from the cached payload
+    payload = get_quiz_payload(quiz)
+    question_ids = select_question_ids(quiz, payload)
+
+    # The open-attempt constraint rejects a concurrent duplicate start
+    try:
+        with transaction.atomic():
+            attempt = QuizAttempt.objects.create(
+                student=request.user,
+                quiz=quiz,
+                question_ids=question_ids
+            )
+    except IntegrityError:
+        open_attempt_id = QuizAttempt.objects.filter(
+            student=request.user,
+            quiz=quiz,
+            completed_at__isnull=True
+        ).values_list('id', flat=True).first()
+        if open_attempt_id is None:
+            raise
+        return _ongoing_attempt_response(open_attempt_id)
+
+    return Response({
+        'message': 'Quiz started successfully',
+        'attempt': QuizAttemptSerializer(attempt).data,
+        'questions': attempt_questions(payload, question_ids)
+    }, status=status.HTTP_201_CREATED)
+
+
+def _ongoing_attempt_response(attempt_id):
+    attempt = QuizAttempt.objects.with_related().get(id=attempt_id)
+    return Response({
+        'message': 'Quiz already in progress',
+        'attempt': QuizAttemptSerializer(attempt).data,
+        'questions': attempt_questions(get_quiz_payload(attempt.quiz), attempt.question_ids)
+    }, status=status.HTTP_200_OK)
+
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
@@ -92,101 +139,166 @@ def submit_quiz(request, quiz_id):
         quiz = Quiz.objects.get(id=quiz_id, is_active=True)
         
         # Get ongoing attempt
-        attempt = QuizAttempt.objects.filter(
+        open_attempt = QuizAttempt.objects.filter(
             student=request.user,
             quiz=quiz,
             completed_at__isnull=True
-        ).first()
+        ).values_list('id', 'started_at').first()
         
-        if not attempt:
+        if not open_attempt:
             return Response({
                 'error': 'No active quiz attempt found'
             }, status=status.HTTP_400_BAD_REQUEST)
+        attempt_id, started_at = open_attempt
         
         # Validate submission
         serializer = QuizSubmissionSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Process answers
-        total_points = 0
-        earned_points = 0
-        
-        for answer_data in serializer.validated_data['answers']:
-            question = Question.objects.get(id=answer_data['question_id'])
-            total_points += question.points
-            
-            # Create answer record
-            answer = Answer.objects.create(
-                attempt=attempt,
-                question=question,
-                selected_choice_id=answer_data.get('selected_choice_id'),
-                text_answer=answer_data.get('text_answer', '')
-            )
-            
-            # Check if answer is correct
-            if question.question_type in ['multiple_choice', 'true_false']:
-                if answer.selected_choice and answer.selected_choice.is_correct:
-                    answer.is_correct = True
-                    answer.points_earned = question.points
-                    earned_points += question.points
-            elif question.question_type == 'short_answer':
-                # For short answer, check if the answer matches any correct choice
-                # This allows faculty to provide multiple acceptable answers
-                correct_choices = question.choices.filter(is_correct=True)
-                student_answer = answer.text_answer.strip().lower()
-                
-                for correct_choice in correct_choices:
-                    correct_text = correct_choice.choice_text.strip().lower()
-                    if student_answer == correct_text:
-                        answer.is_correct = True
-                        answer.points_earned = question.points
-                        earned_points += question.points
-                        break
-            
-            answer.save()
-        
-        # Calculate final score
-        percentage = (earned_points / total_points * 100) if total_points > 0 else 0
-        time_taken = (timezone.now() - attempt.started_at).total_seconds() / 60
-        
-        # Update attempt
-        attempt.completed_at = timezone.now()
-        attempt.score = earned_points
-        attempt.percentage = percentage
-        attempt.is_passed = percentage >= quiz.passing_score
-        attempt.time_taken_minutes = round(time_taken, 2)  # Store as float with 2 decimal places
-        attempt.save()
+        # Past the time limit only the answers saved in time count
+        expired = is_expired(started_at, quiz.time_limit_minutes)
+        if expired:
+            attempt, results = finalize_expired_attempt(attempt_id, time_limit_end(started_at, quiz.time_limit_minutes))
+        else:
+            attempt, results = submit_attempt(attempt_id, serializer.validated_data['answers'])
+        attempt = QuizAttempt.objects.with_related().get(id=attempt.id)
         
         return Response({
-            'message': 'Quiz submitted successfully',
+            'message': 'Time limit exceeded; your saved answers were graded' if expired else 'Quiz submitted successfully',
             'attempt': QuizAttemptSerializer(attempt).data,
-            'results': {
-                'score': earned_points,
-                'total_points': total_points,
-                'percentage': percentage,
-                'is_passed': attempt.is_passed,
-                'time_taken_minutes': attempt.time_taken_minutes
-            }
+            'results': results
         }, status=status.HTTP_200_OK)
         
     except Quiz.DoesNotExist:
         return Response({
             'error': 'Quiz not found'
         }, status=status.HTTP_404_NOT_FOUND)
-    except Question.DoesNotExist:
+    except GradingError as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([permissions.IsAuthenticated])
+def autosave_quiz(request, quiz_id):
+    """Get the saved draft of the ongoing attempt, or upsert answer deltas into it at most once per interval"""
+    attempt = QuizAttempt.objects.select_related('quiz').only(
+        'id', 'question_ids', 'quiz__id', 'quiz__content_version'
+    ).filter(
+        student=request.user,
+        quiz_id=quiz_id,
+        quiz__is_active=True,
+        completed_at__isnull=True
+    ).first()
+    if attempt is None:
+        return Response({
+            'error': 'No active quiz attempt found'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if request.method == 'GET':
+        return Response({
+            'attempt_id': attempt.id,
+            'answers': list(load_draft(attempt.id).values())
+        })
+
+    serializer = QuizSubmissionSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    answers_data = serializer.validated_data['answers']
+    answer_key = attempt_answer_key(get_answer_key(attempt.quiz), attempt.question_ids)
+    try:
+        for answer_data in answers_data:
+            validate_answer(answer_key, answer_data)
+    except GradingError as e:
         return Response({
-            'error': 'Invalid question ID'
+            'error': str(e)
         }, status=status.HTTP_400_BAD_REQUEST)
 
+    if not claim_autosave(attempt.id):
+        # Nothing was stored; the client keeps these answers for its next save or the submission
+        return Response({
+            'error': 'Autosaving too often'
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(AUTOSAVE_MIN_INTERVAL_SECONDS)})
+    if not save_draft(attempt.id, answers_data):
+        return Response({
+            'error': 'No active quiz attempt found'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        'saved': len(answers_data)
+    })
+
+
+def _leaderboard_limit(request):
+    limit = request.query_params.get('limit', str(DEFAULT_LEADERBOARD_SIZE))
+    if not limit.isdigit() or int(limit) < 1:
+        return None
+    return min(int(limit), MAX_LEADERBOARD_SIZE)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def quiz_leaderboard_view(request, quiz_id):
+    """
+    Get the top students of a quiz by best percentage, and the caller's own
+    rank. Only the quiz's faculty and students enrolled in its course, or who
+    took a quiz that has no course, can see it.
+    """
+    limit = _leaderboard_limit(request)
+    if limit is None:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    visible = Q(created_by=request.user) | Q(course__instructor=request.user) | Q(
+        is_active=True,
+        course__enrollments__student=request.user,
+        course__enrollments__is_active=True
+    ) | Q(is_active=True, course__isnull=True, attempts__student=request.user)
+    if not Quiz.objects.filter(visible, id=quiz_id).exists():
+        return Response({'error': 'Quiz not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    top, mine = quiz_leaderboard(quiz_id, request.user, limit)
+    return Response({
+        'results': QuizLeaderboardEntrySerializer(top, many=True).data,
+        'me': QuizLeaderboardEntrySerializer(mine).data if mine else None,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def course_leaderboard_view(request, course_id):
+    """
+    Get the top students of a course by summed best quiz percentages, and the
+    caller's own rank. Only the instructor and enrolled students can see it.
+    """
+    limit = _leaderboard_limit(request)
+    if limit is None:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    visible = Q(instructor=request.user) | Q(
+        is_active=True,
+        enrollments__student=request.user,
+        enrollments__is_active=True
+    )
+    if not Course.objects.filter(visible, id=course_id).exists():
+        return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    top, mine = course_leaderboard(course_id, request.user, limit)
+    return Response({
+        'results': CourseLeaderboardEntrySerializer(top, many=True).data,
+        'me': CourseLeaderboardEntrySerializer(mine).data if mine else None,
+    })
+
 
 class MyQuizAttemptsView(generics.ListAPIView):
     serializer_class = QuizAttemptSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
+        expand = expansion_from_request(self.request).get('expand', [])
         return QuizAttempt.objects.filter(
             student=self.request.user
-        ).order_by('-started_at')
+        ).with_related(expand, self.request.user).order_by('-started_at')
+    
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(expansion_from_request(self.request))
+        return super().get_serializer(*args, **kwargs)
 
 # Faculty-specific views for quiz management
 
@@ -203,7 +315,7 @@ class FacultyQuizListView(generics.ListCreateAPIView):
         return Quiz.objects.filter(
             Q(created_by=self.request.user) |
             Q(course__instructor=self.request.user)
-        ).distinct()
+        ).distinct().with_user_stats(self.request.user)
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -229,29 +341,114 @@ class FacultyQuizDetailView(generics.RetrieveUpdateDestroyAPIView):
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def faculty_quiz_attempts(request, quiz_id):
-    """Get all attempts for a faculty's quiz"""
+    """Get a page of the attempts on a faculty's quiz, newest first"""
     try:
         quiz = Quiz.objects.get(
             id=quiz_id,
             created_by=request.user
         )
-        attempts = QuizAttempt.objects.filter(quiz=quiz).order_by('-started_at')
-        serializer = QuizAttemptSerializer(attempts, many=True)
-        return Response(serializer.data)
+        params = expansion_from_request(request)
+        attempts = QuizAttempt.objects.filter(quiz=quiz).with_related(params.get('expand', []), request.user)
+        paginator = AttemptCursorPagination()
+        page = paginator.paginate_queryset(attempts, request)
+        serializer = QuizAttemptSerializer(page, many=True, context={'request': request}, **params)
+        return paginator.get_paginated_response(serializer.data)
     except Quiz.DoesNotExist:
         return Response({'error': 'Quiz not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def faculty_quiz_attempt_detail(request, quiz_id, attempt_id):
+    """Get one attempt on a faculty's quiz with its quiz, student and answers expanded"""
+    try:
+        attempt = QuizAttempt.objects.with_related(ATTEMPT_DETAIL_EXPANSIONS, request.user).get(
+            id=attempt_id,
+            quiz_id=quiz_id,
+            quiz__created_by=request.user
+        )
+    except QuizAttempt.DoesNotExist:
+        return Response({'error': 'Attempt not found'}, status=status.HTTP_404_NOT_FOUND)
+    serializer = QuizAttemptSerializer(attempt, context={'request': request}, expand=ATTEMPT_DETAIL_EXPANSIONS)
+    return Response(serializer.data)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def faculty_import_questions(request, quiz_id):
+    """Import questions into a faculty's quiz from a JSON, NDJSON or CSV file, or a JSON list"""
+    try:
+        quiz = Quiz.objects.get(id=quiz_id, created_by=request.user)
+    except Quiz.DoesNotExist:
+        return Response({'error': 'Quiz not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    upload = request.FILES.get('file')
+    if upload is not None:
+        import_format = request.data.get('format') or import_format_for(upload.name)
+        if import_format not in IMPORT_FORMATS:
+            return Response({'error': f'format must be one of {", ".join(IMPORT_FORMATS)}'}, status=status.HTTP_400_BAD_REQUEST)
+        rows = read_question_rows(upload.file, import_format)
+    elif isinstance(request.data.get('questions'), list):
+        rows = ((row, data, None) for row, data in enumerate(request.data['questions'], start=1))
+    else:
+        return Response({'error': 'Provide a file or a "questions" list'}, status=status.HTTP_400_BAD_REQUEST)
+
+    dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+    try:
+        report = import_questions(quiz, rows, dry_run=dry_run)
+    except (QuestionImportError, UnicodeDecodeError, csv.Error) as e:
+        return Response({'error': f'Could not read the import file: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report, status=status.HTTP_200_OK if dry_run or not report['imported'] else status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def faculty_quiz_item_analysis(request, quiz_id):
+    """Get attempt totals and per-question statistics for a faculty's quiz"""
+    try:
+        quiz = Quiz.objects.only('id', 'title', 'total_questions', 'total_points').get(
+            id=quiz_id,
+            created_by=request.user
+        )
+    except Quiz.DoesNotExist:
+        return Response({'error': 'Quiz not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    completed = Q(completed_at__isnull=False)
+    summary = quiz.attempts.order_by().aggregate(
+        total_attempts=Count('id'),
+        passed=Count('id', filter=completed & Q(is_passed=True)),
+        failed=Count('id', filter=completed & Q(is_passed=False)),
+        in_progress=Count('id', filter=Q(completed_at__isnull=True)),
+        average_percentage=Avg('percentage', filter=completed)
+    )
+    questions = quiz.questions.select_related('stats').prefetch_related(
+        Prefetch('choices', queryset=Choice.objects.select_related('stats'))
+    )
+    return Response({
+        'quiz': {
+            'id': quiz.id,
+            'title': quiz.title,
+            'total_questions': quiz.total_questions,
+            'total_points': quiz.total_points,
+        },
+        'summary': summary,
+        'questions': QuestionAnalysisSerializer(questions, many=True).data,
+    })
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def faculty_students_list(request):
-    """Get list of all students for faculty to manage"""
-    from apps.users.models import User
-    from apps.users.serializers import UserSerializer
-    from apps.courses.models import CourseEnrollment
-    
-    students = User.objects.filter(user_type='student').order_by('first_name', 'last_name')
-    
+    """Get a paginated list of students with their enrollments in the faculty's courses"""
+    faculty_enrollments = Q(
+        enrollments__course__instructor=request.user,
+        enrollments__is_active=True
+    )
+    students = User.objects.filter(user_type='student').select_related('student_profile').annotate(
+        enrolled_courses_count=Count('enrollments', filter=faculty_enrollments),
+        overall_progress=Avg('enrollments__progress_percentage', filter=faculty_enrollments)
+    ).order_by('first_name', 'last_name', 'id')
+
     # Filter by search query if provided
     search = request.query_params.get('search', '')
     if search:
@@ -261,41 +458,34 @@ def faculty_students_list(request):
             Q(username__icontains=search) |
             Q(email__icontains=search)
         )
-    
-    # Get faculty's courses
-    faculty_courses = Course.objects.filter(instructor=request.user)
-    
-    # Enhance student data with enrollment and progress information
-    enhanced_students = []
-    for student in students:
-        student_data = UserSerializer(student).data
-        
-        # Get enrolled courses for this faculty
-        enrollments = CourseEnrollment.objects.filter(
-            student=student,
-            course__in=faculty_courses
-        ).select_related('course')
-        
-        enrolled_courses = []
-        total_progress = 0
-        course_count = 0
-        
-        for enrollment in enrollments:
-            course_data = {
-                'id': enrollment.course.id,
-                'title': enrollment.course.title,
-                'progress_percentage': enrollment.progress_percentage or 0
-            }
-            enrolled_courses.append(course_data)
-            total_progress += enrollment.progress_percentage or 0
-            course_count += 1
-        
-        # Calculate overall progress
-        overall_progress = total_progress / course_count if course_count > 0 else 0
-        
-        student_data['enrolled_courses'] = enrolled_courses
-        student_data['overall_progress'] = overall_progress
-        
-        enhanced_students.append(student_data)
-    
-    return Response(enhanced_students)
+
+    # Restrict to one of the faculty's courses without narrowing the aggregates
+    course_id = request.query_params.get('course')
+    if course_id:
+        if not course_id.isdigit():
+            return Response({'error': 'Invalid course'}, status=status.HTTP_400_BAD_REQUEST)
+        students = students.filter(Exists(Enrollment.objects.filter(
+            student=OuterRef('pk'),
+            course_id=course_id,
+            course__instructor=request.user,
+            is_active=True
+        )))
+
+    paginator = PageNumberPagination()
+    page = paginator.paginate_queryset(students, request)
+
+    enrolled_courses = defaultdict(list)
+    enrollments = Enrollment.objects.filter(
+        student_id__in=[student.id for student in page],
+        course__instructor=request.user,
+        is_active=True
+    ).order_by('course__title').values('student_id', 'course_id', 'course__title', 'progress_percentage')
+    for enrollment in enrollments:
+        enrolled_courses[enrollment['student_id']].append({
+            'id': enrollment['course_id'],
+            'title': enrollment['course__title'],
+            'progress_percentage': enrollment['progress_percentage'] or 0
+        })
+
+    serializer = FacultyStudentSerializer(page, many=True, context={'enrolled_courses': enrolled_courses})
+    return paginator.get_paginated_response(serializer.data)
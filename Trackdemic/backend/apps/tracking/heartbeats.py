@@ -0,0 +1,155 @@
+import atexit
+import datetime
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from apps.courses.models import LessonProgress
+from .models import LearningAnalytics
+
+FLUSH_INTERVAL_SECONDS = getattr(settings, 'HEARTBEAT_FLUSH_INTERVAL_SECONDS', 60)
+MAX_HEARTBEAT_SECONDS = 120
+
+
+class HeartbeatBuffer:
+    """
+    Per-process buffer that sums heartbeat seconds in memory and writes them
+    out as aggregated minute increments, so one learner sending a heartbeat
+    every 30 seconds costs a couple of row updates per flush, not per request.
+    Seconds that do not yet add up to a whole minute are carried over,
+    fractions included, so timer jitter between heartbeats is not lost.
+
+    The seconds a client reports are capped at the wall-clock time since its
+    previous heartbeat, per lesson for lesson time and per student for study
+    time, so rapid or parallel heartbeats cannot inflate either.
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL_SECONDS):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._lesson_seconds = defaultdict(int)
+        self._student_seconds = defaultdict(int)
+        self._last_lesson_heartbeat = {}
+        self._last_student_heartbeat = {}
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def _credit(last_seen, key, seconds, now):
+        """Seconds to count for a heartbeat: no more than have passed since the previous one"""
+        previous = last_seen.get(key)
+        last_seen[key] = now
+        if previous is None:
+            return seconds
+        return min(seconds, now - previous)
+
+    def add(self, student_id, enrollment_id, lesson_id, seconds):
+        now = time.monotonic()
+        with self._lock:
+            lesson_seconds = self._credit(self._last_lesson_heartbeat, (student_id, lesson_id), seconds, now)
+            student_seconds = self._credit(self._last_student_heartbeat, student_id, seconds, now)
+            if lesson_seconds:
+                self._lesson_seconds[(enrollment_id, lesson_id)] += lesson_seconds
+            if student_seconds:
+                self._student_seconds[student_id] += student_seconds
+
+    def should_flush(self):
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def _drain(self, buffer):
+        minutes = {}
+        for key, seconds in list(buffer.items()):
+            whole, remainder = divmod(seconds, 60)
+            if whole:
+                minutes[key] = int(whole)
+            if remainder:
+                buffer[key] = remainder
+            else:
+                del buffer[key]
+        return minutes
+
+    @staticmethod
+    def _forget_idle(last_seen, now):
+        # A heartbeat after this long is capped by MAX_HEARTBEAT_SECONDS anyway
+        for key, seen in list(last_seen.items()):
+            if now - seen >= MAX_HEARTBEAT_SECONDS:
+                del last_seen[key]
+
+    def _restore(self, buffer, minutes):
+        for key, whole in minutes.items():
+            buffer[key] += whole * 60
+
+    def flush(self):
+        with self._lock:
+            now = time.monotonic()
+            self._last_flush = now
+            lesson_minutes = self._drain(self._lesson_seconds)
+            student_minutes = self._drain(self._student_seconds)
+            self._forget_idle(self._last_lesson_heartbeat, now)
+            self._forget_idle(self._last_student_heartbeat, now)
+
+        if lesson_minutes or student_minutes:
+            try:
+                with transaction.atomic():
+                    _apply_lesson_minutes(lesson_minutes)
+                    _apply_study_minutes(student_minutes)
+            except Exception:
+                # Put the minutes back so the next flush writes them
+                with self._lock:
+                    self._restore(self._lesson_seconds, lesson_minutes)
+                    self._restore(self._student_seconds, student_minutes)
+                raise
+        return len(lesson_minutes), len(student_minutes)
+
+
+def _apply_lesson_minutes(lesson_minutes):
+    if not lesson_minutes:
+        return
+
+    enrollment_ids = {enrollment_id for enrollment_id, _ in lesson_minutes}
+    lesson_ids = {lesson_id for _, lesson_id in lesson_minutes}
+    LessonProgress.objects.bulk_create(
+        [LessonProgress(enrollment_id=e, lesson_id=l) for e, l in lesson_minutes],
+        ignore_conflicts=True,
+    )
+
+    rows = []
+    progress_rows = LessonProgress.objects.filter(
+        enrollment_id__in=enrollment_ids,
+        lesson_id__in=lesson_ids
+    ).only('id', 'enrollment_id', 'lesson_id')
+    for progress in progress_rows:
+        minutes = lesson_minutes.get((progress.enrollment_id, progress.lesson_id))
+        if minutes:
+            progress.time_spent_minutes = F('time_spent_minutes') + minutes
+            rows.append(progress)
+    LessonProgress.objects.bulk_update(rows, ['time_spent_minutes'], batch_size=500)
+
+
+def _apply_study_minutes(student_minutes):
+    if not student_minutes:
+        return
+
+    # analysis_date is auto_now, which stamps rows with the server's local date
+    today = datetime.date.today()
+    LearningAnalytics.objects.bulk_create(
+        [LearningAnalytics(student_id=student_id) for student_id in student_minutes],
+        ignore_conflicts=True,
+    )
+
+    rows = []
+    analytics_rows = LearningAnalytics.objects.filter(
+        student_id__in=student_minutes.keys(),
+        analysis_date=today
+    ).only('id', 'student_id')
+    for analytics in analytics_rows:
+        analytics.study_time_minutes = F('study_time_minutes') + student_minutes[analytics.student_id]
+        rows.append(analytics)
+    LearningAnalytics.objects.bulk_update(rows, ['study_time_minutes'], batch_size=500)
+
+
+heartbeat_buffer = HeartbeatBuffer()
+atexit.register(heartbeat_buffer.flush)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import StudentPerformance, LearningAnalytics, PerformanceReport, MLModelMetrics
+from .heartbeats import MAX_HEARTBEAT_SECONDS
 
 class StudentPerformanceSerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
@@ -29,3 +30,7 @@ class MLModelMetricsSerializer(serializers.ModelSerializer):
     class Meta:
         model = MLModelMetrics
         fields = '__all__'
+
+class HeartbeatSerializer(serializers.Serializer):
+    lesson_id = serializers.IntegerField()
+    seconds = serializers.IntegerField(min_value=1, max_value=MAX_HEARTBEAT_SECONDS, default=30)
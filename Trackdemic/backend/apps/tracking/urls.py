@@ -8,4 +8,5 @@ urlpatterns = [
     path('class-insights/', views.get_class_insights, name='class_insights'),
     path('reports/generate/', views.generate_performance_report, name='generate_report'),
     path('reports/', views.get_performance_reports, name='performance_reports'),
+    path('heartbeat/', views.record_heartbeat, name='record_heartbeat'),
 ]
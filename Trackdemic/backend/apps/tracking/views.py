@@ -1,13 +1,25 @@
+import logging
+
 import requests
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from apps.courses.models import Enrollment
+from .heartbeats import heartbeat_buffer
 from .models import StudentPerformance, LearningAnalytics, PerformanceReport
-from .serializers import StudentPerformanceSerializer, LearningAnalyticsSerializer, PerformanceReportSerializer
+from .serializers import (
+    StudentPerformanceSerializer, LearningAnalyticsSerializer, PerformanceReportSerializer,
+    HeartbeatSerializer
+)
 
 ML_SERVICE_URL = getattr(settings, 'ML_SERVICE_URL', 'http://localhost:5001')
+HEARTBEAT_ENROLLMENT_CACHE_TIMEOUT = 10 * 60
+
+logger = logging.getLogger(__name__)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -169,3 +181,34 @@ def get_performance_reports(request):
     reports = reports.order_by('-created_at')[:20]
     serializer = PerformanceReportSerializer(reports, many=True)
     return Response({'reports': serializer.data})
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def record_heartbeat(request):
+    """Record time spent viewing a lesson; called by the client every 30-60 seconds"""
+    serializer = HeartbeatSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    lesson_id = serializer.validated_data['lesson_id']
+    seconds = serializer.validated_data['seconds']
+
+    cache_key = f'heartbeat:{request.user.id}:{lesson_id}'
+    enrollment_id = cache.get(cache_key)
+    if enrollment_id is None:
+        enrollment_id = Enrollment.objects.filter(
+            student=request.user,
+            course__modules__lessons__id=lesson_id,
+            is_active=True
+        ).values_list('id', flat=True).first()
+        if enrollment_id is None:
+            return Response({'error': 'Lesson not found in your enrolled courses'}, status=status.HTTP_404_NOT_FOUND)
+        cache.set(cache_key, enrollment_id, HEARTBEAT_ENROLLMENT_CACHE_TIMEOUT)
+
+    heartbeat_buffer.add(request.user.id, enrollment_id, lesson_id, seconds)
+    if heartbeat_buffer.should_flush():
+        try:
+            heartbeat_buffer.flush()
+        except DatabaseError:
+            # The buffer keeps the minutes for the next flush; this heartbeat was recorded
+            logger.exception('Could not flush buffered heartbeats')
+
+    return Response({'message': 'Heartbeat recorded'}, status=status.HTTP_202_ACCEPTED)
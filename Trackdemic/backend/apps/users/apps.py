@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class UsersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.users'
+
+    def ready(self):
+        if getattr(settings, 'ADMIN_STATS_LIVE_COUNTERS', False):
+            from . import signals  # noqa: F401
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.courses.models import Course, Enrollment
+from apps.quizzes.models import Quiz, QuizAttempt
+
+User = get_user_model()
+
+STATS_REFRESH_SECONDS = getattr(settings, 'ADMIN_STATS_REFRESH_SECONDS', 300)
+RECENT_REGISTRATION_DAYS = 30
+STATS_CACHE_PREFIX = 'admin_dashboard_stats'
+USER_TYPE_COUNTERS = {'student': 'users.students', 'faculty': 'users.faculty', 'admin': 'users.admins'}
+COUNTERS = [
+    'users.total', 'users.students', 'users.faculty', 'users.admins', 'users.recent_registrations',
+    'courses.total', 'courses.active', 'courses.enrollments',
+    'quizzes.total', 'quizzes.active', 'quizzes.attempts',
+]
+
+
+def _counter_key(name):
+    return f'{STATS_CACHE_PREFIX}:{name}'
+
+
+COMPUTED_AT_KEY = _counter_key('computed_at')
+
+
+def recent_registration_cutoff():
+    return timezone.now() - timedelta(days=RECENT_REGISTRATION_DAYS)
+
+
+def compute_dashboard_counters():
+    """Count everything on the admin dashboard with one conditional aggregate per table"""
+    users = User.objects.aggregate(
+        total=Count('id'),
+        students=Count('id', filter=Q(user_type='student')),
+        faculty=Count('id', filter=Q(user_type='faculty')),
+        admins=Count('id', filter=Q(user_type='admin')),
+        recent_registrations=Count('id', filter=Q(date_joined__gte=recent_registration_cutoff())),
+    )
+    courses = Course.objects.aggregate(total=Count('id'), active=Count('id', filter=Q(is_active=True)))
+    quizzes = Quiz.objects.aggregate(total=Count('id'), active=Count('id', filter=Q(is_active=True)))
+    counters = {f'users.{name}': value for name, value in users.items()}
+    counters.update({f'courses.{name}': value for name, value in courses.items()})
+    counters['courses.enrollments'] = Enrollment.objects.aggregate(total=Count('id'))['total']
+    counters.update({f'quizzes.{name}': value for name, value in quizzes.items()})
+    counters['quizzes.attempts'] = QuizAttempt.objects.aggregate(total=Count('id'))['total']
+    return counters
+
+
+def refresh_dashboard_stats():
+    """Recompute the snapshot and store it, one cache entry per counter so each can be adjusted in place"""
+    counters = compute_dashboard_counters()
+    computed_at = timezone.now()
+    values = {_counter_key(name): value for name, value in counters.items()}
+    values[COMPUTED_AT_KEY] = computed_at
+    cache.set_many(values, STATS_REFRESH_SECONDS)
+    return counters, computed_at
+
+
+def get_dashboard_stats():
+    """
+    The dashboard stats from the cached snapshot, read with one cache call
+    whatever the table sizes. The snapshot is recomputed when it expires or
+    any counter has been invalidated.
+    """
+    cached = cache.get_many([_counter_key(name) for name in COUNTERS] + [COMPUTED_AT_KEY])
+    if len(cached) == len(COUNTERS) + 1:
+        counters = {name: cached[_counter_key(name)] for name in COUNTERS}
+        computed_at = cached[COMPUTED_AT_KEY]
+    else:
+        counters, computed_at = refresh_dashboard_stats()
+
+    stats = {}
+    for name, value in counters.items():
+        group, counter = name.split('.')
+        stats.setdefault(group, {})[counter] = value
+    stats['computed_at'] = computed_at
+    return stats
+
+
+def adjust_counters(changes):
+    """
+    Apply deltas to the cached counters. Counters that have expired are left
+    alone; the next read recomputes them.
+    """
+    for name, delta in changes.items():
+        if delta:
+            try:
+                cache.incr(_counter_key(name), delta)
+            except ValueError:
+                pass
+
+
+def invalidate_dashboard_stats():
+    cache.delete(COMPUTED_AT_KEY)
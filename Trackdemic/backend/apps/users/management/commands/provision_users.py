@@ -0,0 +1,44 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.provisioning import PROVISION_BATCH_SIZE, ProvisioningError, provision_users, read_user_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Create students and faculty with their profiles from a CSV file, hashing '
+        'passwords across all cores and inserting in batches'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to read, or - for standard input')
+        parser.add_argument('--workers', type=int, help='Password hashing processes, defaults to the CPU count')
+        parser.add_argument('--batch-size', type=int, default=PROVISION_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Validate without saving')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            updates = provision_users(
+                read_user_rows(stream),
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run']
+            )
+            for update in updates:
+                if not update.get('done'):
+                    self.stdout.write(f'{update["processed"]} rows read, {update["created"]} created, {update["failed"]} failed')
+        except (ProvisioningError, UnicodeDecodeError, csv.Error) as e:
+            raise CommandError(f'Could not read {path}: {e}')
+        finally:
+            stream.close()
+
+        for error in update['errors']:
+            self.stderr.write(f'Row {error["row"]}: {"; ".join(error["errors"])}')
+        verb = 'Validated' if options['dry_run'] else 'Created'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {update["created"]} users from {update["processed"]} rows, {update["failed"]} rows failed'
+        ))
@@ -1,5 +1,24 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
+
+PROFILE_RELATIONS = ('student_profile', 'faculty_profile')
+
+
+def profile_lookups(prefix=None):
+    """select_related() paths that load both profiles of the user at prefix, as UserSerializer reads them"""
+    return [f'{prefix}__{relation}' if prefix else relation for relation in PROFILE_RELATIONS]
+
+
+class UserQuerySet(models.QuerySet):
+    def with_profiles(self):
+        """Join both profiles so serializing a user never looks them up one by one"""
+        return self.select_related(*profile_lookups())
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
+
 
 class User(AbstractUser):
     USER_TYPES = (
@@ -16,6 +35,19 @@ class User(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Case-insensitive prefix search in the admin user list
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            models.Index(Lower('first_name'), name='user_first_name_lower_idx'),
+            models.Index(Lower('last_name'), name='user_last_name_lower_idx'),
+            models.Index(fields=['-date_joined', '-id'], name='user_joined_idx'),
+            models.Index(fields=['user_type', '-date_joined', '-id'], name='user_type_joined_idx'),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.user_type})"
 
@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class AdminUserCursorPagination(CursorPagination):
+    """Keyset pagination over users, newest first, that stays fast deep into large lists"""
+    ordering = ('-date_joined', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
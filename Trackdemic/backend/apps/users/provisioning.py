@@ -0,0 +1,266 @@
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from .dashboard import invalidate_dashboard_stats
+from .models import FacultyProfile, StudentProfile, User
+
+PROVISION_BATCH_SIZE = 500
+REQUEST_WORKERS = getattr(settings, 'USER_PROVISIONING_REQUEST_WORKERS', 1)
+MAX_REPORTED_ERRORS = 1000
+MIN_PASSWORD_LENGTH = 8
+PROVISIONED_USER_TYPES = ('student', 'faculty')
+DEFAULT_DEPARTMENT = 'General'
+REQUIRED_COLUMNS = ('username', 'password')
+TEXT_LIMITS = {
+    'first_name': User._meta.get_field('first_name').max_length,
+    'last_name': User._meta.get_field('last_name').max_length,
+    'grade_level': StudentProfile._meta.get_field('grade_level').max_length,
+    'department': FacultyProfile._meta.get_field('department').max_length,
+}
+username_validator = UnicodeUsernameValidator()
+
+
+class ProvisioningError(Exception):
+    """Raised when a provisioning file cannot be read at all"""
+
+
+def read_user_rows(binary_stream):
+    """
+    Stream (row, data) from a CSV with username, password, email, first_name,
+    last_name and user_type columns, plus grade_level for students and
+    department for faculty. The header is checked before any row is read.
+    """
+    text = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    if not reader.fieldnames or not set(REQUIRED_COLUMNS) <= set(reader.fieldnames):
+        raise ProvisioningError(f'CSV header must include {" and ".join(REQUIRED_COLUMNS)} columns')
+    # Data rows start on line 2, after the header
+    return enumerate(reader, start=2)
+
+
+def clean_user(data):
+    """Validate one user to provision, returning (cleaned data, list of errors)"""
+    if not isinstance(data, dict):
+        return None, ['Expected an object']
+    errors = []
+
+    username = User.normalize_username(str(data.get('username') or '').strip())
+    if not username:
+        errors.append('username is required')
+    else:
+        try:
+            username_validator(username)
+        except ValidationError as e:
+            errors.extend(e.messages)
+        if len(username) > User._meta.get_field('username').max_length:
+            errors.append('username must be at most 150 characters')
+
+    email = User.objects.normalize_email(str(data.get('email') or '').strip())
+    if email:
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors.append('email is not a valid address')
+
+    password = data.get('password')
+    if not isinstance(password, str) or len(password) < MIN_PASSWORD_LENGTH:
+        errors.append(f'password must be at least {MIN_PASSWORD_LENGTH} characters')
+
+    user_type = data.get('user_type') or 'student'
+    if user_type not in PROVISIONED_USER_TYPES:
+        errors.append(f'user_type must be one of {", ".join(PROVISIONED_USER_TYPES)}')
+
+    text = {}
+    for field, limit in TEXT_LIMITS.items():
+        value = data.get(field) or ''
+        if not isinstance(value, str) or len(value) > limit:
+            errors.append(f'{field} must be text of at most {limit} characters')
+        else:
+            text[field] = value.strip()
+
+    if errors:
+        return None, errors
+    return {
+        'username': username,
+        'email': email,
+        'password': password,
+        'user_type': user_type,
+        **text,
+    }, None
+
+
+@contextmanager
+def password_hasher(workers=None):
+    """
+    A function that starts hashing a list of passwords and returns an
+    iterator over the hashes. With more than one worker the hashing runs in a
+    process pool, so it spreads over the cores and carries on while the caller
+    does other work. Workers are spawned rather than forked, which is safe
+    from a threaded server.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield lambda passwords: iter([make_password(password) for password in passwords])
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=django.setup
+    ) as pool:
+        def hash_passwords(passwords):
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return pool.map(make_password, passwords, chunksize=chunksize)
+        yield hash_passwords
+
+
+def _profile_id(prefix, user_id):
+    return f'{prefix}{user_id:06d}'
+
+
+def _create_batch(batch, hashes):
+    """Insert a batch of users and then their profiles, whose IDs come from the new user IDs"""
+    users = [
+        User(
+            username=entry['username'],
+            email=entry['email'],
+            password=password_hash,
+            first_name=entry['first_name'],
+            last_name=entry['last_name'],
+            user_type=entry['user_type'],
+        )
+        for entry, password_hash in zip(batch, hashes)
+    ]
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        if any(user.pk is None for user in users):
+            # Backends that cannot return IDs from a bulk insert
+            ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'id'))
+            for user in users:
+                user.pk = ids[user.username]
+
+        StudentProfile.objects.bulk_create([
+            StudentProfile(user=user, student_id=_profile_id('STU', user.pk), grade_level=entry['grade_level'] or None)
+            for user, entry in zip(users, batch) if entry['user_type'] == 'student'
+        ])
+        FacultyProfile.objects.bulk_create([
+            FacultyProfile(
+                user=user,
+                employee_id=_profile_id('FAC', user.pk),
+                department=entry['department'] or DEFAULT_DEPARTMENT
+            )
+            for user, entry in zip(users, batch) if entry['user_type'] == 'faculty'
+        ])
+
+
+def provision_users(rows, workers=None, batch_size=PROVISION_BATCH_SIZE, dry_run=False):
+    """
+    Validate (row, data) pairs as they stream in and create the valid users
+    with their student or faculty profiles in bulk batches, one transaction
+    per batch. Rows that are invalid, repeat an earlier row, or name an
+    existing username or email are skipped and reported.
+
+    Passwords are hashed in a process pool (see password_hasher), the next
+    batch hashing while the current one is inserted. Yields the running totals
+    after each batch is saved; the last update also carries the errors.
+    """
+    progress = {'processed': 0, 'created': 0, 'failed': 0}
+    errors = []
+    seen_usernames = set()
+    seen_emails = set()
+
+    def report(row, messages):
+        progress['failed'] += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'row': row, 'errors': messages})
+
+    def take_new(pending):
+        """Drop users whose username or email already exists, with one query per batch"""
+        usernames = [entry['username'] for _, entry in pending]
+        emails = [entry['email'] for _, entry in pending if entry['email']]
+        taken = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_emails = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+        batch = []
+        for row, entry in pending:
+            if entry['username'] in taken:
+                report(row, ['username already exists'])
+            elif entry['email'] in taken_emails:
+                report(row, ['email already exists'])
+            else:
+                batch.append((row, entry))
+        return batch
+
+    def batches():
+        pending = []
+        for row, data in rows:
+            progress['processed'] += 1
+            entry, messages = clean_user(data)
+            if messages:
+                report(row, messages)
+                continue
+            if entry['username'] in seen_usernames or (entry['email'] and entry['email'] in seen_emails):
+                report(row, ['username or email repeats an earlier row'])
+                continue
+            seen_usernames.add(entry['username'])
+            if entry['email']:
+                seen_emails.add(entry['email'])
+            pending.append((row, entry))
+            if len(pending) >= batch_size:
+                yield take_new(pending)
+                pending = []
+        if pending:
+            yield take_new(pending)
+
+    def save(batch, hashes):
+        hashes = list(hashes)
+        while batch:
+            try:
+                _create_batch([entry for _, entry in batch], hashes)
+            except IntegrityError:
+                # Another request took some usernames or emails after the existence
+                # check: report just those rows and retry the rest with their hashes
+                hash_by_row = {row: password_hash for (row, _), password_hash in zip(batch, hashes)}
+                remaining = take_new(batch)
+                if len(remaining) == len(batch):
+                    for row, _ in batch:
+                        report(row, ['username or email was taken while provisioning'])
+                    return
+                batch = remaining
+                hashes = [hash_by_row[row] for row, _ in batch]
+            else:
+                progress['created'] += len(batch)
+                return
+
+    if dry_run:
+        for batch in batches():
+            progress['created'] += len(batch)
+            yield dict(progress, dry_run=True)
+        yield dict(progress, dry_run=True, done=True, errors=errors)
+        return
+
+    with password_hasher(workers) as hash_passwords:
+        previous = None
+        for batch in batches():
+            hashes = hash_passwords([entry['password'] for _, entry in batch])
+            if previous:
+                save(*previous)
+                yield dict(progress)
+            previous = (batch, hashes)
+        if previous:
+            save(*previous)
+
+    if progress['created']:
+        invalidate_dashboard_stats()
+    yield dict(progress, done=True, errors=errors)
@@ -0,0 +1,24 @@
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+USER_SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')
+# Sorts after any character, so [term, term + PREFIX_END) holds exactly the strings starting with term
+PREFIX_END = chr(0x10FFFF)
+
+
+def search_users(queryset, search):
+    """
+    Keep users where every word of search starts one of their username, email
+    or names, case-insensitively. Each word becomes a range over the
+    lower-cased field indexes rather than a LIKE '%...%' table scan.
+    """
+    words = search.lower().split()
+    if not words:
+        return queryset
+    queryset = queryset.alias(**{f'{field}_lower': Lower(field) for field in USER_SEARCH_FIELDS})
+    for word in words:
+        matches = Q()
+        for field in USER_SEARCH_FIELDS:
+            matches |= Q(**{f'{field}_lower__gte': word, f'{field}_lower__lt': word + PREFIX_END})
+        queryset = queryset.filter(matches)
+    return queryset
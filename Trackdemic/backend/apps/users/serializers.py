@@ -3,6 +3,7 @@ from .models import User, StudentProfile, FacultyProfile
 
 
 class UserSerializer(serializers.ModelSerializer):
+    """Reads both profiles of each user, so querysets feeding it should use User.objects.with_profiles()"""
     student_profile = serializers.SerializerMethodField()
     faculty_profile = serializers.SerializerMethodField()
     
@@ -14,26 +15,28 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'username', 'user_type', 'date_joined']
     
     def get_student_profile(self, obj):
-        if hasattr(obj, 'student_profile'):
+        profile = getattr(obj, 'student_profile', None)
+        if profile is not None:
             return {
-                'student_id': obj.student_profile.student_id,
-                'enrollment_date': obj.student_profile.enrollment_date,
-                'grade_level': obj.student_profile.grade_level,
+                'student_id': profile.student_id,
+                'enrollment_date': profile.enrollment_date,
+                'grade_level': profile.grade_level,
             }
         return None
     
     def get_faculty_profile(self, obj):
-        if hasattr(obj, 'faculty_profile'):
+        profile = getattr(obj, 'faculty_profile', None)
+        if profile is not None:
             return {
-                'employee_id': obj.faculty_profile.employee_id,
-                'department': obj.faculty_profile.department,
-                'specialization': obj.faculty_profile.specialization,
-                'hire_date': obj.faculty_profile.hire_date,
-                'designation': obj.faculty_profile.designation,
-                'educational_qualifications': obj.faculty_profile.educational_qualifications,
-                'certifications_awards': obj.faculty_profile.certifications_awards,
-                'degree_certificate': obj.faculty_profile.degree_certificate.url if obj.faculty_profile.degree_certificate else None,
-                'subject_expertise': obj.faculty_profile.subject_expertise,
+                'employee_id': profile.employee_id,
+                'department': profile.department,
+                'specialization': profile.specialization,
+                'hire_date': profile.hire_date,
+                'designation': profile.designation,
+                'educational_qualifications': profile.educational_qualifications,
+                'certifications_awards': profile.certifications_awards,
+                'degree_certificate': profile.degree_certificate.url if profile.degree_certificate else None,
+                'subject_expertise': profile.subject_expertise,
             }
         return None
 
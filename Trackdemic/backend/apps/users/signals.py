@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.courses.models import Course, Enrollment
+from apps.quizzes.models import Quiz, QuizAttempt
+from .dashboard import USER_TYPE_COUNTERS, adjust_counters, invalidate_dashboard_stats, recent_registration_cutoff
+
+User = get_user_model()
+
+# Saves that only touch other fields leave the dashboard counters as they are
+USER_COUNTED_FIELDS = {'user_type', 'date_joined'}
+ACTIVE_COUNTED_FIELDS = {'is_active'}
+
+
+def _user_changes(user, sign):
+    changes = {'users.total': sign}
+    if user.user_type in USER_TYPE_COUNTERS:
+        changes[USER_TYPE_COUNTERS[user.user_type]] = sign
+    if user.date_joined and user.date_joined >= recent_registration_cutoff():
+        changes['users.recent_registrations'] = sign
+    return changes
+
+
+def _active_changes(group, instance, sign):
+    return {f'{group}.total': sign, f'{group}.active': sign if instance.is_active else 0}
+
+
+def _adjust_on_commit(changes):
+    # Rolled back writes never reach the counters
+    transaction.on_commit(lambda: adjust_counters(changes))
+
+
+def _counted_fields_changed(update_fields, counted_fields):
+    return update_fields is None or bool(counted_fields & set(update_fields))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        _adjust_on_commit(_user_changes(instance, 1))
+    elif _counted_fields_changed(update_fields, USER_COUNTED_FIELDS):
+        invalidate_dashboard_stats()
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    _adjust_on_commit(_user_changes(instance, -1))
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Quiz)
+def activatable_saved(sender, instance, created, update_fields=None, **kwargs):
+    group = 'courses' if sender is Course else 'quizzes'
+    if created:
+        _adjust_on_commit(_active_changes(group, instance, 1))
+    elif _counted_fields_changed(update_fields, ACTIVE_COUNTED_FIELDS):
+        invalidate_dashboard_stats()
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Quiz)
+def activatable_deleted(sender, instance, **kwargs):
+    _adjust_on_commit(_active_changes('courses' if sender is Course else 'quizzes', instance, -1))
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_save, sender=QuizAttempt)
+def counted_row_saved(sender, instance, created, **kwargs):
+    if created:
+        _adjust_on_commit({'courses.enrollments' if sender is Enrollment else 'quizzes.attempts': 1})
+
+
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=QuizAttempt)
+def counted_row_deleted(sender, instance, **kwargs):
+    _adjust_on_commit({'courses.enrollments' if sender is Enrollment else 'quizzes.attempts': -1})
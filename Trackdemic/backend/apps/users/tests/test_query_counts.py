@@ -0,0 +1,133 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.courses.models import Category, Course, CourseReview, Enrollment
+from apps.quizzes.leaderboards import rebuild_leaderboards
+from apps.quizzes.models import Answer, Choice, Question, Quiz, QuizAttempt
+from apps.users.models import FacultyProfile, StudentProfile, User
+
+SMALL_SIZE = 2
+LARGE_SIZE = 8
+ATTEMPT_EXPANSIONS = '?expand=quiz,student,answers'
+
+# Every list endpoint, by the role that calls it. Each list holds as many rows as the seeded size.
+LIST_ENDPOINTS = [
+    ('admin', '/api/users/admin/users/'),
+    ('admin', '/api/users/admin/courses/'),
+    ('faculty', '/api/courses/faculty/'),
+    ('faculty', '/api/courses/faculty/{course}/students/'),
+    ('faculty', '/api/courses/faculty/{course}/roster/'),
+    ('faculty', '/api/courses/faculty/{course}/students/{student}/performance/'),
+    ('faculty', '/api/courses/faculty/{course}/students/{student}/attempts/' + ATTEMPT_EXPANSIONS),
+    ('faculty', '/api/quizzes/faculty/'),
+    ('faculty', '/api/quizzes/faculty/{quiz}/attempts/' + ATTEMPT_EXPANSIONS),
+    ('faculty', '/api/quizzes/faculty/students/'),
+    ('student', '/api/courses/'),
+    ('student', '/api/courses/my-enrollments/'),
+    ('student', '/api/courses/{course}/reviews/'),
+    ('student', '/api/quizzes/'),
+    ('student', '/api/quizzes/my-attempts/' + ATTEMPT_EXPANSIONS),
+    ('student', '/api/quizzes/{quiz}/leaderboard/?limit=100'),
+    ('student', '/api/quizzes/course/{course}/leaderboard/?limit=100'),
+]
+
+
+def create_student(index):
+    student = User.objects.create_user(username=f'qc_student{index}', password='qc', user_type='student')
+    StudentProfile.objects.create(user=student, student_id=f'QC-STU{index}')
+    return student
+
+
+def create_quiz(course, index):
+    quiz = Quiz.objects.create(title=f'Quiz {index}', course=course, created_by=course.instructor)
+    for order in range(2):
+        question = Question.objects.create(quiz=quiz, question_text=f'Question {order}', order=order)
+        Choice.objects.create(question=question, choice_text='Right', is_correct=True, order=0)
+        Choice.objects.create(question=question, choice_text='Wrong', order=1)
+    return quiz
+
+
+def take_quiz(student, quiz):
+    attempt = QuizAttempt.objects.create(
+        student=student, quiz=quiz, completed_at=timezone.now(),
+        score=2, percentage=100, is_passed=True, time_taken_minutes=1
+    )
+    for question in quiz.questions.all():
+        Answer.objects.create(
+            attempt=attempt, question=question, selected_choice=question.choices.first(),
+            is_correct=True, points_earned=1
+        )
+
+
+def join_course(student, course):
+    Enrollment.objects.create(student=student, course=course)
+    CourseReview.objects.create(course=course, student=student, rating=5)
+
+
+def add_rows(course, quiz, student, start, stop):
+    """
+    Grow every list to `stop` rows: more students in the course, its reviews
+    and attempts on its first quiz, and for the first student more courses,
+    quizzes and attempts of their own.
+    """
+    for index in range(start, stop):
+        other = create_student(index)
+        join_course(other, course)
+        take_quiz(other, quiz)
+
+        other_course = Course.objects.create(
+            title=f'Course {index}', description='', category=course.category,
+            instructor=course.instructor, duration_hours=1
+        )
+        Enrollment.objects.create(student=student, course=other_course)
+        take_quiz(student, create_quiz(course, index))
+    rebuild_leaderboards()
+
+
+class ListQueryCountTests(TestCase):
+    """Every list endpoint runs the same number of queries however many rows it returns"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='qc_admin', password='qc', user_type='admin')
+        cls.faculty = User.objects.create_user(username='qc_faculty', password='qc', user_type='faculty')
+        FacultyProfile.objects.create(user=cls.faculty, employee_id='QC-FAC', department='General')
+        cls.course = Course.objects.create(
+            title='Course 0', description='', category=Category.objects.create(name='Query counts'),
+            instructor=cls.faculty, duration_hours=1
+        )
+        cls.quiz = create_quiz(cls.course, 0)
+        cls.student = create_student(0)
+        join_course(cls.student, cls.course)
+        take_quiz(cls.student, cls.quiz)
+        add_rows(cls.course, cls.quiz, cls.student, 1, SMALL_SIZE)
+
+    def setUp(self):
+        self.clients = {}
+        for role, user in (('admin', self.admin), ('faculty', self.faculty), ('student', self.student)):
+            self.clients[role] = APIClient()
+            self.clients[role].force_authenticate(user)
+
+    def count_queries(self):
+        """Fetch each endpoint with a cold cache, returning its query count by URL"""
+        ids = {'course': self.course.id, 'quiz': self.quiz.id, 'student': self.student.id}
+        counts = {}
+        for role, url in LIST_ENDPOINTS:
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.clients[role].get(url.format(**ids))
+            self.assertEqual(response.status_code, 200, f'{url} as {role}')
+            counts[url] = len(queries)
+        return counts
+
+    def test_list_query_counts_do_not_grow_with_rows(self):
+        small = self.count_queries()
+        add_rows(self.course, self.quiz, self.student, SMALL_SIZE, LARGE_SIZE)
+        large = self.count_queries()
+        for _, url in LIST_ENDPOINTS:
+            with self.subTest(url=url):
+                self.assertEqual(large[url], small[url])
@@ -6,6 +6,7 @@ urlpatterns = [
     # Admin endpoints
     path('admin/dashboard-stats/', views.admin_dashboard_stats, name='admin_dashboard_stats'),
     path('admin/users/', views.admin_users_list, name='admin_users_list'),
+    path('admin/users/bulk-provision/', views.admin_bulk_provision_users, name='admin_bulk_provision_users'),
     path('admin/users/<int:user_id>/', views.admin_update_user, name='admin_update_user'),
     path('admin/users/<int:user_id>/delete/', views.admin_delete_user, name='admin_delete_user'),
     path('admin/courses/', views.admin_all_courses, name='admin_all_courses'),
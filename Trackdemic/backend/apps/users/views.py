@@ -1,93 +1,92 @@
+import csv
+import json
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from django.db.models import Count, Q
-from django.utils import timezone
-from datetime import timedelta
+from django.http import StreamingHttpResponse
+from .dashboard import USER_TYPE_COUNTERS, get_dashboard_stats
+from .pagination import AdminUserCursorPagination
+from .provisioning import REQUEST_WORKERS, ProvisioningError, provision_users, read_user_rows
+from .search import search_users
 from .serializers import UserSerializer, StudentProfileSerializer, FacultyProfileSerializer, FacultyProfileUpdateSerializer
-from apps.users.models import FacultyProfile
+from apps.users.models import FacultyProfile, profile_lookups
 
 User = get_user_model()
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_dashboard_stats(request):
-    """Get admin dashboard statistics"""
+    """Get admin dashboard statistics from the periodically refreshed snapshot"""
     if request.user.user_type != 'admin' and not request.user.is_superuser:
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
-    # User statistics
-    total_users = User.objects.count()
-    total_students = User.objects.filter(user_type='student').count()
-    total_faculty = User.objects.filter(user_type='faculty').count()
-    total_admins = User.objects.filter(user_type='admin').count()
-    
-    # Recent registrations (last 30 days)
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    recent_registrations = User.objects.filter(date_joined__gte=thirty_days_ago).count()
-    
-    # Course statistics
-    from apps.courses.models import Course, Enrollment
-    total_courses = Course.objects.count()
-    active_courses = Course.objects.filter(is_active=True).count()
-    total_enrollments = Enrollment.objects.count()
-    
-    # Quiz statistics
-    from apps.quizzes.models import Quiz, QuizAttempt
-    total_quizzes = Quiz.objects.count()
-    active_quizzes = Quiz.objects.filter(is_active=True).count()
-    total_quiz_attempts = QuizAttempt.objects.count()
-    
-    stats = {
-        'users': {
-            'total': total_users,
-            'students': total_students,
-            'faculty': total_faculty,
-            'admins': total_admins,
-            'recent_registrations': recent_registrations
-        },
-        'courses': {
-            'total': total_courses,
-            'active': active_courses,
-            'enrollments': total_enrollments
-        },
-        'quizzes': {
-            'total': total_quizzes,
-            'active': active_quizzes,
-            'attempts': total_quiz_attempts
-        }
-    }
-    
-    return Response(stats)
+    return Response(get_dashboard_stats())
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_users_list(request):
-    """Get all users for admin management"""
+    """Get a keyset-paginated page of users for admin management, with counts per user type"""
     if request.user.user_type != 'admin' and not request.user.is_superuser:
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
     user_type = request.GET.get('user_type', '')
     search = request.GET.get('search', '')
     
-    users = User.objects.all()
+    users = search_users(User.objects.all(), search)
+    
+    # Facets ignore the type filter so every tab shows its count; unsearched counts come from the dashboard snapshot.
+    # A conditional aggregate rather than GROUP BY keeps the planner on the search indexes
+    if search.strip():
+        facets = users.aggregate(**{value: Count('id', filter=Q(user_type=value)) for value, _ in User.USER_TYPES})
+    else:
+        counts = get_dashboard_stats()['users']
+        facets = {user_type: counts[counter.split('.')[1]] for user_type, counter in USER_TYPE_COUNTERS.items()}
     
     if user_type:
         users = users.filter(user_type=user_type)
     
-    if search:
-        users = users.filter(
-            Q(username__icontains=search) |
-            Q(email__icontains=search) |
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search)
-        )
+    users = users.with_profiles()
+    paginator = AdminUserCursorPagination()
+    page = paginator.paginate_queryset(users, request)
+    response = paginator.get_paginated_response(UserSerializer(page, many=True).data)
+    response.data['facets'] = {value: facets[value] for value, _ in User.USER_TYPES}
+    return response
+
+def _progress_lines(updates):
+    """Provisioning updates as JSON lines; a file that turns out unreadable part way ends the stream with an error"""
+    try:
+        for update in updates:
+            yield json.dumps(update) + '\n'
+    except (UnicodeDecodeError, csv.Error) as e:
+        yield json.dumps({'done': True, 'error': f'Could not read the file: {e}'}) + '\n'
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def admin_bulk_provision_users(request):
+    """Create many students and faculty from a CSV file or a JSON list, streaming progress as JSON lines"""
+    if request.user.user_type != 'admin' and not request.user.is_superuser:
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
-    users = users.order_by('-date_joined')
-    serializer = UserSerializer(users, many=True)
-    return Response({'results': serializer.data})
+    upload = request.FILES.get('file')
+    if upload is not None:
+        try:
+            rows = read_user_rows(upload.file)
+        except (ProvisioningError, UnicodeDecodeError, csv.Error) as e:
+            return Response({'error': f'Could not read the file: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+    elif isinstance(request.data.get('users'), list):
+        rows = enumerate(request.data['users'], start=1)
+    else:
+        return Response({'error': 'Provide a CSV file or a "users" list'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+    return StreamingHttpResponse(
+        _progress_lines(provision_users(rows, workers=REQUEST_WORKERS, dry_run=dry_run)),
+        content_type='application/x-ndjson'
+    )
 
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
@@ -97,7 +96,7 @@ def admin_update_user(request, user_id):
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
-        user = User.objects.get(id=user_id)
+        user = User.objects.with_profiles().get(id=user_id)
         serializer = UserSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -131,10 +130,10 @@ def admin_all_courses(request):
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
     from apps.courses.models import Course
-    from apps.courses.serializers import CourseSerializer
+    from apps.courses.serializers import CourseListSerializer
     
-    courses = Course.objects.all().order_by('-created_at')
-    serializer = CourseSerializer(courses, many=True)
+    courses = Course.objects.with_list_stats().order_by('-created_at')
+    serializer = CourseListSerializer(courses, many=True)
     return Response({'results': serializer.data})
 
 @api_view(['PUT'])
@@ -150,8 +149,8 @@ def admin_update_course_status(request, course_id):
         course.is_active = request.data.get('is_active', course.is_active)
         course.save()
         
-        from apps.courses.serializers import CourseSerializer
-        serializer = CourseSerializer(course)
+        from apps.courses.serializers import CourseListSerializer
+        serializer = CourseListSerializer(course)
         return Response(serializer.data)
     except Course.DoesNotExist:
         return Response({'error': 'Course not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -165,7 +164,7 @@ def get_faculty_profile(request):
         return Response({'error': 'Faculty access required'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
-        faculty_profile = FacultyProfile.objects.get(user=request.user)
+        faculty_profile = FacultyProfile.objects.select_related(*profile_lookups('user')).get(user=request.user)
         serializer = FacultyProfileSerializer(faculty_profile)
         return Response(serializer.data)
     except FacultyProfile.DoesNotExist:
@@ -232,7 +231,7 @@ def update_faculty_profile(request):
                 return Response(faculty_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         # Return updated data
-        updated_profile = FacultyProfile.objects.get(user=request.user)
+        updated_profile = FacultyProfile.objects.select_related(*profile_lookups('user')).get(user=request.user)
         serializer = FacultyProfileSerializer(updated_profile)
         return Response(serializer.data)
         
@@ -152,3 +152,20 @@ OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 
 # ML Service Configuration
 ML_SERVICE_URL = config('ML_SERVICE_URL', default='http://localhost:5001')
+
+# Learning-time heartbeats are summed in memory and written out at most this often
+HEARTBEAT_FLUSH_INTERVAL_SECONDS = config('HEARTBEAT_FLUSH_INTERVAL_SECONDS', default=60, cast=int)
+
+# Autosaves of one quiz attempt are written at most this often; earlier ones get a 429 and are retried
+QUIZ_AUTOSAVE_MIN_INTERVAL_SECONDS = config('QUIZ_AUTOSAVE_MIN_INTERVAL_SECONDS', default=3, cast=int)
+
+# Open quiz attempts are graded and closed this long after their time limit runs out
+QUIZ_EXPIRY_GRACE_SECONDS = config('QUIZ_EXPIRY_GRACE_SECONDS', default=120, cast=int)
+
+# Admin dashboard counts are served from a snapshot recomputed this often; with live counters
+# enabled, creates and deletes also adjust the snapshot in between
+ADMIN_STATS_REFRESH_SECONDS = config('ADMIN_STATS_REFRESH_SECONDS', default=300, cast=int)
+ADMIN_STATS_LIVE_COUNTERS = config('ADMIN_STATS_LIVE_COUNTERS', default=False, cast=bool)
+
+# Password hashing processes per bulk provisioning request; the provision_users command uses every core
+USER_PROVISIONING_REQUEST_WORKERS = config('USER_PROVISIONING_REQUEST_WORKERS', default=1, cast=int)
@@ -0,0 +1,85 @@
+"use client"
+
+import { useState, useEffect } from "react"
+import { quizAPI } from "../services/api"
+
+// Shows the top of a quiz or course leaderboard, plus the viewer's own rank when it falls outside it
+const Leaderboard = ({ quizId, courseId, limit = 10, title = "Leaderboard" }) => {
+  const [board, setBoard] = useState(null)
+  const [loading, setLoading] = useState(true)
+  const isCourse = Boolean(courseId)
+
+  useEffect(() => {
+    const fetchLeaderboard = async () => {
+      try {
+        const response = isCourse
+          ? await quizAPI.getCourseLeaderboard(courseId, { limit })
+          : await quizAPI.getQuizLeaderboard(quizId, { limit })
+        setBoard(response.data)
+      } catch (error) {
+        console.error("Failed to fetch leaderboard:", error)
+      } finally {
+        setLoading(false)
+      }
+    }
+
+    fetchLeaderboard()
+  }, [quizId, courseId, limit, isCourse])
+
+  const score = (entry) =>
+    isCourse
+      ? `${Math.round(entry.total_percentage)} (${entry.quizzes_completed} quiz${entry.quizzes_completed !== 1 ? "zes" : ""})`
+      : `${Math.round(entry.percentage)}%`
+  const time = (entry) => `${Math.round(isCourse ? entry.total_time_minutes : entry.time_taken_minutes)} min`
+
+  const renderRow = (entry, highlight) => (
+    <tr key={entry.student_id} className={highlight ? "table-primary" : ""}>
+      <td>#{entry.rank}</td>
+      <td>{entry.student_name || `Student ${entry.student_id}`}</td>
+      <td>{score(entry)}</td>
+      <td>{time(entry)}</td>
+    </tr>
+  )
+
+  const me = board?.me
+  const meInTop = me && board.results.some((entry) => entry.student_id === me.student_id)
+
+  return (
+    <div className="card">
+      <div className="card-header">
+        <h5 className="mb-0">
+          <i className="fas fa-trophy me-2 text-warning"></i>
+          {title}
+        </h5>
+      </div>
+      <div className="card-body p-0">
+        {loading ? (
+          <div className="text-center py-3">
+            <div className="spinner-border spinner-border-sm text-primary" role="status">
+              <span className="visually-hidden">Loading...</span>
+            </div>
+          </div>
+        ) : !board || board.results.length === 0 ? (
+          <p className="text-muted text-center py-3 mb-0">No completed attempts yet</p>
+        ) : (
+          <table className="table table-sm mb-0">
+            <thead>
+              <tr>
+                <th>Rank</th>
+                <th>Student</th>
+                <th>{isCourse ? "Total Score" : "Best Score"}</th>
+                <th>Time</th>
+              </tr>
+            </thead>
+            <tbody>
+              {board.results.map((entry) => renderRow(entry, me && entry.student_id === me.student_id))}
+              {me && !meInTop && renderRow(me, true)}
+            </tbody>
+          </table>
+        )}
+      </div>
+    </div>
+  )
+}
+
+export default Leaderboard
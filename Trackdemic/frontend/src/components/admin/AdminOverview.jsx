@@ -15,7 +15,12 @@ const AdminOverview = ({ stats, loading }) => {
 
   return (
     <div>
-      <h2 className="mb-4">Admin Dashboard Overview</h2>
+      <div className="d-flex justify-content-between align-items-baseline mb-4">
+        <h2 className="mb-0">Admin Dashboard Overview</h2>
+        {stats.computed_at && (
+          <small className="text-muted">Updated {new Date(stats.computed_at).toLocaleString()}</small>
+        )}
+      </div>
 
       {/* User Statistics */}
       <div className="row mb-4">
@@ -11,16 +11,27 @@ const UserManagement = () => {
     search: "",
   })
   const [editingUser, setEditingUser] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [facets, setFacets] = useState({})
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [provisionFile, setProvisionFile] = useState(null)
+  const [provisionProgress, setProvisionProgress] = useState(null)
+  const [provisioning, setProvisioning] = useState(false)
 
   useEffect(() => {
     fetchUsers()
   }, [filters])
 
+  // The API pages by cursor; the cursor for the next page is carried in the "next" URL
+  const cursorFrom = (url) => (url ? new URL(url, window.location.origin).searchParams.get("cursor") : null)
+
   const fetchUsers = async () => {
     try {
       setLoading(true)
       const response = await adminAPI.getUsers(filters)
       setUsers(response.data.results || [])
+      setFacets(response.data.facets || {})
+      setNextCursor(cursorFrom(response.data.next))
     } catch (error) {
       console.error("Failed to fetch users:", error)
     } finally {
@@ -28,11 +39,53 @@ const UserManagement = () => {
     }
   }
 
+  const loadMoreUsers = async () => {
+    try {
+      setLoadingMore(true)
+      const response = await adminAPI.getUsers({ ...filters, cursor: nextCursor })
+      setUsers((prev) => [...prev, ...(response.data.results || [])])
+      setNextCursor(cursorFrom(response.data.next))
+    } catch (error) {
+      console.error("Failed to fetch more users:", error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  const facetTotal = Object.keys(facets).length ? Object.values(facets).reduce((sum, count) => sum + count, 0) : undefined
+  const withCount = (label, count) => (count === undefined ? label : `${label} (${count})`)
+
   const handleFilterChange = (e) => {
     const { name, value } = e.target
     setFilters((prev) => ({ ...prev, [name]: value }))
   }
 
+  const handleBulkProvision = async (e) => {
+    e.preventDefault()
+    if (!provisionFile) return
+    const formData = new FormData()
+    formData.append("file", provisionFile)
+    try {
+      setProvisioning(true)
+      setProvisionProgress(null)
+      const response = await adminAPI.bulkProvisionUsers(formData, setProvisionProgress)
+      const lines = response.data.trim().split("\n")
+      setProvisionProgress(JSON.parse(lines[lines.length - 1]))
+      fetchUsers()
+    } catch (error) {
+      console.error("Failed to provision users:", error)
+      let message = "Failed to provision users. Please try again."
+      try {
+        message = JSON.parse(error.response?.data).error || message
+      } catch {
+        // Not a JSON error body
+      }
+      alert(message)
+    } finally {
+      setProvisioning(false)
+    }
+  }
+
   const handleEditUser = (user) => {
     setEditingUser({ ...user })
   }
@@ -90,10 +143,10 @@ const UserManagement = () => {
             <div className="col-md-4">
               <label className="form-label">User Type</label>
               <select className="form-select" name="user_type" value={filters.user_type} onChange={handleFilterChange}>
-                <option value="">All Users</option>
-                <option value="student">Students</option>
-                <option value="faculty">Faculty</option>
-                <option value="admin">Admins</option>
+                <option value="">{withCount("All Users", facetTotal)}</option>
+                <option value="student">{withCount("Students", facets.student)}</option>
+                <option value="faculty">{withCount("Faculty", facets.faculty)}</option>
+                <option value="admin">{withCount("Admins", facets.admin)}</option>
               </select>
             </div>
             <div className="col-md-8">
@@ -104,13 +157,55 @@ const UserManagement = () => {
                 name="search"
                 value={filters.search}
                 onChange={handleFilterChange}
-                placeholder="Search by name, email, or username..."
+                placeholder="Search by the start of a name, email, or username..."
               />
             </div>
           </div>
         </div>
       </div>
 
+      {/* Bulk Provisioning */}
+      <div className="card mb-4">
+        <div className="card-body">
+          <h5 className="card-title">Bulk Provision Users</h5>
+          <p className="text-muted small">
+            CSV with username, password, email, first_name, last_name and user_type (student or faculty) columns, plus
+            grade_level for students and department for faculty.
+          </p>
+          <form className="d-flex gap-2" onSubmit={handleBulkProvision}>
+            <input
+              type="file"
+              className="form-control"
+              accept=".csv"
+              onChange={(e) => setProvisionFile(e.target.files[0] || null)}
+            />
+            <button type="submit" className="btn btn-primary" disabled={!provisionFile || provisioning}>
+              {provisioning ? "Provisioning..." : "Provision"}
+            </button>
+          </form>
+          {provisionProgress && (
+            <div className="mt-3">
+              {provisionProgress.processed !== undefined && (
+                <p className="mb-1">
+                  {provisionProgress.processed} rows read, {provisionProgress.created} created,{" "}
+                  {provisionProgress.failed} failed
+                </p>
+              )}
+              {provisionProgress.error && <div className="alert alert-danger py-2">{provisionProgress.error}</div>}
+              {provisionProgress.errors?.length > 0 && (
+                <ul className="small text-danger mb-0">
+                  {provisionProgress.errors.slice(0, 20).map((error) => (
+                    <li key={error.row}>
+                      Row {error.row}: {error.errors.join("; ")}
+                    </li>
+                  ))}
+                </ul>
+              )}
+            </div>
+          )}
+        </div>
+      </div>
+
       {/* Users Table */}
       <div className="card">
         <div className="card-body">
@@ -177,6 +272,13 @@ const UserManagement = () => {
                   <p className="text-muted">No users found matching your criteria.</p>
                 </div>
               )}
+              {nextCursor && (
+                <div className="text-center">
+                  <button className="btn btn-outline-secondary" onClick={loadMoreUsers} disabled={loadingMore}>
+                    {loadingMore ? "Loading..." : "Load more"}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -4,6 +4,7 @@ import { useState, useEffect } from "react"
 import { useParams, useNavigate } from "react-router-dom"
 import { facultyAPI } from "../../services/api"
 import { toast } from "react-toastify"
+import Leaderboard from "../Leaderboard"
 
 const CourseStudents = () => {
   const { courseId } = useParams()
@@ -17,9 +18,12 @@ const CourseStudents = () => {
 
   useEffect(() => {
     fetchCourseData()
-    fetchAllStudents()
   }, [courseId])
 
+  useEffect(() => {
+    fetchAllStudents()
+  }, [searchTerm])
+
   const fetchCourseData = async () => {
     try {
       const [courseResponse, studentsResponse] = await Promise.all([
@@ -37,10 +41,24 @@ const CourseStudents = () => {
     }
   }
 
+  const handleExportGradebook = async (fileFormat) => {
+    try {
+      const response = await facultyAPI.exportCourseGradebook(courseId, fileFormat)
+      const url = window.URL.createObjectURL(response.data)
+      const link = document.createElement("a")
+      link.href = url
+      link.download = `course-${courseId}-gradebook.${fileFormat}`
+      link.click()
+      window.URL.revokeObjectURL(url)
+    } catch (error) {
+      toast.error("Failed to export gradebook")
+    }
+  }
+
   const fetchAllStudents = async () => {
     try {
-      const response = await facultyAPI.getStudentsList()
-      setAllStudents(response.data)
+      const response = await facultyAPI.getStudentsList(searchTerm ? { search: searchTerm } : {})
+      setAllStudents(response.data.results || [])
     } catch (error) {
       console.error("Failed to fetch students list:", error)
     }
@@ -74,12 +92,7 @@ const CourseStudents = () => {
   }
 
   const filteredAllStudents = allStudents.filter(
-    (student) =>
-      !students.some((enrolled) => enrolled.student.id === student.id) &&
-      (student.first_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        student.last_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        student.username.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        student.email.toLowerCase().includes(searchTerm.toLowerCase())),
+    (student) => !students.some((enrolled) => enrolled.student.id === student.id),
   )
 
   if (loading) {
@@ -100,6 +113,16 @@ const CourseStudents = () => {
           <p className="text-muted">{course?.title}</p>
         </div>
         <div className="d-flex gap-2">
+          <div className="btn-group">
+            <button className="btn btn-outline-success" onClick={() => handleExportGradebook("csv")}>
+              <i className="fas fa-file-csv me-2"></i>
+              Gradebook CSV
+            </button>
+            <button className="btn btn-outline-success" onClick={() => handleExportGradebook("xlsx")}>
+              <i className="fas fa-file-excel me-2"></i>
+              XLSX
+            </button>
+          </div>
           <button className="btn btn-primary" onClick={() => setShowAddModal(true)}>
             <i className="fas fa-plus me-2"></i>
             Add Student
@@ -111,6 +134,10 @@ const CourseStudents = () => {
         </div>
       </div>
 
+      <div className="mb-4">
+        <Leaderboard courseId={courseId} title="Course Leaderboard" />
+      </div>
+
       {/* Students List */}
       <div className="card">
         <div className="card-header">
@@ -18,12 +18,16 @@ const CreateQuiz = () => {
     time_limit_minutes: 30,
     max_attempts: 3,
     passing_score: 70,
+    pool_size: "",
+    pool_stratify_by: "",
   })
   const [questions, setQuestions] = useState([
     {
       question_text: "",
       question_type: "multiple_choice",
       points: 1,
+      topic: "",
+      answer_tolerance: 0,
       choices: [
         { choice_text: "", is_correct: false },
         { choice_text: "", is_correct: false },
@@ -108,6 +112,8 @@ const CreateQuiz = () => {
         question_text: "",
         question_type: "multiple_choice",
         points: 1,
+        topic: "",
+        answer_tolerance: 0,
         choices: [
           { choice_text: "", is_correct: false },
           { choice_text: "", is_correct: false },
@@ -175,6 +181,7 @@ const CreateQuiz = () => {
 
       const quizData = {
         ...formData,
+        pool_size: formData.pool_size === "" ? null : Number.parseInt(formData.pool_size),
         questions: questions.map((question, index) => ({
           ...question,
           order: index + 1,
@@ -345,6 +352,43 @@ const CreateQuiz = () => {
                 />
               </div>
             </div>
+
+            <div className="row">
+              <div className="col-md-6 mb-3">
+                <label htmlFor="pool_size" className="form-label">
+                  Questions per Attempt
+                </label>
+                <input
+                  type="number"
+                  className="form-control"
+                  id="pool_size"
+                  name="pool_size"
+                  value={formData.pool_size}
+                  onChange={handleChange}
+                  min="1"
+                  placeholder={`All (${questions.length})`}
+                />
+                <div className="form-text">Draw a random subset of the questions for each attempt</div>
+              </div>
+
+              <div className="col-md-6 mb-3">
+                <label htmlFor="pool_stratify_by" className="form-label">
+                  Balance Drawn Questions By
+                </label>
+                <select
+                  className="form-select"
+                  id="pool_stratify_by"
+                  name="pool_stratify_by"
+                  value={formData.pool_stratify_by}
+                  onChange={handleChange}
+                  disabled={!formData.pool_size}
+                >
+                  <option value="">Nothing (simple random)</option>
+                  <option value="points">Points</option>
+                  <option value="topic">Topic</option>
+                </select>
+              </div>
+            </div>
           </div>
         </div>
 
@@ -374,7 +418,7 @@ const CreateQuiz = () => {
                 </div>
 
                 <div className="row mb-3">
-                  <div className="col-md-8">
+                  <div className="col-md-6">
                     <label className="form-label">Question Text *</label>
                     <textarea
                       className="form-control"
@@ -406,6 +450,16 @@ const CreateQuiz = () => {
                       min="1"
                     />
                   </div>
+                  <div className="col-md-2">
+                    <label className="form-label">Topic</label>
+                    <input
+                      type="text"
+                      className="form-control"
+                      value={question.topic}
+                      onChange={(e) => handleQuestionChange(questionIndex, "topic", e.target.value)}
+                      maxLength="100"
+                    />
+                  </div>
                 </div>
 
                 {question.question_type !== "short_answer" ? (
@@ -488,6 +542,21 @@ const CreateQuiz = () => {
                         Add Answer
                       </button>
                     </div>
+                    <div className="d-flex align-items-center mb-2">
+                      <label className="form-label mb-0 me-2">Allowed typos</label>
+                      <input
+                        type="number"
+                        className="form-control form-control-sm"
+                        style={{ width: "80px" }}
+                        value={question.answer_tolerance}
+                        onChange={(e) =>
+                          handleQuestionChange(questionIndex, "answer_tolerance", Number.parseInt(e.target.value) || 0)
+                        }
+                        min="0"
+                        max="5"
+                      />
+                      <small className="text-muted ms-2">Answers this many letters off still count as correct</small>
+                    </div>
                     {question.choices.map((choice, choiceIndex) => (
                       <div key={choiceIndex} className="d-flex align-items-center mb-2">
                         <div className="form-check me-2">
@@ -20,9 +20,12 @@ const EditQuiz = () => {
     time_limit_minutes: 30,
     max_attempts: 3,
     passing_score: 70,
+    pool_size: "",
+    pool_stratify_by: "",
     is_active: true,
   })
   const [questions, setQuestions] = useState([])
+  const [importing, setImporting] = useState(false)
 
   useEffect(() => {
     fetchMyCourses()
@@ -52,6 +55,8 @@ const EditQuiz = () => {
         time_limit_minutes: quiz.time_limit_minutes,
         max_attempts: quiz.max_attempts,
         passing_score: quiz.passing_score,
+        pool_size: quiz.pool_size ?? "",
+        pool_stratify_by: quiz.pool_stratify_by || "",
         is_active: quiz.is_active,
       })
 
@@ -61,6 +66,8 @@ const EditQuiz = () => {
         question_text: q.question_text,
         question_type: q.question_type,
         points: q.points,
+        topic: q.topic || "",
+        answer_tolerance: q.answer_tolerance ?? 0,
         order: q.order,
         choices: q.choices?.map(c => ({
           id: c.id,
@@ -78,6 +85,34 @@ const EditQuiz = () => {
     }
   }
 
+  const handleImportQuestions = async (e) => {
+    const file = e.target.files[0]
+    e.target.value = ""
+    if (!file) return
+
+    setImporting(true)
+    try {
+      const formData = new FormData()
+      formData.append("file", file)
+      const response = await facultyAPI.importQuizQuestions(quizId, formData)
+      const { imported, failed, errors } = response.data
+      toast.success(`Imported ${imported} question${imported !== 1 ? "s" : ""}`)
+      if (failed > 0) {
+        const firstErrors = errors
+          .slice(0, 3)
+          .map((error) => `Row ${error.row}: ${error.errors.join(", ")}`)
+          .join("\n")
+        toast.warning(`${failed} row${failed !== 1 ? "s" : ""} skipped\n${firstErrors}`)
+      }
+      // Reload so the imported questions carry their IDs into the next save
+      await fetchQuiz()
+    } catch (error) {
+      toast.error(error.response?.data?.error || "Failed to import questions")
+    } finally {
+      setImporting(false)
+    }
+  }
+
   const handleInputChange = (e) => {
     const { name, value, type, checked } = e.target
     setFormData((prev) => ({
@@ -137,6 +172,8 @@ const EditQuiz = () => {
         question_text: "",
         question_type: "multiple_choice",
         points: 1,
+        topic: "",
+        answer_tolerance: 0,
         order: questions.length + 1,
         choices: [
           { choice_text: "", is_correct: false, order: 0 },
@@ -203,6 +240,7 @@ const EditQuiz = () => {
 
       const quizData = {
         ...formData,
+        pool_size: formData.pool_size === "" ? null : Number.parseInt(formData.pool_size),
         questions: questions.map((question, index) => ({
           ...question,
           order: index + 1,
@@ -351,6 +389,37 @@ const EditQuiz = () => {
                       />
                     </div>
                   </div>
+                  <div className="col-md-4">
+                    <div className="mb-3">
+                      <label className="form-label">Questions per Attempt</label>
+                      <input
+                        type="number"
+                        className="form-control"
+                        name="pool_size"
+                        value={formData.pool_size}
+                        onChange={handleInputChange}
+                        min="1"
+                        placeholder={`All (${questions.length})`}
+                      />
+                      <div className="form-text">Draw a random subset of the questions for each attempt</div>
+                    </div>
+                  </div>
+                  <div className="col-md-4">
+                    <div className="mb-3">
+                      <label className="form-label">Balance Drawn Questions By</label>
+                      <select
+                        className="form-select"
+                        name="pool_stratify_by"
+                        value={formData.pool_stratify_by}
+                        onChange={handleInputChange}
+                        disabled={!formData.pool_size}
+                      >
+                        <option value="">Nothing (simple random)</option>
+                        <option value="points">Points</option>
+                        <option value="topic">Topic</option>
+                      </select>
+                    </div>
+                  </div>
                   <div className="col-md-4">
                     <div className="mb-3">
                       <div className="form-check mt-4">
@@ -382,10 +451,23 @@ const EditQuiz = () => {
 
                 <div className="d-flex justify-content-between align-items-center mb-3">
                   <h4>Questions ({questions.length})</h4>
-                  <button type="button" className="btn btn-primary" onClick={addQuestion}>
-                    <i className="fas fa-plus me-1"></i>
-                    Add Question
-                  </button>
+                  <div>
+                    <label className={`btn btn-outline-secondary me-2 ${importing ? "disabled" : ""}`}>
+                      <i className="fas fa-file-import me-1"></i>
+                      {importing ? "Importing..." : "Import Questions"}
+                      <input
+                        type="file"
+                        accept=".json,.ndjson,.jsonl,.csv"
+                        hidden
+                        disabled={importing}
+                        onChange={handleImportQuestions}
+                      />
+                    </label>
+                    <button type="button" className="btn btn-primary" onClick={addQuestion}>
+                      <i className="fas fa-plus me-1"></i>
+                      Add Question
+                    </button>
+                  </div>
                 </div>
 
                 {questions.map((question, questionIndex) => (
@@ -405,7 +487,7 @@ const EditQuiz = () => {
                       </div>
 
                       <div className="row mb-3">
-                        <div className="col-md-8">
+                        <div className="col-md-6">
                           <div className="mb-3">
                             <label className="form-label">Question Text *</label>
                             <textarea
@@ -445,6 +527,18 @@ const EditQuiz = () => {
                             />
                           </div>
                         </div>
+                        <div className="col-md-2">
+                          <div className="mb-3">
+                            <label className="form-label">Topic</label>
+                            <input
+                              type="text"
+                              className="form-control"
+                              value={question.topic}
+                              onChange={(e) => handleQuestionChange(questionIndex, "topic", e.target.value)}
+                              maxLength="100"
+                            />
+                          </div>
+                        </div>
                       </div>
 
                       {question.question_type !== "short_answer" ? (
@@ -522,6 +616,21 @@ const EditQuiz = () => {
                               Add Answer
                             </button>
                           </div>
+                          <div className="d-flex align-items-center mb-2">
+                            <label className="form-label mb-0 me-2">Allowed typos</label>
+                            <input
+                              type="number"
+                              className="form-control form-control-sm"
+                              style={{ width: "80px" }}
+                              value={question.answer_tolerance}
+                              onChange={(e) =>
+                                handleQuestionChange(questionIndex, "answer_tolerance", Number.parseInt(e.target.value) || 0)
+                              }
+                              min="0"
+                              max="5"
+                            />
+                            <small className="text-muted ms-2">Answers this many letters off still count as correct</small>
+                          </div>
                           {question.choices.map((choice, choiceIndex) => (
                             <div key={choiceIndex} className="d-flex align-items-center mb-2">
                               <div className="form-check me-2">
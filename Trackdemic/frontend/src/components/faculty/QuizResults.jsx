@@ -4,29 +4,39 @@ import { useState, useEffect } from "react"
 import { useParams, useNavigate } from "react-router-dom"
 import { facultyAPI } from "../../services/api"
 import { toast } from "react-toastify"
+import Leaderboard from "../Leaderboard"
 
 const QuizResults = () => {
   const { quizId } = useParams()
   const navigate = useNavigate()
   const [quiz, setQuiz] = useState(null)
   const [attempts, setAttempts] = useState([])
+  const [analysis, setAnalysis] = useState(null)
   const [loading, setLoading] = useState(true)
   const [selectedAttempt, setSelectedAttempt] = useState(null)
   const [showDetails, setShowDetails] = useState(false)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     fetchQuizData()
   }, [quizId])
 
+  // The API pages by cursor; the cursor for the next page is carried in the "next" URL
+  const cursorFrom = (url) => (url ? new URL(url, window.location.origin).searchParams.get("cursor") : null)
+
   const fetchQuizData = async () => {
     try {
-      const [quizResponse, attemptsResponse] = await Promise.all([
+      const [quizResponse, attemptsResponse, analysisResponse] = await Promise.all([
         facultyAPI.getQuiz(quizId),
-        facultyAPI.getQuizAttempts(quizId),
+        facultyAPI.getQuizAttempts(quizId, { expand: "student" }),
+        facultyAPI.getQuizItemAnalysis(quizId),
       ])
 
       setQuiz(quizResponse.data)
-      setAttempts(attemptsResponse.data || [])
+      setAttempts(attemptsResponse.data.results || [])
+      setNextCursor(cursorFrom(attemptsResponse.data.next))
+      setAnalysis(analysisResponse.data)
     } catch (error) {
       console.error("Failed to fetch quiz data:", error)
       toast.error("Failed to load quiz data")
@@ -35,9 +45,28 @@ const QuizResults = () => {
     }
   }
 
-  const viewAttemptDetails = (attempt) => {
-    setSelectedAttempt(attempt)
-    setShowDetails(true)
+  const loadMoreAttempts = async () => {
+    try {
+      setLoadingMore(true)
+      const response = await facultyAPI.getQuizAttempts(quizId, { expand: "student", cursor: nextCursor })
+      setAttempts((prev) => [...prev, ...(response.data.results || [])])
+      setNextCursor(cursorFrom(response.data.next))
+    } catch (error) {
+      console.error("Failed to fetch more attempts:", error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  const viewAttemptDetails = async (attempt) => {
+    try {
+      const response = await facultyAPI.getQuizAttempt(quizId, attempt.id)
+      setSelectedAttempt(response.data)
+      setShowDetails(true)
+    } catch (error) {
+      console.error("Failed to fetch attempt details:", error)
+      toast.error("Failed to load attempt details")
+    }
   }
 
   const getScoreColor = (percentage) => {
@@ -91,7 +120,7 @@ const QuizResults = () => {
         <div className="col-md-3">
           <div className="card text-center">
             <div className="card-body">
-              <h5 className="card-title text-primary">{attempts.length}</h5>
+              <h5 className="card-title text-primary">{analysis?.summary.total_attempts ?? 0}</h5>
               <p className="card-text">Total Attempts</p>
             </div>
           </div>
@@ -100,7 +129,7 @@ const QuizResults = () => {
           <div className="card text-center">
             <div className="card-body">
               <h5 className="card-title text-success">
-                {attempts.filter(a => a.is_passed).length}
+                {analysis?.summary.passed ?? 0}
               </h5>
               <p className="card-text">Passed</p>
             </div>
@@ -110,7 +139,7 @@ const QuizResults = () => {
           <div className="card text-center">
             <div className="card-body">
               <h5 className="card-title text-warning">
-                {attempts.filter(a => !a.is_passed && a.completed_at).length}
+                {analysis?.summary.failed ?? 0}
               </h5>
               <p className="card-text">Failed</p>
             </div>
@@ -120,7 +149,7 @@ const QuizResults = () => {
           <div className="card text-center">
             <div className="card-body">
               <h5 className="card-title text-info">
-                {attempts.filter(a => !a.completed_at).length}
+                {analysis?.summary.in_progress ?? 0}
               </h5>
               <p className="card-text">In Progress</p>
             </div>
@@ -128,6 +157,61 @@ const QuizResults = () => {
         </div>
       </div>
 
+      <div className="mb-4">
+        <Leaderboard quizId={quizId} />
+      </div>
+
+      {/* Item Analysis */}
+      {analysis && analysis.questions.length > 0 && (
+        <div className="card mb-4">
+          <div className="card-header">
+            <h5 className="mb-0">Item Analysis</h5>
+          </div>
+          <div className="card-body">
+            <div className="table-responsive">
+              <table className="table table-sm">
+                <thead>
+                  <tr>
+                    <th>Question</th>
+                    <th>Attempts</th>
+                    <th>Correct</th>
+                    <th>Discrimination</th>
+                    <th>Choice Distribution</th>
+                  </tr>
+                </thead>
+                <tbody>
+                  {analysis.questions.map((question, index) => (
+                    <tr key={question.id}>
+                      <td>
+                        <strong>Q{index + 1}.</strong> {question.question_text}
+                      </td>
+                      <td>{question.attempt_count}</td>
+                      <td>
+                        {question.percent_correct !== null ? `${question.percent_correct.toFixed(1)}%` : "-"}
+                      </td>
+                      <td>{question.discrimination !== null ? question.discrimination.toFixed(2) : "-"}</td>
+                      <td>
+                        {question.choices.length > 0 && question.question_type !== "short_answer"
+                          ? question.choices.map((choice) => (
+                              <div key={choice.id} className={choice.is_correct ? "text-success" : ""}>
+                                <small>
+                                  {choice.choice_text}: {choice.selection_count}
+                                  {question.attempt_count > 0 &&
+                                    ` (${((choice.selection_count / question.attempt_count) * 100).toFixed(0)}%)`}
+                                </small>
+                              </div>
+                            ))
+                          : <span className="text-muted">-</span>}
+                      </td>
+                    </tr>
+                  ))}
+                </tbody>
+              </table>
+            </div>
+          </div>
+        </div>
+      )}
+
       {/* Attempts List */}
       <div className="card">
         <div className="card-header">
@@ -222,6 +306,13 @@ const QuizResults = () => {
                   ))}
                 </tbody>
               </table>
+              {nextCursor && (
+                <div className="text-center">
+                  <button className="btn btn-outline-secondary" onClick={loadMoreAttempts} disabled={loadingMore}>
+                    {loadingMore ? "Loading..." : "Load more"}
+                  </button>
+                </div>
+              )}
             </div>
           ) : (
             <div className="text-center py-4">
@@ -23,8 +23,11 @@ const StudentPerformance = () => {
   const fetchStudentPerformance = async () => {
     try {
       setLoading(true)
-      const response = await facultyAPI.getStudentPerformance(courseId, studentId)
-      setPerformance(response.data)
+      const [summaryResponse, attemptsResponse] = await Promise.all([
+        facultyAPI.getStudentPerformance(courseId, studentId, { summary: true }),
+        facultyAPI.getStudentAttempts(courseId, studentId),
+      ])
+      setPerformance({ ...summaryResponse.data, quiz_attempts: attemptsResponse.data.results })
     } catch (error) {
       console.error("Failed to fetch student performance:", error)
       toast.error("Failed to load student performance data")
@@ -130,7 +133,7 @@ const StudentPerformance = () => {
                   {performance.quiz_attempts.map((attempt, index) => (
                     <tr key={index}>
                       <td>
-                        <strong>{attempt.quiz?.title || "Unknown Quiz"}</strong>
+                        <strong>{attempt.quiz_title || "Unknown Quiz"}</strong>
                       </td>
                       <td>
                         <span className="badge bg-primary">
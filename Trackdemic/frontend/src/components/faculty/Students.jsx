@@ -12,16 +12,27 @@ const Students = () => {
   const [searchTerm, setSearchTerm] = useState("")
   const [filterCourse, setFilterCourse] = useState("")
   const [myCourses, setMyCourses] = useState([])
+  const [page, setPage] = useState(1)
+  const [totalCount, setTotalCount] = useState(0)
+  const [hasNext, setHasNext] = useState(false)
 
   useEffect(() => {
-    fetchStudents()
     fetchMyCourses()
   }, [])
 
+  useEffect(() => {
+    fetchStudents()
+  }, [searchTerm, filterCourse, page])
+
   const fetchStudents = async () => {
     try {
-      const response = await facultyAPI.getStudentsList()
-      setStudents(response.data || [])
+      const params = { page }
+      if (searchTerm) params.search = searchTerm
+      if (filterCourse) params.course = filterCourse
+      const response = await facultyAPI.getStudentsList(params)
+      setStudents(response.data.results || [])
+      setTotalCount(response.data.count || 0)
+      setHasNext(Boolean(response.data.next))
     } catch (error) {
       console.error("Failed to fetch students:", error)
       toast.error("Failed to load students")
@@ -47,19 +58,6 @@ const Students = () => {
     navigate(`/faculty/courses/${courseId}/students`)
   }
 
-  const filteredStudents = students.filter((student) => {
-    const matchesSearch = 
-      student.first_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      student.last_name?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      student.username?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      student.email?.toLowerCase().includes(searchTerm.toLowerCase())
-    
-    const matchesCourse = !filterCourse || 
-      student.enrolled_courses?.some(course => course.id === parseInt(filterCourse))
-    
-    return matchesSearch && matchesCourse
-  })
-
   if (loading) {
     return (
       <div className="d-flex justify-content-center align-items-center" style={{ height: "400px" }}>
@@ -92,7 +90,10 @@ const Students = () => {
                 id="search"
                 placeholder="Search by name, username, or email..."
                 value={searchTerm}
-                onChange={(e) => setSearchTerm(e.target.value)}
+                onChange={(e) => {
+                  setSearchTerm(e.target.value)
+                  setPage(1)
+                }}
               />
             </div>
             <div className="col-md-6">
@@ -101,7 +102,10 @@ const Students = () => {
                 className="form-select"
                 id="courseFilter"
                 value={filterCourse}
-                onChange={(e) => setFilterCourse(e.target.value)}
+                onChange={(e) => {
+                  setFilterCourse(e.target.value)
+                  setPage(1)
+                }}
               >
                 <option value="">All Courses</option>
                 {myCourses.map((course) => (
@@ -118,10 +122,10 @@ const Students = () => {
       {/* Students List */}
       <div className="card">
         <div className="card-header">
-          <h5 className="mb-0">Students ({filteredStudents.length})</h5>
+          <h5 className="mb-0">Students ({totalCount})</h5>
         </div>
         <div className="card-body">
-          {filteredStudents.length > 0 ? (
+          {students.length > 0 ? (
             <div className="table-responsive">
               <table className="table table-hover">
                 <thead>
@@ -134,7 +138,7 @@ const Students = () => {
                   </tr>
                 </thead>
                 <tbody>
-                  {filteredStudents.map((student) => (
+                  {students.map((student) => (
                     <tr key={student.id}>
                       <td>
                         <div className="d-flex align-items-center">
@@ -206,6 +210,23 @@ const Students = () => {
                   ))}
                 </tbody>
               </table>
+              <div className="d-flex justify-content-between align-items-center">
+                <button
+                  className="btn btn-outline-secondary btn-sm"
+                  disabled={page === 1}
+                  onClick={() => setPage(page - 1)}
+                >
+                  Previous
+                </button>
+                <small className="text-muted">Page {page}</small>
+                <button
+                  className="btn btn-outline-secondary btn-sm"
+                  disabled={!hasNext}
+                  onClick={() => setPage(page + 1)}
+                >
+                  Next
+                </button>
+              </div>
             </div>
           ) : (
             <div className="text-center py-4">
@@ -1,9 +1,12 @@
 "use client"
 
-import { useState, useEffect } from "react"
+import { useState, useEffect, useRef } from "react"
 import { useParams, useNavigate } from "react-router-dom"
 import { quizAPI } from "../../services/api"
 import { toast } from "react-toastify"
+import Leaderboard from "../Leaderboard"
+
+const AUTOSAVE_INTERVAL_MS = 5000
 
 const QuizTaking = () => {
   const { quizId } = useParams()
@@ -15,6 +18,11 @@ const QuizTaking = () => {
   const [loading, setLoading] = useState(true)
   const [submitting, setSubmitting] = useState(false)
   const [quizStarted, setQuizStarted] = useState(false)
+  // Answers are autosaved as deltas; only questions changed since the last save are sent
+  const answersRef = useRef({})
+  const unsavedRef = useRef(new Set())
+  // Questions whose autosave has been sent but not yet acknowledged
+  const inFlightRef = useRef(new Set())
 
   useEffect(() => {
     fetchQuizDetails()
@@ -36,6 +44,70 @@ const QuizTaking = () => {
     return () => clearInterval(timer)
   }, [quizStarted, timeLeft])
 
+  useEffect(() => {
+    answersRef.current = answers
+  }, [answers])
+
+  useEffect(() => {
+    if (!quizStarted) return
+    const autosave = setInterval(autosaveAnswers, AUTOSAVE_INTERVAL_MS)
+    return () => clearInterval(autosave)
+  }, [quizStarted])
+
+  const formatAnswer = (questionId, answer) => {
+    const question = quiz.questions.find((q) => q.id === Number.parseInt(questionId))
+    if (question.question_type === "short_answer") {
+      return {
+        question_id: Number.parseInt(questionId),
+        text_answer: answer,
+      }
+    }
+    return {
+      question_id: Number.parseInt(questionId),
+      selected_choice_id: Number.parseInt(answer),
+    }
+  }
+
+  const takeUnsavedAnswers = () => {
+    const questionIds = Array.from(unsavedRef.current)
+    unsavedRef.current.clear()
+    return questionIds
+  }
+
+  const autosaveAnswers = async () => {
+    const questionIds = takeUnsavedAnswers()
+    if (questionIds.length === 0) return
+    questionIds.forEach((questionId) => inFlightRef.current.add(questionId))
+    try {
+      await quizAPI.autosaveQuiz(
+        quizId,
+        questionIds.map((questionId) => formatAnswer(questionId, answersRef.current[questionId])),
+      )
+    } catch (error) {
+      // Keep them for the next autosave or the final submission; a 429 only means the server wants fewer saves
+      questionIds.forEach((questionId) => unsavedRef.current.add(questionId))
+      if (error.response?.status !== 429) {
+        console.error("Failed to autosave answers:", error)
+      }
+    } finally {
+      questionIds.forEach((questionId) => inFlightRef.current.delete(questionId))
+    }
+  }
+
+  const restoreDraft = async () => {
+    try {
+      const response = await quizAPI.getQuizDraft(quizId)
+      const restored = {}
+      response.data.answers.forEach((answer) => {
+        restored[answer.question_id] =
+          answer.selected_choice_id != null ? answer.selected_choice_id.toString() : answer.text_answer || ""
+      })
+      setAnswers((prev) => ({ ...restored, ...prev }))
+    } catch (error) {
+      console.error("Failed to restore saved answers:", error)
+    }
+  }
+
   const fetchQuizDetails = async () => {
     try {
       const response = await quizAPI.getQuiz(quizId)
@@ -53,11 +125,17 @@ const QuizTaking = () => {
     try {
       const response = await quizAPI.startQuiz(quizId)
       setAttempt(response.data.attempt)
-      setTimeLeft(quiz.time_limit_minutes * 60) // Convert to seconds
+      // The attempt may draw only some of the quiz's questions
+      setQuiz((prev) => (prev ? { ...prev, questions: response.data.questions } : prev))
+      // Count down from when the attempt actually started, so resuming does not reset the clock
+      const elapsedSeconds = Math.floor((Date.now() - new Date(response.data.attempt.started_at).getTime()) / 1000)
+      setTimeLeft(Math.max(quiz.time_limit_minutes * 60 - elapsedSeconds, 1))
       setQuizStarted(true)
       // Increment attempts locally only when a new attempt was created (HTTP 201)
       if (response.status === 201) {
         setQuiz((prev) => (prev ? { ...prev, attempts_count: (prev.attempts_count || 0) + 1 } : prev))
+      } else {
+        await restoreDraft()
       }
       toast.success("Quiz started! Good luck!")
     } catch (error) {
@@ -66,6 +144,7 @@ const QuizTaking = () => {
   }
 
   const handleAnswerChange = (questionId, value) => {
+    unsavedRef.current.add(String(questionId))
     setAnswers((prev) => ({
       ...prev,
       [questionId]: value,
@@ -76,22 +155,11 @@ const QuizTaking = () => {
     if (submitting) return
 
     setSubmitting(true)
+    // Earlier answers were autosaved; send what changed since and any save still in flight
+    const questionIds = takeUnsavedAnswers()
+    const pendingIds = Array.from(new Set([...questionIds, ...inFlightRef.current]))
     try {
-      // Format answers for submission
-      const formattedAnswers = Object.entries(answers).map(([questionId, answer]) => {
-        const question = quiz.questions.find((q) => q.id === Number.parseInt(questionId))
-        if (question.question_type === "short_answer") {
-          return {
-            question_id: Number.parseInt(questionId),
-            text_answer: answer,
-          }
-        } else {
-          return {
-            question_id: Number.parseInt(questionId),
-            selected_choice_id: Number.parseInt(answer),
-          }
-        }
-      })
+      const formattedAnswers = pendingIds.map((questionId) => formatAnswer(questionId, answersRef.current[questionId]))
 
       const response = await quizAPI.submitQuiz(quizId, formattedAnswers)
       toast.success("Quiz submitted successfully!")
@@ -113,6 +181,7 @@ const QuizTaking = () => {
         navigate("/student/quizzes")
       }, 1000)
     } catch (error) {
+      pendingIds.forEach((questionId) => unsavedRef.current.add(questionId))
       toast.error(error.response?.data?.error || "Failed to submit quiz")
     } finally {
       setSubmitting(false)
@@ -159,7 +228,7 @@ const QuizTaking = () => {
                 <div className="row mb-4">
                   <div className="col-md-3">
                     <div className="border rounded p-3">
-                      <h5>{quiz.total_questions}</h5>
+                      <h5>{quiz.questions_per_attempt ?? quiz.total_questions}</h5>
                       <small className="text-muted">Questions</small>
                     </div>
                   </div>
@@ -204,6 +273,9 @@ const QuizTaking = () => {
                 </div>
               </div>
             </div>
+            <div className="mt-4">
+              <Leaderboard quizId={quizId} limit={5} />
+            </div>
           </div>
         </div>
       </div>
@@ -317,12 +389,12 @@ const QuizTaking = () => {
             <div className="card-body">
               <div className="mb-3">
                 <small className="text-muted">
-                  Answered: {Object.keys(answers).length}/{quiz.total_questions}
+                  Answered: {Object.keys(answers).length}/{quiz.questions.length}
                 </small>
                 <div className="progress mt-1">
                   <div
                     className="progress-bar"
-                    style={{ width: `${(Object.keys(answers).length / quiz.total_questions) * 100}%` }}
+                    style={{ width: `${(Object.keys(answers).length / quiz.questions.length) * 100}%` }}
                   ></div>
                 </div>
               </div>
@@ -190,7 +190,7 @@ const StudentOverview = () => {
                 recentQuizzes.map((attempt) => (
                   <div key={attempt.id} className="d-flex justify-content-between align-items-center mb-3">
                     <div>
-                      <h6 className="mb-1">{attempt.quiz.title}</h6>
+                      <h6 className="mb-1">{attempt.quiz_title}</h6>
                       <small className="text-muted">
                         {attempt.completed_at ? new Date(attempt.completed_at).toLocaleDateString() : "In Progress"}
                       </small>
@@ -74,6 +74,8 @@ export const courseAPI = {
   enrollCourse: (id) => api.post(`/courses/${id}/enroll/`),
   unenrollCourse: (id) => api.post(`/courses/${id}/unenroll/`),
   getMyEnrollments: () => api.get("/courses/my-enrollments/"),
+  completeLesson: (courseId, lessonId, isCompleted = true) =>
+    api.post(`/courses/${courseId}/lessons/${lessonId}/complete/`, { is_completed: isCompleted }),
 }
 
 // Quiz API endpoints
@@ -82,6 +84,10 @@ export const quizAPI = {
   getQuiz: (id) => api.get(`/quizzes/${id}/`),
   startQuiz: (id) => api.post(`/quizzes/${id}/start/`),
   submitQuiz: (id, answers) => api.post(`/quizzes/${id}/submit/`, { answers }),
+  autosaveQuiz: (id, answers) => api.post(`/quizzes/${id}/autosave/`, { answers }),
+  getQuizDraft: (id) => api.get(`/quizzes/${id}/autosave/`),
+  getQuizLeaderboard: (id, params) => api.get(`/quizzes/${id}/leaderboard/`, { params }),
+  getCourseLeaderboard: (courseId, params) => api.get(`/quizzes/course/${courseId}/leaderboard/`, { params }),
   getMyAttempts: () => api.get("/quizzes/my-attempts/"),
 }
 
@@ -100,12 +106,25 @@ export const trackingAPI = {
   getClassInsights: (params) => api.get("/tracking/class-insights/", { params }),
   generateReport: (reportData) => api.post("/tracking/reports/generate/", reportData),
   getReports: () => api.get("/tracking/reports/"),
+  sendHeartbeat: (lessonId, seconds) => api.post("/tracking/heartbeat/", { lesson_id: lessonId, seconds }),
 }
 
 // Admin API endpoints
 export const adminAPI = {
   getDashboardStats: () => api.get("/users/admin/dashboard-stats/"),
   getUsers: (params) => api.get("/users/admin/users/", { params }),
+  // The response is a stream of JSON lines; onProgress gets each update as it arrives
+  bulkProvisionUsers: (formData, onProgress) =>
+    api.post("/users/admin/users/bulk-provision/", formData, {
+      headers: { "Content-Type": "multipart/form-data" },
+      responseType: "text",
+      onDownloadProgress: (event) => {
+        // Only the last complete line; the one after it may still be arriving
+        const text = event.event?.target?.responseText || ""
+        const end = text.lastIndexOf("\n")
+        if (end > 0) onProgress(JSON.parse(text.slice(text.lastIndexOf("\n", end - 1) + 1, end)))
+      },
+    }),
   updateUser: (userId, userData) => api.put(`/users/admin/users/${userId}/`, userData),
   deleteUser: (userId) => api.delete(`/users/admin/users/${userId}/delete/`),
   getAllCourses: () => api.get("/users/admin/courses/"),
@@ -127,12 +146,24 @@ export const facultyAPI = {
 
   // Student management
   getCourseStudents: (courseId) => api.get(`/courses/faculty/${courseId}/students/`),
+  getCourseRoster: (courseId, params) => api.get(`/courses/faculty/${courseId}/roster/`, { params }),
+  exportCourseRoster: (courseId) =>
+    api.get(`/courses/faculty/${courseId}/roster/export/`, { responseType: "blob" }),
+  exportCourseGradebook: (courseId, fileFormat) =>
+    api.get(`/courses/faculty/${courseId}/gradebook/export/`, {
+      params: { file_format: fileFormat },
+      responseType: "blob",
+    }),
   addStudentToCourse: (courseId, studentId) =>
     api.post(`/courses/faculty/${courseId}/students/add/`, { student_id: studentId }),
+  bulkAddStudentsToCourse: (courseId, students) =>
+    api.post(`/courses/faculty/${courseId}/students/bulk-add/`, { students }),
   removeStudentFromCourse: (courseId, studentId) =>
     api.delete(`/courses/faculty/${courseId}/students/${studentId}/remove/`),
-  getStudentPerformance: (courseId, studentId) =>
-    api.get(`/courses/faculty/${courseId}/students/${studentId}/performance/`),
+  getStudentPerformance: (courseId, studentId, params) =>
+    api.get(`/courses/faculty/${courseId}/students/${studentId}/performance/`, { params }),
+  getStudentAttempts: (courseId, studentId, params) =>
+    api.get(`/courses/faculty/${courseId}/students/${studentId}/attempts/`, { params }),
 
   // Quiz management
   getMyQuizzes: (params) => api.get("/quizzes/faculty/", { params }),
@@ -140,7 +171,13 @@ export const facultyAPI = {
   createQuiz: (quizData) => api.post("/quizzes/faculty/", quizData),
   updateQuiz: (id, quizData) => api.patch(`/quizzes/faculty/${id}/`, quizData),
   deleteQuiz: (id) => api.delete(`/quizzes/faculty/${id}/`),
-  getQuizAttempts: (quizId) => api.get(`/quizzes/faculty/${quizId}/attempts/`),
+  getQuizAttempts: (quizId, params) => api.get(`/quizzes/faculty/${quizId}/attempts/`, { params }),
+  getQuizAttempt: (quizId, attemptId) => api.get(`/quizzes/faculty/${quizId}/attempts/${attemptId}/`),
+  getQuizItemAnalysis: (quizId) => api.get(`/quizzes/faculty/${quizId}/item-analysis/`),
+  importQuizQuestions: (quizId, formData) =>
+    api.post(`/quizzes/faculty/${quizId}/questions/import/`, formData, {
+      headers: { "Content-Type": "multipart/form-data" },
+    }),
 
   // Students list
   getStudentsList: (params) => api.get("/quizzes/faculty/students/", { params }),